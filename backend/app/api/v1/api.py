@@ -1,7 +1,7 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, jobs
+from app.api.v1.endpoints import admin, auth, cv, jobs, saved_searches
 
-# from app.api.v1.endpoints import users, cv, templates, ai
+# from app.api.v1.endpoints import users, templates, ai
 # TODO: Create these modules
 
 api_router = APIRouter()
@@ -11,8 +11,11 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(jobs.router, tags=["jobs"])
 # api_router.include_router(users.router, prefix="/users", tags=["users"])
 # TODO: Create users module
-# api_router.include_router(cv.router, prefix="/cv", tags=["cv"])
-# TODO: Create cv module
+api_router.include_router(cv.router, prefix="/cv", tags=["cv"])
+api_router.include_router(
+    saved_searches.router, prefix="/saved-searches", tags=["saved-searches"]
+)
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 # api_router.include_router(templates.router, prefix="/templates", tags=["templates"])
 # TODO: Create templates module
 # api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
@@ -1,5 +1,5 @@
 # This file makes the endpoints directory a Python package
 
-from . import auth, jobs
+from . import auth, cv, jobs, saved_searches
 
-__all__ = ["auth", "jobs"]
+__all__ = ["auth", "cv", "jobs", "saved_searches"]
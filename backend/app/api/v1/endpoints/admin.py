@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from typing import Callable, Dict, Optional
+
+from app.api.deps import get_current_admin
+from app.core.profiling import (
+    ProfiledRoute,
+    render_profile,
+    request_profiler,
+    slow_queries,
+)
+from app.core.single_flight import read_flight
+
+router = APIRouter(dependencies=[Depends(get_current_admin)], route_class=ProfiledRoute)
+
+PROFILE_RESPONSES: Dict[str, Callable[[str], Response]] = {
+    "html": HTMLResponse,
+    "speedscope": lambda body: Response(body, media_type="application/json"),
+    "text": PlainTextResponse,
+}
+
+
+@router.get("/profiling/profiles")
+def list_profiles():
+    """Captured request profiles in this process, newest first, and slow requests"""
+    return {
+        "armed": request_profiler.armed,
+        "armed_path": request_profiler.armed_path,
+        "profiles": [
+            profile.summary() for profile in reversed(request_profiler.profiles)
+        ],
+        "slow_requests": list(reversed(request_profiler.slow_requests)),
+    }
+
+
+@router.get("/profiling/profiles/{profile_id}")
+def get_profile(
+    profile_id: int, format: str = Query("html", pattern="^(html|speedscope|text)$")
+):
+    """
+    A captured profile
+
+    Speedscope output opens as a flame graph at https://www.speedscope.app
+    """
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    return PROFILE_RESPONSES[format](render_profile(profile, format))
+
+
+@router.post("/profiling/arm")
+def arm_profiler(count: int = Query(1, ge=0, le=1000), path: Optional[str] = None):
+    """Profile the next ``count`` requests to paths starting with ``path``; 0 disarms"""
+    request_profiler.arm(count, path)
+    return {"armed": count, "armed_path": path}
+
+
+@router.get("/profiling/slow-queries")
+def list_slow_queries():
+    """Statements over SLOW_QUERY_MS in this process with query plans, newest first"""
+    return slow_queries.snapshot()
+
+
+@router.get("/coalescing")
+def coalescing_stats():
+    """
+    Per route: requests served, query executions and the share of requests
+    that joined another's
+    """
+    return read_flight.stats()
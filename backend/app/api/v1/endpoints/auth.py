@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from typing import Any
 
+from app.api.deps import oauth2_scheme
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.profiling import ProfiledRoute
 from app.core.security import create_access_token, verify_password, get_password_hash
 from app.models.user import User
 from app.schemas.auth_schemas import Token, UserCreate, UserLogin
 
 
-router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/register", response_model=Token)
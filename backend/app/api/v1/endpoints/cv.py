@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import true
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.api.v1.endpoints.jobs import serialize_job
+from app.core.database import get_db
+from app.core.profiling import ProfiledRoute
+from app.models.cv import CV
+from app.models.job import Job
+from app.models.user import User
+from app.services.relevance import ensure_corpus_stats
+
+router = APIRouter(route_class=ProfiledRoute)
+
+# Extra candidates fetched so matches dropped as inactive can be backfilled
+MATCH_OVERSAMPLE = 3
+
+
+@router.get("/{cv_id}/matches")
+def get_cv_matches(
+    cv_id: int,
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the jobs that best match a CV"""
+    # numpy is only loaded once matching is used, not at API startup
+    from app.services.job_vectors import cv_text, match_text
+
+    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
+    if not cv:
+        raise HTTPException(status_code=404, detail="CV not found")
+
+    ensure_corpus_stats(db)
+    scores = dict(match_text(cv_text(cv.content), k * MATCH_OVERSAMPLE))
+    if not scores:
+        return []
+
+    rows = db.query(Job.id, Job).filter(Job.id.in_(scores), Job.is_active == true())
+    ranked = sorted(rows, key=lambda row: -scores[row.id])
+    return [
+        {"score": round(scores[job_id], 4), "job": serialize_job(job)}
+        for job_id, job in ranked[:k]
+    ]
@@ -1,67 +1,352 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, or_
-from typing import List, Optional
+from sqlalchemy import func, desc, or_, and_, select, true
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import asyncio
 
-from app.core.database import get_db
-from app.models.job import Job
-from scraper.unified_scraper import scrape_jobs_unified, scrape_jobs_single_site, UnifiedJobScraper
+from app.api.deps import get_current_admin
+from app.core.database import get_db, get_read_db, get_read_sessions
+from app.core.profiling import ProfiledRoute
+from app.core.single_flight import read_flight
+from app.models.job import Job, Company, Location, Source
+from app.services.facet_index import bitmap_from_ids, facet_index, ids_from_bitmap
+from app.services.job_dimensions import matching_ids, source_ids
+from app.services.job_export import (
+    FORMATS,
+    export_query,
+    parquet_available,
+    stream_export,
+)
+from app.services.job_import import (
+    FORMATS as IMPORT_FORMATS,
+    detect_format,
+    import_jobs,
+    read_records,
+)
+from app.services.job_ingest import persist_jobs
+from app.services.relevance import rank_jobs
+from config import get_config
+from scraper.health import extraction_health
 
-router = APIRouter(tags=["jobs"])
+config = get_config()
 
-@router.get("/jobs", response_model=List[dict])
-async def get_jobs(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+router = APIRouter(tags=["jobs"], route_class=ProfiledRoute)
+
+
+def serialize_job(job: Job) -> dict:
+    """Public representation of a job"""
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "province": job.province,
+        "description": job.description,
+        "salary": job.salary,
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+        "salary_currency": job.salary_currency,
+        "salary_period": job.salary_period,
+        "job_type": job.job_type,
+        "experience_level": job.experience_level,
+        "date_posted": job.date_posted,
+        "link": job.link,
+        "source": job.source,
+        "created_at": job.created_at
+    }
+
+
+def _filter_jobs(
+    query,
     search: Optional[str] = None,
     company: Optional[str] = None,
     location: Optional[str] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None
 ):
-    """
-    Get all jobs with optional filtering
-    """
-    query = db.query(Job).filter(Job.is_active == True)
-    
+    """Apply the common job list filters to a query"""
     if search:
         search_filter = f"%{search}%"
         query = query.filter(
             (Job.title.ilike(search_filter)) |
             (Job.description.ilike(search_filter)) |
-            (Job.company.ilike(search_filter))
+            (Job.company_id.in_(matching_ids(Company, search)))
         )
     
+    # Facet filters resolve against the small lookup tables, then hit integer indexes
     if company:
-        query = query.filter(Job.company.ilike(f"%{company}%"))
+        query = query.filter(Job.company_id.in_(matching_ids(Company, company)))
     
     if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
+        query = query.filter(Job.location_id.in_(matching_ids(Location, location)))
     
     if source:
-        query = query.filter(Job.source == source)
-    
+        query = query.filter(Job.source_id.in_(source_ids(source)))
+
+    # Salary bounds are range scans on the annual ZAR columns
+    if min_salary is not None:
+        query = query.filter(Job.salary_max >= min_salary)
+
+    if max_salary is not None:
+        query = query.filter(Job.salary_min <= max_salary)
+
+    return query
+
+
+@router.get("/jobs", response_model=List[dict])
+async def get_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    search: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    source: Optional[str] = None,
+    min_salary: Optional[int] = Query(
+        None, ge=0, description="Annual ZAR; jobs paying at least this much"
+    ),
+    max_salary: Optional[int] = Query(
+        None, ge=0, description="Annual ZAR; jobs starting at or below this"
+    ),
+    sort: Optional[str] = Query(
+        None,
+        pattern="^(salary|relevance)$",
+        description=(
+            "'salary' for highest paying first, 'relevance' to rank by the search terms"
+        ),
+    ),
+    db: Session = Depends(get_read_db),
+    read_sessions: Callable[[], Session] = Depends(get_read_sessions)
+):
+    """
+    Get all jobs with optional filtering
+
+    Identical concurrent requests share one execution (app/core/single_flight.py).
+    """
+    params: Dict[str, Any] = {
+        "skip": skip,
+        "limit": limit,
+        "search": search,
+        "company": company,
+        "location": location,
+        "source": source,
+        "min_salary": min_salary,
+        "max_salary": max_salary,
+        "sort": sort
+    }
+    if db.info.get("last_write") is not None:
+        # A client reading its own recent writes may need the primary, so it does not
+        # share
+        return await read_flight.run(
+            "GET /api/jobs", params, lambda: _list_jobs(db, **params), shared=False
+        )
+    return await read_flight.run(
+        "GET /api/jobs",
+        params,
+        _in_own_session(read_sessions, lambda session: _list_jobs(session, **params)),
+    )
+
+
+def _in_own_session(
+    open_session: Callable[[], Session], fn: Callable[[Session], Any]
+) -> Callable[[], Any]:
+    """
+    ``fn`` with a session opened and closed by the execution itself
+
+    A shared execution can outlive the request that started it, and runs
+    while that request's session may be in use or closed.
+    """
+
+    def run():
+        db = open_session()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    return run
+
+
+def _list_jobs(
+    db: Session,
+    skip: int,
+    limit: int,
+    search: Optional[str],
+    company: Optional[str],
+    location: Optional[str],
+    source: Optional[str],
+    min_salary: Optional[int],
+    max_salary: Optional[int],
+    sort: Optional[str]
+) -> List[dict]:
+    query = _filter_jobs(
+        db.query(Job).filter(Job.is_active == true()),
+        search=search,
+        company=company,
+        location=location,
+        source=source,
+        min_salary=min_salary,
+        max_salary=max_salary
+    )
+
+    if sort == "relevance" and search:
+        # Score the newest matching candidates in one batch, then page through
+        # the ranking
+        candidates = (
+            query.order_by(Job.id.desc()).limit(config.RELEVANCE_CANDIDATE_LIMIT).all()
+        )
+        ranked = rank_jobs(db, search, candidates)
+        return [serialize_job(job) for job in ranked[skip:skip + limit]]
+
+    if sort == "salary":
+        query = query.order_by(Job.salary_max.desc().nulls_last(), Job.id.desc())
+
     jobs = query.offset(skip).limit(limit).all()
     
-    return [
-        {
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "location": job.location,
-            "description": job.description,
-            "salary": job.salary,
-            "job_type": job.job_type,
-            "experience_level": job.experience_level,
-            "date_posted": job.date_posted,
-            "link": job.link,
-            "source": job.source,
-            "created_at": job.created_at
-        }
-        for job in jobs
-    ]
+    return [serialize_job(job) for job in jobs]
+
+
+@router.get("/jobs/export")
+async def export_jobs(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    search: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    source: Optional[str] = None,
+    min_salary: Optional[int] = Query(None, ge=0),
+    max_salary: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream all active jobs matching the list filters as CSV, NDJSON or Parquet
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=400, detail="Parquet export requires pyarrow on the server"
+        )
+
+    query = _filter_jobs(
+        export_query(db),
+        search=search,
+        company=company,
+        location=location,
+        source=source,
+        min_salary=min_salary,
+        max_salary=max_salary
+    )
+
+    return StreamingResponse(
+        stream_export(db, query, format),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'}
+    )
+
+
+@router.get("/jobs/changes")
+async def get_job_changes(
+    since: int = Query(0, ge=0, description="Last change number already seen"),
+    after_id: int = Query(
+        0, ge=0, description="Tie-breaker for jobs sharing the change number `since`"
+    ),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Delta feed of jobs created, updated or deactivated after a change number
+
+    Change numbers are assigned in commit order, so a consumer resuming from
+    ``next_since`` never misses a change that committed late. Served from a
+    read replica, the feed may end up to ``REPLICA_MAX_LAG_SECONDS`` earlier
+    but has no gaps, since replicas replay commits in order. Deactivated jobs
+    are archived, and leave the feed, ``JOB_ARCHIVE_GRACE_HOURS`` after they
+    went inactive; poll more often than that.
+    """
+    jobs = db.query(Job).filter(
+        or_(
+            Job.change_seq > since,
+            and_(Job.change_seq == since, Job.id > after_id)
+        )
+    ).order_by(Job.change_seq, Job.id).limit(limit).all()
+
+    changes = []
+    for job in jobs:
+        item = serialize_job(job)
+        item.update({
+            "is_active": job.is_active,
+            "change_seq": job.change_seq,
+            "updated_at": job.updated_at,
+            "last_seen_at": job.last_seen_at
+        })
+        changes.append(item)
+
+    # Resume from the last row; keep the caller's watermark when nothing changed
+    last = jobs[-1] if jobs else None
+    return {
+        "changes": changes,
+        "next_since": last.change_seq if last else since,
+        "next_after_id": last.id if last else after_id,
+        "has_more": len(jobs) == limit
+    }
+
+
+@router.get("/jobs/search")
+def search_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    search: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    source: List[str] = Query([]),
+    province: List[str] = Query([]),
+    job_type: List[str] = Query([]),
+    experience_level: List[str] = Query([]),
+    salary_band: List[str] = Query([]),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Search jobs and return facet counts for the current query in one response
+    """
+    # A plain def runs in the threadpool: the queries, index sync and bitmap
+    # work would otherwise hold up the event loop
+    facet_index.sync(db)
+
+    # Free-text filters still go to the database; facets come from the bitmap index
+    if search or company or location:
+        matching = _filter_jobs(
+            db.query(Job.id).filter(Job.is_active == true()),
+            search=search,
+            company=company,
+            location=location
+        )
+        base = bitmap_from_ids(row.id for row in matching) & facet_index.active_bitmap()
+    else:
+        base = facet_index.active_bitmap()
+
+    result = facet_index.query(base, {
+        "source": source,
+        "province": province,
+        "job_type": job_type,
+        "experience_level": experience_level,
+        "salary_band": salary_band
+    })
+
+    # Newest first: job ids grow with ingestion
+    page_ids = ids_from_bitmap(result["matches"])[::-1][skip:skip + limit].tolist()
+    jobs_by_id = {}
+    if page_ids:
+        jobs_by_id = {job.id: job for job in db.query(Job).filter(Job.id.in_(page_ids))}
+
+    return {
+        "total": result["total"],
+        "jobs": [
+            serialize_job(jobs_by_id[job_id])
+            for job_id in page_ids
+            if job_id in jobs_by_id
+        ],
+        "facets": result["facets"]
+    }
 
 @router.post("/scrape")
 async def trigger_scrape(
@@ -72,38 +357,32 @@ async def trigger_scrape(
 ):
     """
     Trigger manual scraping of job listings
+
+    Jobs are saved page by page; repeating a request whose scrape was
+    interrupted resumes it instead of starting over.
     """
+    # The scraper stack (aiohttp, bs4) is only loaded once a scrape is requested
+    from app.services.scrape_runs import run_checkpointed_scrape
+    from scraper.scheduler import INTERACTIVE
+
     try:
-        # Use unified scraper for all locations
-        jobs_data = await scrape_jobs_unified(query=query, location=location, max_jobs=limit)
-
-        # Save jobs to database
-        saved_count = 0
-        for job_data in jobs_data:
-            # Check if job already exists
-            existing_job = db.query(Job).filter(Job.link == job_data["link"]).first()
-            if not existing_job:
-                job = Job(
-                    title=job_data["title"],
-                    company=job_data["company"],
-                    location=job_data["location"],
-                    description=job_data.get("description", ""),
-                    salary=job_data.get("salary", ""),
-                    job_type=job_data.get("job_type", ""),
-                    experience_level=job_data.get("experience_level", ""),
-                    date_posted=job_data.get("date_posted"),
-                    link=job_data["link"],
-                    source=job_data["source"]
-                )
-                db.add(job)
-                saved_count += 1
-        
-        db.commit()
+        # Use unified scraper for all locations, spreading the limit across sites
+        result = await run_checkpointed_scrape(
+            db,
+            query=query,
+            location=location,
+            max_jobs_per_site=max(1, limit // 4),
+            priority=INTERACTIVE,
+        )
         
         return {
             "message": f"Scraping completed successfully",
-            "scraped_count": len(jobs_data),
-            "saved_count": saved_count,
+            "scraped_count": len(result["jobs"]),
+            "saved_count": result["saved_count"],
+            "updated_count": result["updated_count"],
+            "unchanged_count": result["unchanged_count"],
+            "run_id": result["run_id"],
+            "resumed": result["resumed"],
             "query": query,
             "location": location
         }
@@ -112,6 +391,42 @@ async def trigger_scrape(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
+
+@router.post("/jobs/import", dependencies=[Depends(get_current_admin)])
+def import_job_dump(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(
+        None,
+        pattern="^(ndjson|csv|parquet)$",
+        description="Defaults to the file extension",
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk load an NDJSON, CSV or Parquet dump of jobs
+
+    Records go through the same normalization and dedup by link as scraped
+    jobs; the import is a single transaction. Admin only.
+    """
+    # A plain def runs in the threadpool, so a long import does not block the event
+    # loop
+    format = format or detect_format(file.filename)
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400, detail="Pass format=ndjson, csv or parquet for this file"
+        )
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=400, detail="Parquet import requires pyarrow on the server"
+        )
+
+    try:
+        return import_jobs(db, read_records(file.file, format))
+    except (ValueError, KeyError) as e:
+        raise HTTPException(
+            status_code=400, detail=f"Could not import {file.filename}: {e}"
+        )
+
 @router.delete("/jobs/mock")
 async def clear_mock_data(db: Session = Depends(get_db)):
     """
@@ -122,9 +437,10 @@ async def clear_mock_data(db: Session = Depends(get_db)):
         mock_companies = ["TechCorp Inc.", "StartupXYZ", "BigTech Company"]
         sample_links = ["https://indeed.com/viewjob?jk=sample", "https://example.com/job"]
 
+        mock_company_ids = select(Company.id).where(Company.name.in_(mock_companies))
         deleted_count = db.query(Job).filter(
             or_(
-                Job.company.in_(mock_companies),
+                Job.company_id.in_(mock_company_ids),
                 Job.link.like("%sample%"),
                 Job.link.like("%example.com%")
             )
@@ -153,6 +469,8 @@ async def scrape_jobs_efficient(
     """
     Efficient job scraping with async requests, deduplication, and relevance scoring
     """
+    from scraper.unified_scraper import scrape_jobs_single_site, scrape_jobs_unified
+
     try:
         # Parse keywords and sites
         target_keywords = [k.strip() for k in keywords.split(",") if k.strip()] if keywords else []
@@ -165,45 +483,29 @@ async def scrape_jobs_efficient(
                 site=site_list[0],
                 query=query,
                 location=location,
-                max_jobs=max_jobs
+                max_jobs=max_jobs,
+                keywords=target_keywords
             )
         else:
             # Multi-site scraping
             jobs_data = await scrape_jobs_unified(
                 query=query,
                 location=location,
-                max_jobs=max_jobs
+                max_jobs=max_jobs,
+                keywords=target_keywords
             )
         
-        # Save jobs to database
-        saved_count = 0
-        for job_data in jobs_data:
-            # Check if job already exists
-            existing_job = db.query(Job).filter(Job.link == job_data["link"]).first()
-            if not existing_job:
-                db_job = Job(
-                    title=job_data["title"],
-                    company=job_data["company"],
-                    location=job_data["location"],
-                    description=job_data.get("description", f"Job opportunity at {job_data['company']}"),
-                    salary=job_data.get("salary", "Competitive"),
-                    job_type=job_data.get("job_type", "Full-time"),
-                    experience_level=job_data.get("experience_level", "Mid"),
-                    date_posted=job_data.get("date_posted"),
-                    link=job_data["link"],
-                    source=job_data["source"],
-                    is_active=True
-                )
-                
-                db.add(db_job)
-                saved_count += 1
+        # Save new jobs, refresh changed ones and mark the rest as seen
+        counts = persist_jobs(db, jobs_data)
         
         db.commit()
         
         return {
             "message": "Efficient scraping completed successfully",
             "scraped_count": len(jobs_data),
-            "saved_count": saved_count,
+            "saved_count": counts["saved"],
+            "updated_count": counts["updated"],
+            "unchanged_count": counts["unchanged"],
             "query": query,
             "location": location,
             "keywords": target_keywords,
@@ -214,22 +516,65 @@ async def scrape_jobs_efficient(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Efficient scraping failed: {str(e)}")
 
+
+@router.get("/scraper/health")
+async def get_scraper_health():
+    """
+    Extraction health per job site, as seen by this API process
+    """
+    sites = {}
+    for site, health in extraction_health.snapshot().items():
+        for name in ("demoted_until", "updated_at"):
+            if health[name] is not None:
+                health[name] = datetime.utcfromtimestamp(health[name]).isoformat()
+        sites[site] = health
+    return {"sites": sites}
+
 @router.get("/stats")
-async def get_statistics(db: Session = Depends(get_db)):
+async def get_statistics(
+    db: Session = Depends(get_read_db),
+    read_sessions: Callable[[], Session] = Depends(get_read_sessions)
+):
     """
     Get job statistics
+
+    Identical concurrent requests share one execution (app/core/single_flight.py).
     """
-    # Jobs per company
-    jobs_per_company = db.query(
-        Job.company,
-        func.count(Job.id).label('count')
-    ).filter(Job.is_active == True).group_by(Job.company).order_by(desc('count')).limit(10).all()
+    if db.info.get("last_write") is not None:
+        return await read_flight.run(
+            "GET /api/stats", {}, lambda: _job_statistics(db), shared=False
+        )
+    return await read_flight.run(
+        "GET /api/stats", {}, _in_own_session(read_sessions, _job_statistics)
+    )
+
+
+def _job_statistics(db: Session) -> dict:
+    # Jobs per company (grouped on the integer key, names joined afterwards)
+    company_counts = (
+        db.query(Job.company_id, func.count(Job.id).label('count'))
+        .filter(Job.is_active == true())
+        .group_by(Job.company_id)
+        .order_by(desc('count'))
+        .limit(10)
+        .subquery()
+    )
+    jobs_per_company = (
+        db.query(Company.name.label('company'), company_counts.c.count)
+        .join(company_counts, Company.id == company_counts.c.company_id)
+        .order_by(desc(company_counts.c.count))
+        .all()
+    )
     
     # Jobs per source
-    jobs_per_source = db.query(
-        Job.source,
+    source_counts = db.query(
+        Job.source_id,
         func.count(Job.id).label('count')
-    ).filter(Job.is_active == True).group_by(Job.source).all()
+    ).filter(Job.is_active == true()).group_by(Job.source_id).subquery()
+    jobs_per_source = db.query(
+        Source.name.label('source'),
+        source_counts.c.count
+    ).join(source_counts, Source.id == source_counts.c.source_id).all()
     
     # Jobs per experience level
     jobs_per_level = db.query(
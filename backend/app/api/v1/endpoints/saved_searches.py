@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import true
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.api.deps import get_current_user
+from app.core.database import get_db
+from app.core.profiling import ProfiledRoute
+from app.models.saved_search import SavedSearch, SearchAlert
+from app.models.user import User
+from app.schemas.saved_search_schemas import (
+    SavedSearchCreate,
+    SavedSearchResponse,
+    SearchAlertResponse,
+)
+from app.services.saved_searches import current_watermark
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("", response_model=List[SavedSearchResponse])
+def list_saved_searches(
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """List the saved searches of the current user"""
+    return (
+        db.query(SavedSearch)
+        .filter(SavedSearch.user_id == current_user.id, SavedSearch.is_active == true())
+        .order_by(SavedSearch.id)
+        .all()
+    )
+
+
+@router.post(
+    "", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED
+)
+def create_saved_search(
+    search_data: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Save a job search; alerts cover jobs ingested from now on"""
+    saved_search = SavedSearch(
+        **search_data.model_dump(),
+        user_id=current_user.id,
+        last_change_seq=current_watermark(db),
+    )
+    db.add(saved_search)
+    db.commit()
+    db.refresh(saved_search)
+    return saved_search
+
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    search_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete a saved search and its pending alerts"""
+    saved_search = (
+        db.query(SavedSearch)
+        .filter(SavedSearch.id == search_id, SavedSearch.user_id == current_user.id)
+        .first()
+    )
+    if not saved_search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+
+    db.delete(saved_search)
+    db.commit()
+
+
+@router.get("/alerts", response_model=List[SearchAlertResponse])
+def list_alerts(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Latest jobs matched by the current user's saved searches"""
+    return (
+        db.query(SearchAlert)
+        .filter(SearchAlert.user_id == current_user.id)
+        .order_by(SearchAlert.id.desc())
+        .limit(limit)
+        .all()
+    )
@@ -1,6 +1,21 @@
+from datetime import timedelta
+
 from celery import Celery
+from celery.signals import (  # type: ignore[import-untyped]
+    beat_init,
+    worker_process_init,
+)
 
-celery = Celery("app", broker="redis://redis:6379/0", backend="redis://redis:6379/0")
+from config import get_config
+
+config = get_config()
+
+celery = Celery(
+    "app",
+    broker="redis://redis:6379/0",
+    backend="redis://redis:6379/0",
+    include=["app.tasks"],
+)
 
 celery.conf.update(
     task_serializer="json",
@@ -8,4 +23,53 @@ celery.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        "job-lifecycle": {
+            "task": "jobs.run_lifecycle",
+            "schedule": timedelta(hours=config.JOB_LIFECYCLE_INTERVAL_HOURS),
+        },
+        "job-enrichment": {
+            "task": "jobs.enrich_details",
+            "schedule": timedelta(minutes=config.ENRICHMENT_INTERVAL_MINUTES),
+        },
+        "scheduled-scrapes": {
+            "task": "jobs.scheduled_scrape",
+            "schedule": timedelta(hours=config.SCRAPE_INTERVAL_HOURS),
+        },
+        "alert-evaluation": {
+            "task": "alerts.evaluate_saved_searches",
+            "schedule": timedelta(minutes=config.ALERT_EVALUATION_INTERVAL_MINUTES),
+        },
+        "alert-digests": {
+            "task": "alerts.send_digests",
+            "schedule": timedelta(minutes=config.ALERT_DIGEST_INTERVAL_MINUTES),
+        },
+    },
 )
+
+
+@worker_process_init.connect
+def init_worker_tracing(**kwargs):
+    # Per worker process: the tracer's export thread does not survive the prefork
+    from app.core.database import engine, replicas
+    from app.core.profiling import instrument_engine
+    from app.core.tracing import setup_tracing
+
+    setup_tracing("dive-worker", engines=[engine, *replicas.engines], celery=True)
+    for database_engine in [engine, *replicas.engines]:
+        instrument_engine(database_engine)
+
+
+@worker_process_init.connect
+def warm_worker_corpus_stats(**kwargs):
+    # Ingest only folds new jobs into statistics that are already loaded
+    from app.services.relevance import warm_corpus_stats_in_background
+
+    warm_corpus_stats_in_background()
+
+
+@beat_init.connect
+def init_beat_tracing(**kwargs):
+    from app.core.tracing import setup_tracing
+
+    setup_tracing("dive-beat", celery=True)
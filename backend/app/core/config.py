@@ -17,9 +17,19 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Users allowed on the /api/admin endpoints and to profile requests (JSON list)
+    ADMIN_EMAILS: List[str] = []
 
     # Database - Use SQLite for local development
     DATABASE_URL: str = "sqlite:///./cv_database.db"
+    # Read replicas for GET endpoints (JSON list); writes always go to DATABASE_URL
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped
+    REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    # Bounds the lag probe of an unreachable replica, which runs on the request path
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 2
+    # Clients read their own commits for this long
+    READ_YOUR_WRITES_SECONDS: float = 30.0
 
     # Redis - Disable for local development
     REDIS_URL: str = "redis://localhost:6379"
@@ -43,6 +53,7 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
+    EMAILS_FROM: str = "alerts@dive.local"
 
     # External services
     OPENAI_API_KEY: Optional[str] = None
@@ -1,32 +1,251 @@
-from sqlalchemy import create_engine
+"""
+Database engines and sessions
+
+Writes always go to the primary (``DATABASE_URL``). Sessions opened with
+``get_read_db`` serve their queries from one of the read replicas in
+``DATABASE_REPLICA_URLS`` instead:
+
+* A replica whose replication lag exceeds ``REPLICA_MAX_LAG_SECONDS``, or
+  that cannot be reached, is skipped; with no usable replica the read falls
+  back to the primary. Lag is measured at most every
+  ``REPLICA_LAG_CHECK_SECONDS`` per replica, and connecting to a replica
+  gives up after ``REPLICA_CONNECT_TIMEOUT_SECONDS``.
+* Read-your-writes: a request whose session committed changes (e.g. a
+  manual scrape) gets a cookie with the commit time. For the next
+  ``READ_YOUR_WRITES_SECONDS`` that client only reads from replicas that have
+  replayed past its write, which usually means the primary.
+
+* Replicas replay commits in order, and ``change_seq`` is assigned in commit
+  order, so a replica only ever shows an older prefix of the change feed.
+  ``/jobs/changes`` and the facet index may run up to
+  ``REPLICA_MAX_LAG_SECONDS`` behind, but never skip a change.
+
+Without replicas every session uses the primary, as before.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
-# Create database engine with SQLite-specific configuration
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Required for SQLite
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_COOKIE = "dive_last_write"
+
+# Zero when the standby has replayed everything it received, so an idle primary
+# does not make the replica look stale
+_POSTGRES_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def _create_engine(url: str, connect_timeout: Optional[int] = None) -> Engine:
+    # Create database engine with SQLite-specific configuration
+    if url.startswith("sqlite"):
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},  # Required for SQLite
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+        )
+    connect_args = {"connect_timeout": connect_timeout} if connect_timeout else {}
+    return create_engine(
+        url,
+        connect_args=connect_args,
         pool_pre_ping=True,
+        pool_recycle=300,
         echo=settings.DEBUG,
     )
-else:
-    engine = create_engine(
-        settings.DATABASE_URL, pool_pre_ping=True, pool_recycle=300, echo=settings.DEBUG
-    )
+
+
+def replica_lag(engine: Engine) -> float:
+    """Seconds the replica is behind its primary; 0 without streaming replication"""
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as connection:
+        return float(connection.execute(_POSTGRES_LAG).scalar() or 0.0)
+
+
+class ReplicaPool:
+    """Read replicas in rotation, skipping those that lag too far behind"""
+
+    def __init__(
+        self,
+        engines: List[Engine],
+        max_lag: float,
+        check_interval: float,
+        probe: Callable[[Engine], float] = replica_lag,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.probe = probe
+        self.clock = clock
+        self._lag: Dict[int, Tuple[float, Optional[float]]] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lag(self, index: int) -> Optional[float]:
+        """Cached lag of a replica, None while it is unreachable"""
+        now = self.clock()
+        checked_at, lag = self._lag.get(index, (None, None))
+        if checked_at is None or now - checked_at >= self.check_interval:
+            try:
+                lag = self.probe(self.engines[index])
+            except Exception as e:
+                logger.warning(f"Read replica {index} is unavailable: {e}")
+                lag = None
+            self._lag[index] = (now, lag)
+        return lag
+
+    def choose(self, last_write: Optional[float] = None) -> Optional[Engine]:
+        """
+        Next replica that is within the lag limit and, when the client wrote
+        at ``last_write``, has replayed past that write; None means use the
+        primary.
+        """
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.engines), 1)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            lag = self.lag(index)
+            if lag is None or lag > self.max_lag:
+                continue
+            if last_write is not None and self.clock() - lag <= last_write:
+                continue
+            return self.engines[index]
+        return None
+
+
+class RoutingSession(Session):
+    """Sends reads to a replica when opened read-only, everything else to the primary"""
+
+    def __init__(self, *args, replicas: Optional[ReplicaPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replicas is None or self._flushing or not self.info.get("read_only"):
+            return super().get_bind(mapper, clause=clause, **kw)
+        # One bind per session so a request sees a single consistent snapshot
+        if "bind" not in self.info:
+            self.info["bind"] = (
+                self.replicas.choose(self.info.get("last_write")) or self.bind
+            )
+        return self.info["bind"]
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_writes(session, flush_context):
+    session.info["wrote"] = True
+    # Reads after a write in the same session must see it
+    session.info["bind"] = session.bind
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session):
+    response = session.info.get("response")
+    if session.info.pop("wrote", False) and response is not None and replicas.engines:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Run ``callback`` once the session's current transaction commits
+
+    For side effects outside the database, such as in-process caches, that
+    must not see rows which could still be rolled back. Callbacks are dropped
+    on rollback, and one that fails is logged without failing the commit.
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback in session.info.pop("after_commit", []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session):
+    session.info.pop("after_commit", None)
+
+
+engine = _create_engine(settings.DATABASE_URL)
+replicas = ReplicaPool(
+    [
+        _create_engine(url, connect_timeout=settings.REPLICA_CONNECT_TIMEOUT_SECONDS)
+        for url in settings.DATABASE_REPLICA_URLS
+    ],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_SECONDS,
+)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replicas,
+)
 
 # Create base class for models
 Base = declarative_base()
 
 
+def _last_write(request: Request) -> Optional[float]:
+    """When this client last committed a write, if within the read-your-writes window"""
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return None
+    return (
+        last_write
+        if time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+        else None
+    )
+
+
 # Dependency to get database session
-def get_db():
-    db = SessionLocal()
+def get_db(response: Response):
+    db = SessionLocal(info={"response": response})
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency for read-only endpoints; may be served by a replica
+def get_read_db(request: Request):
+    db = SessionLocal(info={"read_only": True, "last_write": _last_write(request)})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency for reads that outlive the request, such as an execution shared
+# by coalesced requests; whoever opens a session closes it
+def get_read_sessions() -> Callable[[], Session]:
+    return lambda: SessionLocal(info={"read_only": True})
@@ -0,0 +1,356 @@
+"""
+On-demand request profiling and slow-query logging
+
+Requests run under pyinstrument's sampling profiler when:
+
+* an admin sends ``X-Profile: 1`` with the request,
+* an admin armed the sampler for the next N requests
+  (``POST /api/admin/profiling/arm``), optionally for one path prefix, or
+* the request was picked for slow-request sampling
+  (``PROFILE_SAMPLE_RATE``) and then took longer than
+  ``PROFILE_SLOW_REQUEST_MS``.
+
+A profile covers the request wherever it runs: its coroutines on the event
+loop (in pyinstrument's strict async mode, so other requests interleaved on
+the loop are left out) and the work it hands to the threadpool, where
+endpoint code and queries actually run. Sync routes are profiled through
+``ProfiledRoute``; other threadpool work through ``profiled``, which
+``app/core/single_flight.py`` applies to shared reads. Each part is sampled on
+its own thread and the parts are combined when the request finishes.
+
+Captured profiles are kept in memory (the last ``PROFILE_MAX_STORED``) and
+rendered on demand as pyinstrument HTML, a speedscope flame graph or text.
+Every request over the threshold is also logged, profiled or not.
+
+``instrument_engine`` hooks SQLAlchemy cursor events: statements slower than
+``SLOW_QUERY_MS`` are logged and kept with their ``EXPLAIN`` plan (SELECTs
+only, one plan per statement per ``SLOW_QUERY_EXPLAIN_MINUTES``).
+
+Everything lives in process memory, so each API worker shows its own view.
+"""
+
+import asyncio
+import functools
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.security import verify_token
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+SAMPLE_INTERVAL = 0.001
+
+T = TypeVar("T")
+
+
+def is_admin_email(email: Optional[str]) -> bool:
+    if not email:
+        return False
+    return email.lower() in {admin.lower() for admin in settings.ADMIN_EMAILS}
+
+
+def _admin_request(request: Request) -> bool:
+    """Bearer token of an admin; checked without a database round trip"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and is_admin_email(verify_token(token))
+
+
+@dataclass
+class CapturedProfile:
+    id: int
+    method: str
+    path: str
+    reason: str  # header, armed or slow
+    duration_ms: float
+    status_code: int
+    captured_at: float
+    session: Any = field(repr=False, default=None)
+
+    def summary(self) -> Dict:
+        return {key: value for key, value in asdict(self).items() if key != "session"}
+
+
+class RequestCapture:
+    """The profiler sessions of one request, from the event loop and the threadpool"""
+
+    def __init__(self, profiler, reason: str):
+        self.profiler = profiler
+        self.reason = reason
+        self._sessions: List[Any] = []
+        self._lock = threading.Lock()
+
+    def add(self, session) -> None:
+        with self._lock:
+            self._sessions.append(session)
+
+    def stop(self):
+        """Stop the event loop profiler; the request's sessions combined into one"""
+        from pyinstrument.session import Session
+
+        session = self.profiler.stop()
+        with self._lock:
+            for part in self._sessions:
+                session = Session.combine(session, part)
+        return session
+
+
+# The capture of the request being handled; copied into its threadpool calls
+_capture: ContextVar[Optional[RequestCapture]] = ContextVar(
+    "profile_capture", default=None
+)
+
+
+def profiled(fn: Callable[..., T]) -> Callable[..., T]:
+    """``fn`` sampled on the thread it runs on, when its request is being profiled"""
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        capture = _capture.get()
+        if capture is None:
+            return fn(*args, **kwargs)
+        from pyinstrument import Profiler
+
+        profiler = Profiler(interval=SAMPLE_INTERVAL, async_mode="disabled")
+        try:
+            profiler.start()
+        except RuntimeError:
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            capture.add(profiler.stop())
+
+    return run
+
+
+class ProfiledRoute(APIRoute):
+    """Route whose sync endpoint is profiled on the threadpool thread running it"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    duration_ms: float
+    captured_at: float
+    plan: Optional[List[str]] = None
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the captured profiles"""
+
+    def __init__(self, max_stored: int):
+        self.profiles: Deque[CapturedProfile] = deque(maxlen=max_stored)
+        self.slow_requests: Deque[Dict] = deque(maxlen=max_stored)
+        self.armed = 0
+        self.armed_path: Optional[str] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def arm(self, count: int, path: Optional[str] = None) -> None:
+        with self._lock:
+            self.armed = count
+            self.armed_path = path
+
+    def _reason(self, request: Request) -> Optional[str]:
+        if PROFILE_HEADER in request.headers and _admin_request(request):
+            return "header"
+        with self._lock:
+            if self.armed and (
+                not self.armed_path or request.url.path.startswith(self.armed_path)
+            ):
+                self.armed -= 1
+                return "armed"
+        if (
+            config.PROFILE_SLOW_REQUEST_MS > 0
+            and random.random() < config.PROFILE_SAMPLE_RATE
+        ):
+            return "slow"
+        return None
+
+    def start(self, request: Request) -> Optional[RequestCapture]:
+        """Start profiling this request if it is wanted; runs in the request's task"""
+        reason = self._reason(request)
+        if reason is None:
+            return None
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("Request profiling needs pyinstrument")
+            return None
+        # Strict: samples taken while another task runs on the loop are left out
+        profiler = Profiler(interval=SAMPLE_INTERVAL, async_mode="strict")
+        try:
+            profiler.start()
+        except RuntimeError:
+            return None
+        capture = RequestCapture(profiler, reason)
+        _capture.set(capture)
+        return capture
+
+    def finish(
+        self,
+        request: Request,
+        capture: Optional[RequestCapture],
+        duration: float,
+        status_code: int,
+    ) -> Optional[int]:
+        """Stop the profiler and keep the profile if it is wanted; returns its id"""
+        duration_ms = duration * 1000
+        slow = (
+            config.PROFILE_SLOW_REQUEST_MS > 0
+            and duration_ms >= config.PROFILE_SLOW_REQUEST_MS
+        )
+        if slow:
+            logger.warning(
+                f"Slow request {request.method} {request.url.path}: "
+                f"{duration_ms:.0f} ms"
+            )
+            self.slow_requests.append(
+                {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "duration_ms": round(duration_ms, 1),
+                    "status_code": status_code,
+                    "at": time.time(),
+                }
+            )
+        if capture is None:
+            return None
+        session = capture.stop()
+        if capture.reason == "slow" and not slow:
+            return None
+        profile = CapturedProfile(
+            id=next(self._ids),
+            method=request.method,
+            path=request.url.path,
+            reason=capture.reason,
+            duration_ms=round(duration_ms, 1),
+            status_code=status_code,
+            captured_at=time.time(),
+            session=session,
+        )
+        self.profiles.append(profile)
+        return profile.id
+
+    def get(self, profile_id: int) -> Optional[CapturedProfile]:
+        return next(
+            (profile for profile in self.profiles if profile.id == profile_id), None
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self.profiles.clear()
+            self.slow_requests.clear()
+            self.armed = 0
+            self.armed_path = None
+
+
+def render_profile(profile: CapturedProfile, fmt: str) -> str:
+    """pyinstrument HTML, speedscope JSON (flame graph) or a text call tree"""
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+    renderers: Dict[str, Callable[[], Any]] = {
+        "html": HTMLRenderer,
+        "speedscope": SpeedscopeRenderer,
+        "text": lambda: ConsoleRenderer(unicode=True, color=False),
+    }
+    return renderers[fmt]().render(profile.session)
+
+
+class SlowQueryLog:
+    """Statements over ``SLOW_QUERY_MS`` with their query plans"""
+
+    def __init__(self, max_stored: int):
+        self.queries: Deque[SlowQuery] = deque(maxlen=max_stored)
+        self._explained: Dict[str, float] = {}
+
+    def record(
+        self, connection, statement: str, parameters, duration_ms: float
+    ) -> None:
+        plan = None
+        if statement.lstrip()[:6].upper() == "SELECT" and self._explain_due(statement):
+            plan = self._explain(connection, statement, parameters)
+        logger.warning(
+            f"Slow query ({duration_ms:.0f} ms): {' '.join(statement.split())[:500]}"
+        )
+        if plan:
+            logger.warning("Query plan:\n" + "\n".join(plan))
+        self.queries.append(
+            SlowQuery(statement, round(duration_ms, 1), time.time(), plan)
+        )
+
+    def _explain_due(self, statement: str) -> bool:
+        now = time.time()
+        last = self._explained.get(statement)
+        if last is not None and now - last < config.SLOW_QUERY_EXPLAIN_MINUTES * 60:
+            return False
+        if len(self._explained) > 1000:
+            self._explained.clear()
+        self._explained[statement] = now
+        return True
+
+    @staticmethod
+    def _explain(connection, statement: str, parameters) -> Optional[List[str]]:
+        prefix = (
+            "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+        )
+        # A separate DBAPI cursor: no engine events, the statement's cursor is untouched
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [
+                " | ".join(str(value) for value in row) for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.info(f"Could not explain slow query: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def snapshot(self) -> List[Dict]:
+        return [asdict(query) for query in reversed(self.queries)]
+
+
+request_profiler = RequestProfiler(config.PROFILE_MAX_STORED)
+slow_queries = SlowQueryLog(config.PROFILE_MAX_STORED)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Log statements on this engine slower than ``SLOW_QUERY_MS``"""
+    if config.SLOW_QUERY_MS <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(connection, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None or executemany:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= config.SLOW_QUERY_MS:
+            slow_queries.record(connection, statement, parameters, duration_ms)
@@ -0,0 +1,385 @@
+"""
+Per-client rate limiting and admission control for the API
+
+Every ``/api`` request spends tokens from its client's bucket: the user of the
+bearer token, otherwise the client IP. Behind a proxy listed in
+``RATE_LIMIT_TRUSTED_PROXIES`` (the frontend's nginx) the client IP is taken
+from ``X-Forwarded-For``, otherwise all clients would share the proxy's
+bucket. Buckets hold ``RATE_LIMIT_BURST``
+tokens and refill at ``RATE_LIMIT_PER_MINUTE``. Routes cost what they make the
+backend do (``request_cost``): a list call costs a token or a few depending on
+page size and search, a scrape of 100 jobs across the boards 25. Over budget
+the client gets 429 with ``Retry-After``.
+
+Buckets live in Redis (``REDIS_URL``) so all API processes share them; while
+Redis is unreachable each process limits in memory.
+
+Admitted requests then need a slot: at most ``MAX_CONCURRENT_REQUESTS`` run
+at once in a process, of which at most ``MAX_CONCURRENT_HEAVY_REQUESTS`` may
+be heavy (scrapes, imports and exports, or anything costing
+``RATE_LIMIT_HEAVY_COST`` or more), so they can never take the slots cheap
+reads need. Requests without a slot
+queue for up to ``ADMISSION_QUEUE_SECONDS``; when the queue is full or the wait
+runs out they get 503.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.security import verify_token
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 30
+REDIS_KEY_PREFIX = "dive:ratelimit:"
+
+# Base cost in tokens per route; unlisted routes cost 1
+ROUTE_COSTS = {
+    ("POST", "/api/scrape"): 5,
+    ("POST", "/api/scrape-efficient"): 5,
+    ("POST", "/api/jobs/import"): 20,
+    ("GET", "/api/jobs/export"): 10,
+    ("GET", "/api/jobs/search"): 2,
+}
+
+# Routes that cost more the more they are asked for:
+# (parameter, its default, tokens per unit)
+SIZED_ROUTES = {
+    ("POST", "/api/scrape"): (
+        "limit",
+        10,
+        0.2,
+    ),  # 100 jobs fanned out over the boards: 25 tokens
+    ("POST", "/api/scrape-efficient"): ("max_jobs", 20, 0.2),
+    ("GET", "/api/jobs"): ("limit", 100, 0.005),  # 1000 rows: 6 tokens
+}
+
+SEARCH_COST = 2  # Extra for GET /api/jobs with a text search
+
+# Routes that hold a heavy slot whatever they cost
+HEAVY_ROUTES = {
+    ("POST", "/api/scrape"),
+    ("POST", "/api/scrape-efficient"),
+    ("POST", "/api/jobs/import"),
+    ("GET", "/api/jobs/export"),
+}
+
+# Refill and take in one step, on the Redis server's clock
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(bucket[1]) or capacity
+local at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+def request_cost(method: str, path: str, params: Dict[str, list]) -> int:
+    """Tokens a request spends; see ROUTE_COSTS and SIZED_ROUTES"""
+    route = (method, path.rstrip("/") or "/")
+    cost = ROUTE_COSTS.get(route, 1)
+    if route in SIZED_ROUTES:
+        name, default, per_unit = SIZED_ROUTES[route]
+        try:
+            size = int(params.get(name, [default])[0])
+        except ValueError:
+            size = default
+        cost += int(max(size, 0) * per_unit)
+    if route == ("GET", "/api/jobs") and params.get("search", [""])[0].strip():
+        cost += SEARCH_COST
+    return cost
+
+
+def is_heavy(method: str, path: str, cost: int) -> bool:
+    """Whether a request needs one of the heavy slots"""
+    route = (method, path.rstrip("/") or "/")
+    return route in HEAVY_ROUTES or cost >= config.RATE_LIMIT_HEAVY_COST
+
+
+@lru_cache(maxsize=8)
+def _networks(
+    trusted: str,
+) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [
+        ipaddress.ip_network(entry.strip(), strict=False)
+        for entry in trusted.split(",")
+        if entry.strip()
+    ]
+
+
+def _trusted(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in network for network in _networks(config.RATE_LIMIT_TRUSTED_PROXIES)
+    )
+
+
+def client_ip(request: Request) -> str:
+    """
+    The peer address, or behind trusted proxies the address they forwarded for
+
+    ``X-Forwarded-For`` is read from the right, skipping trusted proxies: the
+    entries to their left were written by the client and could be forged.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _trusted(host):
+        return host
+    forwarded = [
+        hop.strip()
+        for hop in request.headers.get("X-Forwarded-For", "").split(",")
+        if hop.strip()
+    ]
+    for hop in reversed(forwarded):
+        if not _trusted(hop):
+            return hop
+    return forwarded[0] if forwarded else host
+
+
+def client_key(request: Request) -> str:
+    """The user of the bearer token, otherwise the client IP"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    email = verify_token(token) if scheme.lower() == "bearer" and token else None
+    if email:
+        return f"user:{email.lower()}"
+    return f"ip:{client_ip(request)}"
+
+
+class MemoryBuckets:
+    """Token buckets of this process, used while Redis is unavailable"""
+
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(
+        self, key: str, cost: float, capacity: float, rate: float
+    ) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - at) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        if key not in self._buckets and len(self._buckets) >= self.MAX_BUCKETS:
+            self._prune(now, capacity, rate)
+        self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    def _prune(self, now: float, capacity: float, rate: float) -> None:
+        # Buckets that have refilled by now hold nothing worth keeping
+        self._buckets = {
+            key: (tokens, at)
+            for key, (tokens, at) in self._buckets.items()
+            if tokens + (now - at) * rate < capacity
+        }
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class RateLimiter:
+    """Token buckets in Redis, falling back to memory while Redis is down"""
+
+    def __init__(self):
+        self.memory = MemoryBuckets()
+        self._redis = None
+        self._script = None
+        self._redis_loop = None
+        self._redis_down_until = 0.0
+
+    def _redis_script(self):
+        # The client's connections belong to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if self._script is None or self._redis_loop is not loop:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=config.RATE_LIMIT_REDIS_TIMEOUT,
+                socket_connect_timeout=config.RATE_LIMIT_REDIS_TIMEOUT,
+            )
+            self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+            self._redis_loop = loop
+        return self._script
+
+    async def take(self, key: str, cost: float) -> Tuple[bool, float]:
+        """Spend ``cost`` tokens of ``key``'s bucket; (allowed, tokens left)"""
+        capacity = float(config.RATE_LIMIT_BURST)
+        rate = config.RATE_LIMIT_PER_MINUTE / 60
+        # A request costing more than a full bucket could never run
+        cost = min(cost, capacity)
+        if (
+            config.RATE_LIMIT_BACKEND == "redis"
+            and time.monotonic() >= self._redis_down_until
+        ):
+            try:
+                allowed, tokens = await self._redis_script()(
+                    keys=[REDIS_KEY_PREFIX + key], args=[capacity, rate, cost]
+                )
+                return bool(int(allowed)), float(tokens)
+            except Exception as e:
+                logger.warning(
+                    f"Rate limiting in memory for {REDIS_RETRY_SECONDS}s, "
+                    f"Redis unavailable: {e}"
+                )
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        return self.memory.take(key, cost, capacity, rate)
+
+    def retry_after(self, cost: int, tokens: float) -> int:
+        """Seconds until the bucket holds ``cost`` tokens again"""
+        cost = min(cost, config.RATE_LIMIT_BURST)
+        return max(1, int((cost - tokens) / (config.RATE_LIMIT_PER_MINUTE / 60)) + 1)
+
+
+class AdmissionRejected(Exception):
+    pass
+
+
+class AdmissionControl:
+    """Caps requests in flight per process, with a smaller cap for heavy ones"""
+
+    def __init__(self):
+        self._loop = None
+        self._all: Optional[asyncio.Semaphore] = None
+        self._heavy: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+
+    def _semaphores(self) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop or self._all is None or self._heavy is None:
+            self._loop = loop
+            self._all = asyncio.Semaphore(config.MAX_CONCURRENT_REQUESTS)
+            self._heavy = asyncio.Semaphore(config.MAX_CONCURRENT_HEAVY_REQUESTS)
+            self.waiting = 0
+        return self._all, self._heavy
+
+    async def _acquire(self, semaphore: asyncio.Semaphore, deadline: float) -> None:
+        if not semaphore.locked():
+            await semaphore.acquire()
+            return
+        if self.waiting >= config.ADMISSION_MAX_QUEUE:
+            raise AdmissionRejected("queue full")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(
+                semaphore.acquire(), timeout=max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            raise AdmissionRejected("timed out waiting for a slot")
+        finally:
+            self.waiting -= 1
+
+    @asynccontextmanager
+    async def admit(self, heavy: bool):
+        """Hold a request slot (and a heavy one) for the duration
+
+        Raises AdmissionRejected.
+        """
+        every, heavy_slots = self._semaphores()
+        deadline = time.monotonic() + config.ADMISSION_QUEUE_SECONDS
+        # Heavy requests queue for their own slots first, without holding one a
+        # cheap request could use
+        if heavy:
+            await self._acquire(heavy_slots, deadline)
+        try:
+            await self._acquire(every, deadline)
+            try:
+                yield
+            finally:
+                every.release()
+        finally:
+            if heavy:
+                heavy_slots.release()
+
+
+rate_limiter = RateLimiter()
+admission = AdmissionControl()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying rate limits and admission control to /api requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not config.RATE_LIMIT_ENABLED
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        cost = request_cost(
+            request.method,
+            scope["path"],
+            parse_qs(scope.get("query_string", b"").decode("latin-1")),
+        )
+        allowed, tokens = await rate_limiter.take(client_key(request), cost)
+        if not allowed:
+            retry_after = rate_limiter.retry_after(cost, tokens)
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded, try again later"},
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Remaining": str(int(tokens)),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_budget(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-ratelimit-remaining", str(int(tokens)).encode()),
+                ]
+            await send(message)
+
+        try:
+            # The slot is held until the response body is sent, streamed exports too
+            async with admission.admit(
+                heavy=is_heavy(request.method, scope["path"], cost)
+            ):
+                await self.app(scope, receive, send_with_budget)
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected {request.method} {scope['path']}: {e}")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server busy, try again shortly"},
+                headers={
+                    "Retry-After": str(max(1, int(config.ADMISSION_QUEUE_SECONDS)))
+                },
+            )
+            await response(scope, receive, send)
@@ -0,0 +1,103 @@
+"""
+Single-flight coalescing of identical concurrent reads
+
+When several clients ask for the same thing at once (every open dashboard tab
+loading ``/api/stats`` and the first page of ``/api/jobs``), only the first
+request runs the queries; the others wait for and share its result. Requests
+are identical when the route and its normalized parameters match: parameters
+left at their defaults, empty values and parameter order make no difference.
+
+Nothing is cached: a request arriving after the shared execution finished
+starts a new one. The work runs in the threadpool as its own task, so the
+event loop stays free for the requests joining it, and a leader whose client
+disconnects does not cancel it for the others.
+
+``stats()`` reports per route how many requests were served and how many
+of them shared another request's execution (``GET /api/admin/coalescing``).
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.profiling import profiled
+from config import get_config
+
+config = get_config()
+
+
+def normalize_params(params: Dict[str, Any]) -> Tuple:
+    """Hashable, order-independent form of the parameters that are set"""
+    return tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params.items()
+            if value is not None and value != "" and value != []
+        )
+    )
+
+
+class SingleFlight:
+    """Shares one in-flight execution between concurrent identical calls"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._loop = None
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._executions: Dict[str, int] = defaultdict(int)
+
+    async def run(
+        self,
+        route: str,
+        params: Dict[str, Any],
+        fn: Callable[[], Any],
+        shared: bool = True,
+    ):
+        """``fn()`` in the threadpool, or the result of an identical running call"""
+        # A shared execution shows up in the profile of the request that started it
+        fn = profiled(fn)
+        if not config.COALESCE_READS or not shared:
+            return await run_in_threadpool(fn)
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures belong to one event loop
+            self._loop = loop
+            self._inflight = {}
+
+        key = (route, normalize_params(params))
+        self._requests[route] += 1
+        future = self._inflight.get(key)
+        if future is None:
+            self._executions[route] += 1
+            future = asyncio.ensure_future(run_in_threadpool(fn))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            # Retrieved here too, in case every caller went away before it failed
+            future.exception()
+
+    def stats(self) -> Dict[str, Dict]:
+        routes = {}
+        for route, requests in sorted(self._requests.items()):
+            coalesced = requests - self._executions[route]
+            routes[route] = {
+                "requests": requests,
+                "executions": self._executions[route],
+                "coalesced": coalesced,
+                "coalescing_ratio": round(coalesced / requests, 3),
+            }
+        return routes
+
+    def clear(self) -> None:
+        self._requests.clear()
+        self._executions.clear()
+
+
+read_flight = SingleFlight()
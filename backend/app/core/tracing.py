@@ -0,0 +1,120 @@
+"""
+OpenTelemetry tracing
+
+Off unless ``TRACING_EXPORTER`` is set and the packages in
+requirements-tracing.txt are installed. ``setup_tracing`` then installs a
+tracer provider for the process and instruments what it is given:
+
+* FastAPI routes of the API (``app``)
+* SQLAlchemy queries on the primary and replica engines (``engines``)
+* Celery task publishing and execution (``celery=True``), so the trace
+  context of whoever queued a task carries over into the worker
+
+The scraper adds its own spans (``scraper.tracing``): page fetches with site
+and HTTP status, rate-limit and in-flight slot waits, HTML extraction and
+per-page persistence.
+
+Exporters:
+
+* ``otlp`` - OTLP over HTTP to ``OTEL_EXPORTER_OTLP_ENDPOINT`` (default
+  http://localhost:4318), e.g. a local Jaeger all-in-one
+* ``file`` - one JSON span per line appended to ``TRACING_FILE``; summarize
+  it with ``python -m scripts.trace_report``
+* ``console`` - spans printed to stdout
+"""
+
+import logging
+import os
+from typing import Iterable, Optional
+
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+_provider = None
+
+
+def _exporter(name: str):
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if name == "file":
+        return ConsoleSpanExporter(
+            out=open(config.TRACING_FILE, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    if name == "console":
+        return ConsoleSpanExporter()
+    raise ValueError(
+        f"Unknown TRACING_EXPORTER '{name}', expected otlp, file or console"
+    )
+
+
+def setup_tracing(
+    service_name: str, app=None, engines: Iterable = (), celery: bool = False
+) -> bool:
+    """Configure tracing for this process; False when it is disabled or not installed"""
+    exporter = config.TRACING_EXPORTER.strip().lower()
+    if not exporter:
+        return False
+    try:
+        from opentelemetry import trace
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning(
+            "TRACING_EXPORTER is set but tracing is not installed: "
+            "pip install -r requirements-tracing.txt"
+        )
+        return False
+
+    global _provider
+    if _provider is None:
+        _provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            # Follow the caller's decision, sample new traces at the configured ratio
+            sampler=ParentBased(TraceIdRatioBased(config.TRACING_SAMPLE_RATIO)),
+        )
+        _provider.add_span_processor(BatchSpanProcessor(_exporter(exporter)))
+        trace.set_tracer_provider(_provider)
+        logger.info(f"Tracing {service_name} with the {exporter} exporter")
+
+    engines = list(engines)
+    if engines:
+        SQLAlchemyInstrumentor().instrument(engines=engines, tracer_provider=_provider)
+    if app is not None:
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=_provider, excluded_urls="health"
+        )
+    if celery:
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+
+        CeleryInstrumentor().instrument(tracer_provider=_provider)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush spans that are still queued for export"""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def current_trace_id() -> Optional[str]:
+    """Hex id of the active trace, for logs and response headers"""
+    if _provider is None:
+        return None
+    from opentelemetry import trace
+
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
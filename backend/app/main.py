@@ -4,15 +4,14 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 import time
 import logging
-import os
 import sys
 
-# Add the parent directory to Python path for config import
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.core.database import engine, Base
+from app.core.database import engine, replicas, Base
+from app.core.profiling import instrument_engine, request_profiler
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.tracing import current_trace_id, setup_tracing, shutdown_tracing
 from config import get_config
 
 # Get configuration
@@ -31,7 +30,8 @@ app = FastAPI(
     redoc_url="/redoc" if config.DEBUG else None,
 )
 
-# Add middleware
+# Add middleware; the rate limiter sits inside CORS so browsers can read its 429s
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.CORS_ORIGINS,
@@ -45,16 +45,38 @@ if settings.ENVIRONMENT == "production":
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 
 
-# Request timing middleware
+# Request timing middleware; also where requests are profiled (app/core/profiling.py)
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
+    capture = request_profiler.start(request)
+    try:
+        response = await call_next(request)
+    except Exception:
+        if capture is not None:
+            capture.stop()
+        raise
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    profile_id = request_profiler.finish(
+        request, capture, process_time, response.status_code
+    )
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = str(profile_id)
+    trace_id = current_trace_id()
+    if trace_id:
+        response.headers["X-Trace-Id"] = trace_id
     return response
 
 
+# Slow-query logging with plans on every engine
+for database_engine in [engine, *replicas.engines]:
+    instrument_engine(database_engine)
+
+# Tracing middleware goes outermost, so the timing above runs inside the request span
+setup_tracing("dive-api", app=app, engines=[engine, *replicas.engines])
+
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -91,12 +113,14 @@ app.include_router(api_router, prefix="/api")
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting Dive Job Scraper API...")
-    # Create database tables
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created")
-    except Exception as e:
-        logger.error(f"Database table creation failed: {e}")
+    # Deployments create the schema with `alembic upgrade head`; local development
+    # may opt into create_all
+    if config.AUTO_CREATE_TABLES:
+        try:
+            Base.metadata.create_all(bind=engine)
+            logger.info("Database tables created")
+        except Exception as e:
+            logger.error(f"Database table creation failed: {e}")
 
     # Test database connection
     try:
@@ -115,7 +139,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Dive Job Scraper API...")
+    # Close the scrapers' shared HTTP session, if a scrape ever opened one
+    scheduler = sys.modules.get("scraper.scheduler")
+    if scheduler is not None:
+        await scheduler.close_scheduler()
     # Close database connections
     engine.dispose()
+    shutdown_tracing()
     logger.info("API shutdown complete")
-    await redis_client.close()
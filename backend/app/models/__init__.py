@@ -2,6 +2,21 @@
 
 from .user import User
 from .cv import CV
-from .job import Job
+from .job import Job, JobArchive, JobChangeCounter, Company, Location, Source
+from .saved_search import SavedSearch, SearchAlert
+from .scrape_run import ScrapeRun, ScrapeRunPage
 
-__all__ = ["User", "CV", "Job"]
+__all__ = [
+    "User",
+    "CV",
+    "Job",
+    "JobArchive",
+    "JobChangeCounter",
+    "Company",
+    "Location",
+    "Source",
+    "SavedSearch",
+    "SearchAlert",
+    "ScrapeRun",
+    "ScrapeRunPage",
+]
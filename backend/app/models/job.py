@@ -1,22 +1,165 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    Index,
+    Table,
+    DDL,
+    event,
+    text,
+)
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Job(Base):
     __tablename__ = "jobs"
+    # Search, pagination and feed indexes; added to existing databases online
+    # (migrations/online.py)
+    __table_args__ = (
+        Index("ix_jobs_active_id", "is_active", "id"),  # Newest active jobs first
+        # sort=salary
+        Index("ix_jobs_active_salary_max", "is_active", "salary_max", "id"),
+        Index("ix_jobs_change_seq_id", "change_seq", "id"),  # /jobs/changes keyset
+        Index(
+            "ix_jobs_pending_enrichment",
+            "id",
+            postgresql_where=text("enriched_at IS NULL"),
+            sqlite_where=text("enriched_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
-    company = Column(String(255), nullable=False, index=True)
-    location = Column(String(255), nullable=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)
     description = Column(Text, nullable=True)
     salary = Column(String(255), nullable=True)
+    salary_min = Column(Integer, nullable=True, index=True)  # Annual, in ZAR
+    salary_max = Column(Integer, nullable=True, index=True)  # Annual, in ZAR
+    # Currency the salary was quoted in
+    salary_currency = Column(String(3), nullable=True)
+    salary_period = Column(String(10), nullable=True)  # hour, day, week, month or year
     job_type = Column(String(100), nullable=True)  # Full-time, Part-time, Contract, etc.
     experience_level = Column(String(100), nullable=True)  # Entry, Mid, Senior, etc.
     date_posted = Column(DateTime, nullable=True, index=True)
     application_deadline = Column(DateTime, nullable=True)
     link = Column(String(500), nullable=False, unique=True)
-    source = Column(String(100), nullable=False, index=True)  # Indeed, LinkedIn, Spane4all
+    # Indeed, LinkedIn, Spane4all
+    source_id = Column(Integer, ForeignKey("sources.id"), nullable=False, index=True)
     is_active = Column(Boolean, default=True, index=True)
+    # Hash of the scraped fields, used for change detection
+    content_hash = Column(String(64), nullable=True)
+    # Last time a scrape returned this job
+    last_seen_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Detail page fetched; reset when the listing changes
+    enriched_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Failed detail page fetches since the listing last changed; retried with a backoff
+    enrich_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    enrich_failed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Commit-ordered change number, see app.services.job_changes
+    change_seq = Column(Integer, nullable=True)
+
+    # Relationships (lookup tables are tiny, so always join them in)
+    company_ref = relationship("Company", lazy="joined")
+    location_ref = relationship("Location", lazy="joined")
+    source_ref = relationship("Source", lazy="joined")
+
+    @property
+    def company(self):
+        return self.company_ref.name if self.company_ref else None
+
+    @property
+    def location(self):
+        return self.location_ref.name if self.location_ref else None
+
+    @property
+    def province(self):
+        return self.location_ref.province if self.location_ref else None
+
+    @property
+    def source(self):
+        return self.source_ref.name if self.source_ref else None
+
+
+class Company(Base):
+    __tablename__ = "companies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    # Canonical lookup key
+    normalized_name = Column(String(255), nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Location(Base):
+    __tablename__ = "locations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    # Canonical lookup key
+    normalized_name = Column(String(255), nullable=False, unique=True)
+    # One of the provinces in Config.SA_LOCATIONS
+    province = Column(String(100), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Source(Base):
+    __tablename__ = "sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    # Canonical lookup key
+    normalized_name = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class JobChangeCounter(Base):
+    """Single-row counter handing out job change numbers"""
+
+    __tablename__ = "job_change_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+# Databases created from the models get the counter row migration 0010 seeds
+event.listen(
+    JobChangeCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO job_change_counter (id, value) VALUES (1, 0)"),
+)
+
+
+def _archive_columns():
+    """Mirror the jobs columns without their indexes or constraints"""
+    for column in Job.__table__.columns:
+        yield Column(
+            column.name,
+            column.type,
+            nullable=column.nullable,
+            index=column.name == "id",
+        )
+
+
+class JobArchive(Base):
+    """Cold storage for inactive jobs, kept out of the hot ``jobs`` table"""
+
+    __table__ = Table(
+        "jobs_archive",
+        Base.metadata,
+        Column("archive_id", Integer, primary_key=True),
+        *_archive_columns(),
+        Column(
+            "archived_at",
+            DateTime(timezone=True),
+            server_default=func.now(),
+            index=True,
+        ),
+    )
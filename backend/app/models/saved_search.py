@@ -0,0 +1,60 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    # Same filters as GET /api/jobs
+    search = Column(String(255), nullable=True)
+    company = Column(String(255), nullable=True)
+    location = Column(String(255), nullable=True)
+    source = Column(String(100), nullable=True)
+    min_salary = Column(Integer, nullable=True)
+    max_salary = Column(Integer, nullable=True)
+    # Watermark: highest job change number already evaluated
+    last_change_seq = Column(Integer, nullable=False, default=0)
+    is_active = Column(Boolean, default=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User", back_populates="saved_searches")
+    alerts = relationship(
+        "SearchAlert", back_populates="saved_search", cascade="all, delete-orphan"
+    )
+
+
+class SearchAlert(Base):
+    """Digest outbox: one row per job matched by a saved search, until it is mailed"""
+
+    __tablename__ = "search_alerts"
+    __table_args__ = (UniqueConstraint("saved_search_id", "job_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    saved_search_id = Column(
+        Integer, ForeignKey("saved_searches.id"), nullable=False, index=True
+    )
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # No foreign key, archived jobs leave the jobs table
+    job_id = Column(Integer, nullable=False)
+    job_title = Column(String(255), nullable=False)
+    job_link = Column(String(500), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # Relationships
+    saved_search = relationship("SavedSearch", back_populates="alerts")
@@ -0,0 +1,58 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class ScrapeRun(Base):
+    """Ledger of a multi-site scrape, so an interrupted run can be resumed"""
+
+    __tablename__ = "scrape_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Normalized query, location and size
+    run_key = Column(String(500), nullable=False, index=True)
+    query = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
+    max_jobs_per_site = Column(Integer, nullable=False)
+    # running, completed, partial, abandoned
+    status = Column(String(20), nullable=False, default="running", index=True)
+    jobs_saved = Column(Integer, nullable=False, default=0)
+    jobs_updated = Column(Integer, nullable=False, default=0)
+    # Lease of the worker running the run; expired leases can be taken over
+    owner = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    pages = relationship(
+        "ScrapeRunPage", back_populates="run", cascade="all, delete-orphan"
+    )
+
+
+class ScrapeRunPage(Base):
+    """A result page whose jobs have been persisted"""
+
+    __tablename__ = "scrape_run_pages"
+    __table_args__ = (UniqueConstraint("run_id", "site", "page"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("scrape_runs.id"), nullable=False, index=True)
+    site = Column(String(100), nullable=False)
+    page = Column(Integer, nullable=False)
+    jobs_found = Column(Integer, nullable=False, default=0)
+    # The site needs no further pages
+    is_last = Column(Boolean, nullable=False, default=False)
+    completed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    run = relationship("ScrapeRun", back_populates="pages")
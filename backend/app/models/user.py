@@ -18,3 +18,4 @@ class User(Base):
 
     # Relationships
     cvs = relationship("CV", back_populates="user")
+    saved_searches = relationship("SavedSearch", back_populates="user")
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+
+class SavedSearchBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    search: Optional[str] = Field(None, max_length=255)
+    company: Optional[str] = Field(None, max_length=255)
+    location: Optional[str] = Field(None, max_length=255)
+    source: Optional[str] = Field(None, max_length=100)
+    min_salary: Optional[int] = Field(None, ge=0)
+    max_salary: Optional[int] = Field(None, ge=0)
+
+
+class SavedSearchCreate(SavedSearchBase):
+    pass
+
+
+class SavedSearchResponse(SavedSearchBase):
+    id: int
+    is_active: bool
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SearchAlertResponse(BaseModel):
+    id: int
+    saved_search_id: int
+    job_id: int
+    job_title: str
+    job_link: str
+    created_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
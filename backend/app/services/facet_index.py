@@ -0,0 +1,237 @@
+"""
+Bitmap facet index for job search
+
+Each facet value (a source, a province, a job type, ...) owns a bitmap of the
+active job ids carrying that value, stored as a Python int. Facet counts for a
+query are then popcounts of bitmap intersections instead of one ``GROUP BY``
+per facet per request.
+
+The index is kept in step with ingestion through the commit-ordered
+``change_seq`` that every job writer stamps (``app.services.job_changes``),
+and is fully rebuilt every ``FACET_INDEX_REBUILD_MINUTES`` to drop archived
+rows.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from sqlalchemy import true
+from sqlalchemy.orm import Session
+
+from app.models.job import Job, Location, Source
+from app.services.job_dimensions import clean_text
+from config import get_config
+
+if TYPE_CHECKING:
+    import numpy as np
+
+config = get_config()
+
+FACETS = ("source", "province", "job_type", "experience_level", "salary_band")
+
+SALARY_BANDS = (
+    (250_000, "Under R250k"),
+    (500_000, "R250k - R500k"),
+    (750_000, "R500k - R750k"),
+    (1_000_000, "R750k - R1m"),
+    (float("inf"), "R1m+"),
+)
+UNDISCLOSED_SALARY = "Undisclosed"
+
+
+def salary_band(salary_max: Optional[int]) -> str:
+    """Bucket a job by the top of its annual ZAR salary range"""
+    if salary_max is None:
+        return UNDISCLOSED_SALARY
+    for limit, label in SALARY_BANDS:
+        if salary_max < limit:
+            return label
+    return SALARY_BANDS[-1][1]
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """Pack job ids into an int bitmap"""
+    # Imported here so the API starts without numpy
+    import numpy as np
+
+    array = np.fromiter(ids, dtype=np.int64)
+    if not array.size:
+        return 0
+    bits = np.zeros(int(array.max()) + 1, dtype=bool)
+    bits[array] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def ids_from_bitmap(bitmap: int) -> "np.ndarray":
+    """Unpack an int bitmap into a sorted array of job ids"""
+    import numpy as np
+
+    if not bitmap:
+        return np.empty(0, dtype=np.int64)
+    raw = np.frombuffer(
+        bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8
+    )
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+class FacetIndex:
+    """In-process bitmap index over the active jobs"""
+
+    def __init__(self, rebuild_minutes: Optional[int] = None):
+        self.rebuild_seconds = 60 * (
+            rebuild_minutes
+            if rebuild_minutes is not None
+            else config.FACET_INDEX_REBUILD_MINUTES
+        )
+        self._lock = threading.Lock()
+        # Held for a whole sync, so concurrent requests do not each rebuild
+        self._sync_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all state; the next sync rebuilds from the database"""
+        self._active = 0
+        self._bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._watermark: Optional[int] = None
+        self._built_at: Optional[float] = None
+
+    def _rows(self, db: Session, since: Optional[int] = None):
+        query = (
+            db.query(
+                Job.id,
+                Job.is_active,
+                Job.change_seq,
+                Job.job_type,
+                Job.experience_level,
+                Job.salary_max,
+                Source.name.label("source"),
+                Location.province.label("province"),
+            )
+            .outerjoin(Source, Job.source_id == Source.id)
+            .outerjoin(Location, Job.location_id == Location.id)
+        )
+        if since is None:
+            return query.filter(Job.is_active == true()).all()
+        # Change numbers become visible in order, so everything up to the watermark
+        # is applied
+        return query.filter(Job.change_seq > since).all()
+
+    @staticmethod
+    def _facet_values(row) -> Dict[str, Optional[str]]:
+        return {
+            "source": row.source,
+            "province": row.province,
+            "job_type": clean_text(row.job_type) or None,
+            "experience_level": clean_text(row.experience_level) or None,
+            "salary_band": salary_band(row.salary_max),
+        }
+
+    def _apply(self, rows: List, reset: bool = False) -> None:
+        touched = bitmap_from_ids(row.id for row in rows)
+        grouped: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        active_ids = []
+        for row in rows:
+            if not row.is_active:
+                continue
+            active_ids.append(row.id)
+            for facet, value in self._facet_values(row).items():
+                if value:
+                    grouped[facet].setdefault(value, []).append(row.id)
+
+        with self._lock:
+            if reset:
+                self._active = 0
+                self._bitmaps = {facet: {} for facet in FACETS}
+            else:
+                # Clear every touched job first, then set it again under its current
+                # values
+                self._active &= ~touched
+                for bitmaps in self._bitmaps.values():
+                    for value in list(bitmaps):
+                        bitmaps[value] &= ~touched
+                        if not bitmaps[value]:
+                            del bitmaps[value]
+
+            self._active |= bitmap_from_ids(active_ids)
+            for facet, values in grouped.items():
+                for value, ids in values.items():
+                    self._bitmaps[facet][value] = self._bitmaps[facet].get(
+                        value, 0
+                    ) | bitmap_from_ids(ids)
+
+            watermarks = [row.change_seq for row in rows if row.change_seq is not None]
+            if watermarks:
+                self._watermark = max([self._watermark or watermarks[0], *watermarks])
+
+    def sync(self, db: Session) -> None:
+        """
+        Bring the index up to date with the jobs table
+
+        One caller syncs at a time. While a sync runs, other callers wait for
+        it only if the index was never built, and otherwise use the index as
+        it stands.
+        """
+        if not self._sync_lock.acquire(blocking=self._built_at is None):
+            return
+        try:
+            if (
+                self._built_at is None
+                or time.monotonic() - self._built_at > self.rebuild_seconds
+            ):
+                self._apply(self._rows(db), reset=True)
+                self._built_at = time.monotonic()
+            else:
+                # Without a watermark nothing carried a change number at build time
+                self._apply(self._rows(db, since=self._watermark or 0))
+        finally:
+            self._sync_lock.release()
+
+    def active_bitmap(self) -> int:
+        return self._active
+
+    def query(self, base: int, selections: Dict[str, List[str]]) -> Dict:
+        """
+        Compute the matching bitmap and facet counts for a query.
+
+        ``base`` is the bitmap of jobs matching the non-facet filters and
+        ``selections`` maps facet names to selected values (OR within a facet,
+        AND across facets). Counts for a facet ignore that facet's own
+        selection so the UI can offer the alternatives.
+        """
+        with self._lock:
+            bitmaps = {facet: dict(values) for facet, values in self._bitmaps.items()}
+
+        selected = {}
+        for facet, values in selections.items():
+            if values:
+                mask = 0
+                for value in values:
+                    mask |= bitmaps[facet].get(value, 0)
+                selected[facet] = mask
+
+        matches = base
+        for mask in selected.values():
+            matches &= mask
+
+        facets = {}
+        for facet in FACETS:
+            scope = base
+            for other, mask in selected.items():
+                if other != facet:
+                    scope &= mask
+            counts = [
+                (value, (scope & bitmap).bit_count())
+                for value, bitmap in bitmaps[facet].items()
+            ]
+            facets[facet] = [
+                {"value": value, "count": count}
+                for value, count in sorted(counts, key=lambda item: -item[1])
+                if count
+            ]
+
+        return {"matches": matches, "total": matches.bit_count(), "facets": facets}
+
+
+# Shared by all requests in this process
+facet_index = FacetIndex()
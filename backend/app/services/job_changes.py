@@ -0,0 +1,43 @@
+"""
+Commit-ordered change numbers for jobs
+
+Every transaction that changes jobs stamps the rows it touches with a number
+from ``next_change_seq``. The number is taken from a single counter row that
+stays locked until the transaction commits or rolls back, so a transaction
+holding a later number cannot commit before the one holding an earlier
+number. Numbers therefore become visible in increasing order, on the
+primary and on replicas replaying its commits: a reader that has seen
+number N has seen every change numbered N or below.
+
+Timestamps taken inside the transaction do not have this property. A
+transaction that stamped ``updated_at`` first can commit last, after a
+consumer has already moved its watermark past that time, and its rows are
+never delivered. ``/jobs/changes`` and the facet index page through
+``(change_seq, id)`` instead.
+
+Writers take the number as late as they can, right before their writes, to
+keep the time the counter is held short.
+"""
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.job import JobChangeCounter
+
+COUNTER_ID = 1
+
+
+def next_change_seq(db: Session) -> int:
+    """Take the next change number; the counter stays locked until ``db`` commits"""
+    seq = db.execute(
+        update(JobChangeCounter)
+        .where(JobChangeCounter.id == COUNTER_ID)
+        .values(value=JobChangeCounter.value + 1)
+        .returning(JobChangeCounter.value)
+    ).scalar()
+    if seq is None:
+        raise RuntimeError(
+            "job_change_counter has no row; it is seeded by migration 0010 "
+            "and when the table is created from the models"
+        )
+    return seq
@@ -0,0 +1,163 @@
+"""
+Canonicalization of job companies, locations and sources
+
+Free-text values from the scrapers are folded into small lookup tables so jobs
+only carry integer foreign keys. Locations are mapped to the provinces listed
+in ``Config.SA_LOCATIONS``.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.job import Company, Location, Source
+from config import get_config
+
+config = get_config()
+
+# "City, Province" pairs from the configured South African locations
+CITY_PROVINCES: Dict[str, str] = {}
+CANONICAL_LOCATIONS: Dict[str, str] = {}
+for _entry in config.SA_LOCATIONS:
+    _city, _province = [part.strip() for part in _entry.split(",", 1)]
+    CITY_PROVINCES[_city.casefold()] = _province
+    CANONICAL_LOCATIONS[_city.casefold()] = _entry
+PROVINCES: Dict[str, str] = {
+    province.casefold(): province for province in CITY_PROVINCES.values()
+}
+
+UNKNOWN_NAME = "Unknown"
+
+_WHITESPACE = re.compile(r"\s+")
+_COMPANY_SUFFIX = re.compile(
+    r"[\s,]*\(?\b(pty\.?\s*\)?\s*ltd|ltd|limited|inc|incorporated|llc)\b\.?\)?$",
+    re.IGNORECASE,
+)
+
+
+def clean_text(value: Optional[str]) -> str:
+    """Trim and collapse internal whitespace"""
+    return _WHITESPACE.sub(" ", value or "").strip()
+
+
+def required_name(value: Optional[str]) -> str:
+    """Name for a lookup every job must have; blank ones become ``UNKNOWN_NAME``"""
+    return clean_text(value) or UNKNOWN_NAME
+
+
+def normalize_company(name: str) -> Tuple[str, str]:
+    """Return the display name and lookup key for a company"""
+    display = clean_text(name)
+    key = _COMPANY_SUFFIX.sub("", display).strip(" .,").casefold()
+    return display, key or display.casefold()
+
+
+def normalize_source(name: str) -> Tuple[str, str]:
+    """Return the display name and lookup key for a job source"""
+    display = clean_text(name)
+    return display, display.casefold()
+
+
+def province_for(location: str) -> Optional[str]:
+    """Map a free-text location to a South African province, if recognisable"""
+    parts = [part.strip().casefold() for part in location.split(",")]
+    for part in parts:
+        if part in PROVINCES:
+            return PROVINCES[part]
+    for part in parts:
+        if part in CITY_PROVINCES:
+            return CITY_PROVINCES[part]
+
+    lowered = location.casefold()
+    for key, province in PROVINCES.items():
+        if key in lowered:
+            return province
+    return None
+
+
+def normalize_location(name: str) -> Tuple[str, str]:
+    """Return the display name and lookup key for a location"""
+    display = clean_text(name)
+    display = CANONICAL_LOCATIONS.get(display.casefold(), display)
+    return display, display.casefold()
+
+
+_NORMALIZERS = {
+    Company: normalize_company,
+    Location: normalize_location,
+    Source: normalize_source,
+}
+
+
+def _new_row(model, display: str, key: str):
+    if model is Location:
+        return Location(
+            name=display, normalized_name=key, province=province_for(display)
+        )
+    return model(name=display, normalized_name=key)
+
+
+def resolve_ids(db: Session, model, names: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    Map raw names to lookup-table ids, creating missing rows.
+
+    Returns a dict keyed by the raw names passed in; blank names are skipped.
+    """
+    normalize = _NORMALIZERS[model]
+    keys_by_name: Dict[str, str] = {}
+    display_by_key: Dict[str, str] = {}
+    for name in names:
+        if not name or name in keys_by_name:
+            continue
+        display, key = normalize(name)
+        if not key:
+            continue
+        keys_by_name[name] = key
+        display_by_key.setdefault(key, display)
+
+    ids_by_key = _existing_ids(db, model, list(display_by_key))
+
+    missing = [key for key in display_by_key if key not in ids_by_key]
+    if missing:
+        try:
+            with db.begin_nested():
+                db.add_all(_new_row(model, display_by_key[key], key) for key in missing)
+        except IntegrityError:
+            # Another writer created some of them first; insert the rest one by one
+            for key in missing:
+                try:
+                    with db.begin_nested():
+                        db.add(_new_row(model, display_by_key[key], key))
+                except IntegrityError:
+                    pass
+        ids_by_key.update(_existing_ids(db, model, missing))
+
+    return {name: ids_by_key[key] for name, key in keys_by_name.items()}
+
+
+def _existing_ids(db: Session, model, keys: List[str]) -> Dict[str, int]:
+    ids: Dict[str, int] = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start : start + 500]
+        for row in db.query(model.id, model.normalized_name).filter(
+            model.normalized_name.in_(chunk)
+        ):
+            ids[row.normalized_name] = row.id
+    return ids
+
+
+def matching_ids(model, pattern: str) -> Select:
+    """Subquery of lookup ids whose name contains ``pattern`` (case-insensitive)"""
+    condition = model.name.ilike(f"%{pattern}%")
+    if model is Location:
+        condition = condition | model.province.ilike(f"%{pattern}%")
+    return select(model.id).where(condition)
+
+
+def source_ids(name: str) -> Select:
+    """Subquery of the id of a source by name (case-insensitive)"""
+    _, key = normalize_source(name)
+    return select(Source.id).where(Source.normalized_name == key)
@@ -0,0 +1,146 @@
+"""
+Detail page enrichment for stored jobs
+
+Works through the active jobs whose ``enriched_at`` is still NULL in id
+order, one committed batch at a time. A run that stops part way leaves the
+finished batches marked, so the next run picks up where it left off. A page
+that cannot be fetched or parsed counts an attempt against the job: it is
+retried after ``ENRICHMENT_RETRY_HOURS`` and left alone after
+``ENRICHMENT_MAX_ATTEMPTS``, until a changed listing resets the count.
+
+Enriched descriptions are swapped into the relevance corpus statistics and
+the CV match vectors.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import or_, true
+from sqlalchemy.orm import Session
+
+from app.models.job import Job, Source
+from app.services.job_changes import next_change_seq
+from app.services.job_vectors import index_jobs
+from app.services.relevance import record_replaced
+from config import get_config
+from scraper.enrichment import DetailEnricher, DetailTask
+from scraper.scheduler import BACKGROUND
+from scraper.unified_scraper import UnifiedJobScraper
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+
+async def enrich_pending_jobs(
+    db: Session,
+    max_jobs: Optional[int] = None,
+    scraper: Optional[UnifiedJobScraper] = None,
+) -> Dict[str, int]:
+    """Fetch detail pages for jobs not enriched yet; counts enriched and failed jobs"""
+    counts = {"enriched": 0, "failed": 0}
+    last_id = 0
+
+    async def run(scraper: UnifiedJobScraper):
+        nonlocal last_id
+        enricher = DetailEnricher(scraper, concurrency=config.ENRICHMENT_CONCURRENCY)
+        while max_jobs is None or counts["enriched"] + counts["failed"] < max_jobs:
+            limit = config.ENRICHMENT_BATCH_SIZE
+            retry_before = datetime.utcnow() - timedelta(
+                hours=config.ENRICHMENT_RETRY_HOURS
+            )
+            if max_jobs is not None:
+                limit = min(limit, max_jobs - counts["enriched"] - counts["failed"])
+            rows = (
+                db.query(
+                    Job.id,
+                    Job.link,
+                    Job.title,
+                    Job.description,
+                    Source.name.label("source"),
+                )
+                .outerjoin(Source, Job.source_id == Source.id)
+                .filter(
+                    Job.id > last_id,
+                    Job.is_active == true(),
+                    Job.enriched_at.is_(None),
+                    Job.enrich_attempts < config.ENRICHMENT_MAX_ATTEMPTS,
+                    or_(
+                        Job.enrich_failed_at.is_(None),
+                        Job.enrich_failed_at < retry_before,
+                    ),
+                )
+                .order_by(Job.id)
+                .limit(limit)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            tasks = []
+            for row in rows:
+                site = scraper.registry.key_for_source(row.source)
+                if site:
+                    tasks.append(
+                        DetailTask(
+                            job_id=row.id, link=row.link, site=site, title=row.title
+                        )
+                    )
+            results = await enricher.enrich(tasks)
+
+            now = datetime.utcnow()
+            change_seq = next_change_seq(db)
+            reindex = []
+            failed_ids = []
+            replaced = []
+            for row in rows:
+                if row.id in results and results[row.id] is None:
+                    failed_ids.append(row.id)
+                    continue
+                # Boards without an adapter have nothing to fetch; mark them so they are
+                # not retried
+                fields = results.get(row.id) or {}
+                db.query(Job).filter(Job.id == row.id).update(
+                    {
+                        **fields,
+                        "enriched_at": now,
+                        "updated_at": now,
+                        "change_seq": change_seq,
+                    },
+                    synchronize_session=False,
+                )
+                counts["enriched"] += 1
+                if fields.get("description"):
+                    reindex.append((row.id, row.title, fields["description"]))
+                    replaced.append((row.title, row.description))
+            if failed_ids:
+                # Not a change of the job, so no change number or updated_at
+                db.query(Job).filter(Job.id.in_(failed_ids)).update(
+                    {
+                        Job.enrich_attempts: Job.enrich_attempts + 1,
+                        Job.enrich_failed_at: now,
+                        Job.updated_at: Job.updated_at,
+                    },
+                    synchronize_session=False,
+                )
+                counts["failed"] += len(failed_ids)
+            db.commit()
+
+            record_replaced(
+                replaced, [(title, description) for _, title, description in reindex]
+            )
+            # Full descriptions make for much better CV matches
+            index_jobs(reindex)
+
+    if scraper is not None:
+        await run(scraper)
+    else:
+        # Detail pages yield the shared fetch budget to user-triggered scrapes
+        async with UnifiedJobScraper(priority=BACKGROUND) as scraper:
+            await run(scraper)
+
+    logger.info(
+        f"Enriched {counts['enriched']} jobs, {counts['failed']} detail pages failed"
+    )
+    return counts
@@ -0,0 +1,195 @@
+"""
+Streaming bulk export of jobs
+
+The export reads plain column tuples (no ORM objects, so nothing piles up in
+the session's identity map) through a server-side cursor, ``EXPORT_BATCH_SIZE``
+rows at a time, and encodes every batch as soon as it arrives. Memory stays
+flat however many jobs are exported:
+
+* ``csv`` - header row, then one row per job
+* ``ndjson`` - one JSON object per line
+* ``parquet`` - one row group per batch; needs ``pyarrow`` (requirements.txt)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import true
+from sqlalchemy.orm import Query, Session
+
+from app.models.job import Company, Job, Location, Source
+from config import get_config
+
+config = get_config()
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Same fields as the job list endpoint
+EXPORT_COLUMNS: List[Tuple[str, Any]] = [
+    ("id", Job.id),
+    ("title", Job.title),
+    ("company", Company.name),
+    ("location", Location.name),
+    ("province", Location.province),
+    ("description", Job.description),
+    ("salary", Job.salary),
+    ("salary_min", Job.salary_min),
+    ("salary_max", Job.salary_max),
+    ("salary_currency", Job.salary_currency),
+    ("salary_period", Job.salary_period),
+    ("job_type", Job.job_type),
+    ("experience_level", Job.experience_level),
+    ("date_posted", Job.date_posted),
+    ("link", Job.link),
+    ("source", Source.name),
+    ("created_at", Job.created_at),
+]
+COLUMN_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+
+def export_query(db: Session) -> Query:
+    """Active jobs as flat rows, in id order; the list filters can be applied on top"""
+    return (
+        db.query(*(column.label(name) for name, column in EXPORT_COLUMNS))
+        .select_from(Job)
+        .join(Company, Job.company_id == Company.id)
+        .outerjoin(Location, Job.location_id == Location.id)
+        .join(Source, Job.source_id == Source.id)
+        .filter(Job.is_active == true())
+        .order_by(Job.id)
+    )
+
+
+def _batches(db: Session, query: Query) -> Iterator[Sequence[Sequence]]:
+    # yield_per streams from a server-side cursor on PostgreSQL
+    result = db.execute(
+        query.statement, execution_options={"yield_per": config.EXPORT_BATCH_SIZE}
+    )
+    for rows in result.partitions():
+        yield rows
+
+
+def _isoformat(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_chunks(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    for rows in batches:
+        writer.writerows(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_chunks(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(COLUMN_NAMES, row)), default=_isoformat) + "\n"
+            for row in rows
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet records absolute offsets in the footer
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa  # type: ignore[import-untyped]
+
+    text, integer, timestamp = pa.string(), pa.int64(), pa.timestamp("us")
+    types = {
+        "id": integer,
+        "salary_min": integer,
+        "salary_max": integer,
+        "date_posted": timestamp,
+        "created_at": timestamp,
+    }
+    return pa.schema([(name, types.get(name, text)) for name in COLUMN_NAMES])
+
+
+def _naive_utc(value):
+    """Parquet timestamps are written as naive UTC"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parquet_chunks(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.parquet as pq  # type: ignore[import-untyped]
+
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for rows in batches:
+            columns = list(zip(*rows))
+            writer.write_table(
+                pa.table(
+                    [[_naive_utc(value) for value in column] for column in columns],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    # Footer, or the whole (empty) file when nothing matched
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_export(db: Session, query: Query, fmt: str) -> Iterator[bytes]:
+    """Encoded chunks of an export of ``query`` (see ``export_query``) in ``fmt``"""
+    encoders = {
+        "csv": _csv_chunks,
+        "ndjson": _ndjson_chunks,
+        "parquet": _parquet_chunks,
+    }
+    return encoders[fmt](_batches(db, query))
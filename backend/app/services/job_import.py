@@ -0,0 +1,156 @@
+"""
+Bulk import of job dumps
+
+Loads NDJSON, CSV or Parquet files (for example a ``/jobs/export`` of another
+instance) into the jobs table. Records are read as a stream and handed to
+``persist_jobs`` in chunks of ``IMPORT_CHUNK_SIZE``, so they get the same
+normalization and dedup by link as scraped jobs, while new rows are written
+in bulk (``COPY`` on PostgreSQL, ``executemany`` on SQLite).
+
+The whole import is one transaction: a file that fails half way leaves the
+table untouched. SQLite databases are switched to WAL first so readers are
+not blocked while it runs.
+"""
+
+import csv
+import io
+import json
+import logging
+import time
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.job_ingest import persist_jobs
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+# Fields the scraper produces; anything else in a record (ids, derived columns) is
+# ignored
+IMPORT_FIELDS = (
+    "title",
+    "company",
+    "location",
+    "description",
+    "salary",
+    "job_type",
+    "experience_level",
+    "date_posted",
+    "link",
+    "source",
+)
+REQUIRED_FIELDS = ("title", "company", "link", "source")
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Import format from a file extension (.ndjson/.jsonl, .csv, .parquet)"""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return {
+        "jsonl": "ndjson",
+        "ndjson": "ndjson",
+        "csv": "csv",
+        "parquet": "parquet",
+    }.get(extension)
+
+
+def _read_ndjson(stream: BinaryIO) -> Iterator[Dict]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _read_csv(stream: BinaryIO) -> Iterator[Dict]:
+    yield from csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+
+
+def _read_parquet(stream: BinaryIO) -> Iterator[Dict]:
+    import pyarrow.parquet as pq  # type: ignore[import-untyped]
+
+    for batch in pq.ParquetFile(stream).iter_batches(
+        batch_size=config.IMPORT_CHUNK_SIZE
+    ):
+        yield from batch.to_pylist()
+
+
+def read_records(stream: BinaryIO, fmt: str) -> Iterator[Dict]:
+    """Raw records of a dump, one at a time"""
+    readers = {"ndjson": _read_ndjson, "csv": _read_csv, "parquet": _read_parquet}
+    return readers[fmt](stream)
+
+
+def normalize_record(record: Dict) -> Optional[Dict]:
+    """A record as scraped job data, or None when a required field is missing"""
+    job = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            # CSV has no NULL; an empty cell is a missing value
+            value = " ".join(value.split()) if field != "description" else value.strip()
+            value = value or None
+        job[field] = value
+    if any(job[field] is None for field in REQUIRED_FIELDS):
+        return None
+    return job
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_jobs(
+    db: Session, records: Iterable[Dict], chunk_size: Optional[int] = None
+) -> Dict:
+    """
+    Persist raw job records in one transaction and commit.
+
+    Returns the counts of ``persist_jobs`` plus ``rows`` read, ``rejected``
+    records, ``seconds`` and ``rows_per_second``.
+    """
+    chunk_size = chunk_size or config.IMPORT_CHUNK_SIZE
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("PRAGMA journal_mode=WAL"))
+
+    started = time.perf_counter()
+    report: Dict[str, Any] = {
+        "rows": 0,
+        "rejected": 0,
+        "saved": 0,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    try:
+        for chunk in _chunked(records, chunk_size):
+            jobs = [job for job in map(normalize_record, chunk) if job is not None]
+            report["rows"] += len(chunk)
+            report["rejected"] += len(chunk) - len(jobs)
+            for name, count in persist_jobs(db, jobs, bulk=True).items():
+                report[name] += count
+            logger.info(f"Imported {report['rows']} rows")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    seconds = time.perf_counter() - started
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = (
+        round(report["rows"] / seconds) if seconds else report["rows"]
+    )
+    logger.info(
+        f"Imported {report['rows']} rows in {seconds:.1f}s "
+        f"({report['rows_per_second']} rows/s): {report['saved']} new, "
+        f"{report['updated']} updated, {report['unchanged']} unchanged, "
+        f"{report['rejected']} rejected"
+    )
+    return report
@@ -0,0 +1,315 @@
+"""
+Persistence path for scraped jobs
+
+Every scrape result is matched to existing rows by ``link``. New jobs are
+inserted, jobs whose scraped content changed are updated, and the remaining
+rows only get their ``last_seen_at`` bumped in a single statement.
+
+``last_seen_at`` is when the board showed the job: a record served from the
+scraper's page cache carries the fetch time of its page as ``seen_at``. An
+unchanged job never has its ``last_seen_at`` moved backwards.
+
+Bulk imports pass ``bulk=True``: new jobs are then written without ORM
+objects, with ``COPY`` on PostgreSQL and a single ``executemany`` insert
+elsewhere.
+"""
+
+import hashlib
+import io
+import logging
+from datetime import datetime
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import false, insert, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.database import after_commit
+from app.models.job import Company, Job, Location, Source
+from app.services.job_changes import next_change_seq
+from app.services.job_dimensions import required_name, resolve_ids
+from app.services.relevance import record_ingested, record_replaced
+from app.services.salary import salary_columns
+
+logger = logging.getLogger(__name__)
+
+# Fields a scrape can observe; a change in any of them marks the job as updated
+HASH_FIELDS = (
+    "title",
+    "company",
+    "location",
+    "description",
+    "salary",
+    "job_type",
+    "experience_level",
+)
+
+# Scraper records go straight in as JobResults; imports and older callers pass dicts
+ScrapedJob = Union[Dict, Any]
+
+# Keep IN (...) lists below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _field(job_data: ScrapedJob, name: str):
+    """A field of a scraped job, given as a dict or as a ``JobResult``"""
+    return (
+        job_data.get(name)
+        if isinstance(job_data, dict)
+        else getattr(job_data, name, None)
+    )
+
+
+def compute_content_hash(job_data: ScrapedJob) -> str:
+    """Stable hash of the scraped fields of a job"""
+    key_string = "\x1f".join(
+        str(_field(job_data, field) or "").strip() for field in HASH_FIELDS
+    )
+    return hashlib.sha256(key_string.encode()).hexdigest()
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Accept the datetimes of ``JobResult`` and ISO strings from dicts and imports"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _seen_at(job_data: ScrapedJob, now: datetime) -> datetime:
+    """When the job was last seen on its board, never later than ``now``"""
+    seen = _parse_datetime(_field(job_data, "seen_at"))
+    return min(seen, now) if seen else now
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _job_values(job_data: ScrapedJob, dimensions: Dict[type, Dict[str, int]]) -> Dict:
+    """Column values for a scraped job, with lookup names replaced by ids"""
+    return {
+        "title": _field(job_data, "title"),
+        "company_id": dimensions[Company][required_name(_field(job_data, "company"))],
+        "location_id": dimensions[Location].get(_field(job_data, "location")),
+        "description": _field(job_data, "description"),
+        "salary": _field(job_data, "salary"),
+        **salary_columns(_field(job_data, "salary")),
+        "job_type": _field(job_data, "job_type"),
+        "experience_level": _field(job_data, "experience_level"),
+        "date_posted": _parse_datetime(_field(job_data, "date_posted")),
+        "source_id": dimensions[Source][required_name(_field(job_data, "source"))],
+    }
+
+
+def _resolve_dimensions(
+    db: Session, records: Iterable[ScrapedJob]
+) -> Dict[type, Dict[str, int]]:
+    """Resolve the company, location and source names of a batch in one pass each"""
+    records = list(records)
+    return {
+        Company: resolve_ids(
+            db, Company, (required_name(_field(job, "company")) for job in records)
+        ),
+        Location: resolve_ids(
+            db, Location, (_field(job, "location") for job in records)
+        ),
+        Source: resolve_ids(
+            db, Source, (required_name(_field(job, "source")) for job in records)
+        ),
+    }
+
+
+def _copy_field(value) -> str:
+    """A value in PostgreSQL's COPY text format"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def insert_job_rows(db: Session, rows: List[Dict]) -> Dict[str, int]:
+    """Insert new job rows in the session's transaction; returns their ids by link"""
+    if db.get_bind().dialect.name == "postgresql":
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_field(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {Job.__tablename__} ({', '.join(columns)}) FROM STDIN", buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        db.execute(insert(Job), rows)
+
+    ids: Dict[str, int] = {}
+    for links in _chunks([row["link"] for row in rows], LOOKUP_CHUNK_SIZE):
+        for job_id, link in db.query(Job.id, Job.link).filter(Job.link.in_(links)):
+            ids[link] = job_id
+    return ids
+
+
+def persist_jobs(
+    db: Session, jobs_data: Iterable[ScrapedJob], bulk: bool = False
+) -> Dict[str, int]:
+    """
+    Insert new jobs, update changed ones and mark unchanged ones as seen.
+
+    Returns counts of ``saved`` (new), ``updated`` and ``unchanged`` jobs.
+    The caller owns the transaction and is expected to commit. With ``bulk``
+    new jobs go through ``insert_job_rows`` instead of the ORM.
+    """
+    now = datetime.utcnow()
+
+    # Deduplicate within the batch, last occurrence wins
+    records: Dict[str, ScrapedJob] = {}
+    for job_data in jobs_data:
+        link = _field(job_data, "link")
+        if link:
+            records[link] = job_data
+
+    existing = {}
+    for links in _chunks(list(records), LOOKUP_CHUNK_SIZE):
+        for row in db.query(Job.id, Job.link, Job.content_hash).filter(
+            Job.link.in_(links)
+        ):
+            existing[row.link] = row
+
+    new_jobs: List[Dict[str, Any]] = []
+    changed_rows: List[Dict[str, Any]] = []
+    unchanged_ids = []
+    unchanged_by_seen: Dict[datetime, List[int]] = defaultdict(list)
+    pending = {}
+
+    for link, job_data in records.items():
+        content_hash = compute_content_hash(job_data)
+        current = existing.get(link)
+
+        if current is None or current.content_hash != content_hash:
+            pending[link] = content_hash
+        else:
+            unchanged_ids.append(current.id)
+            unchanged_by_seen[_seen_at(job_data, now)].append(current.id)
+
+    # Seen again after expiring: a change for the delta feed
+    reactivated_ids: List[int] = []
+    for ids in _chunks(unchanged_ids, LOOKUP_CHUNK_SIZE):
+        reactivated_ids.extend(
+            job_id
+            for (job_id,) in db.query(Job.id).filter(
+                Job.id.in_(ids), Job.is_active == false()
+            )
+        )
+
+    # Only new and changed jobs need their companies, locations and sources resolved
+    dimensions = _resolve_dimensions(db, (records[link] for link in pending))
+    change_seq = next_change_seq(db) if pending or reactivated_ids else None
+
+    for link, content_hash in pending.items():
+        job_data = records[link]
+        current = existing.get(link)
+
+        if current is None:
+            new_jobs.append(
+                {
+                    **_job_values(job_data, dimensions),
+                    "link": link,
+                    "content_hash": content_hash,
+                    "last_seen_at": _seen_at(job_data, now),
+                    "updated_at": now,
+                    "change_seq": change_seq,
+                    "is_active": True,
+                }
+            )
+        else:
+            changed_rows.append(
+                {
+                    "id": current.id,
+                    **_job_values(job_data, dimensions),
+                    "content_hash": content_hash,
+                    "last_seen_at": _seen_at(job_data, now),
+                    "updated_at": now,
+                    "change_seq": change_seq,
+                    "is_active": True,
+                    # The listing changed, so the detail page has to be fetched again
+                    "enriched_at": None,
+                    "enrich_attempts": 0,
+                    "enrich_failed_at": None,
+                }
+            )
+
+    if new_jobs:
+        if bulk:
+            new_ids = insert_job_rows(db, new_jobs)
+            for values in new_jobs:
+                values["id"] = new_ids[values["link"]]
+        else:
+            jobs = [Job(**values) for values in new_jobs]
+            db.add_all(jobs)
+            db.flush()
+            for values, job in zip(new_jobs, jobs):
+                values["id"] = job.id
+        documents = [(values["title"], values["description"]) for values in new_jobs]
+        after_commit(db, lambda: record_ingested(documents))
+
+    if changed_rows:
+        # The text being replaced leaves the corpus statistics once this commits
+        replaced: List[Any] = []
+        for ids in _chunks([row["id"] for row in changed_rows], LOOKUP_CHUNK_SIZE):
+            replaced.extend(
+                db.query(Job.title, Job.description).filter(Job.id.in_(ids)).all()
+            )
+        db.execute(update(Job), changed_rows)
+        changed = [(row["title"], row["description"]) for row in changed_rows]
+        after_commit(db, lambda: record_replaced(replaced, changed))
+
+    if new_jobs or changed_rows:
+        # numpy is only loaded once jobs are ingested, not at API startup
+        from app.services.job_vectors import index_jobs
+
+        vectors = [
+            (row["id"], row["title"], row["description"])
+            for row in new_jobs + changed_rows
+        ]
+        after_commit(db, lambda: index_jobs(vectors))
+
+    for seen, seen_ids in unchanged_by_seen.items():
+        for ids in _chunks(seen_ids, LOOKUP_CHUNK_SIZE):
+            # Set explicitly so the onupdate default does not stamp unchanged jobs
+            db.query(Job).filter(
+                Job.id.in_(ids),
+                or_(Job.last_seen_at.is_(None), Job.last_seen_at < seen),
+            ).update(
+                {Job.last_seen_at: seen, Job.updated_at: Job.updated_at},
+                synchronize_session=False,
+            )
+    for ids in _chunks(reactivated_ids, LOOKUP_CHUNK_SIZE):
+        db.query(Job).filter(Job.id.in_(ids)).update(
+            {Job.is_active: True, Job.updated_at: now, Job.change_seq: change_seq},
+            synchronize_session=False,
+        )
+
+    logger.info(
+        f"Persisted scrape: {len(new_jobs)} new, {len(changed_rows)} updated, "
+        f"{len(unchanged_ids)} unchanged"
+    )
+    return {
+        "saved": len(new_jobs),
+        "updated": len(changed_rows),
+        "unchanged": len(unchanged_ids),
+    }
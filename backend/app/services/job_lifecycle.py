@@ -0,0 +1,116 @@
+"""
+Job lifecycle management
+
+Deactivates postings that are past their deadline or have not been seen by the
+scraper for a while, then moves inactive rows into ``jobs_archive`` in batches
+so the hot ``jobs`` table only holds live postings.
+
+Deactivated jobs stay in ``jobs`` for ``JOB_ARCHIVE_GRACE_HOURS`` before they
+are archived, so consumers of ``/jobs/changes`` polling less often than that
+still see them go inactive.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import false, func, insert, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.models.job import Job, JobArchive
+from app.services.job_changes import next_change_seq
+from app.services.job_vectors import get_job_vector_store
+from app.services.relevance import record_archived
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+
+def _last_seen_column():
+    """Timestamp of the last time the scraper returned a job"""
+    return func.coalesce(Job.last_seen_at, Job.created_at)
+
+
+def expire_jobs(
+    db: Session, now: Optional[datetime] = None, max_age_days: Optional[int] = None
+) -> int:
+    """Mark jobs inactive when past their deadline or not seen for ``max_age_days``"""
+    now = now or datetime.utcnow()
+    if max_age_days is None:
+        max_age_days = config.JOB_EXPIRY_DAYS
+    cutoff = now - timedelta(days=max_age_days)
+
+    change_seq = next_change_seq(db)
+    expired = (
+        db.query(Job)
+        .filter(
+            Job.is_active == true(),
+            or_(Job.application_deadline < now, _last_seen_column() < cutoff),
+        )
+        .update(
+            {Job.is_active: False, Job.updated_at: now, Job.change_seq: change_seq},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+
+    logger.info(f"Expired {expired} jobs (cutoff {cutoff.isoformat()})")
+    return expired
+
+
+def archive_inactive_jobs(
+    db: Session,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+    grace_hours: Optional[float] = None,
+) -> int:
+    """
+    Move jobs inactive for over ``grace_hours`` into the archive table, one
+    committed batch at a time
+    """
+    batch_size = batch_size or config.JOB_ARCHIVE_BATCH_SIZE
+    now = now or datetime.utcnow()
+    if grace_hours is None:
+        grace_hours = config.JOB_ARCHIVE_GRACE_HOURS
+    # Deactivation stamps updated_at
+    cutoff = now - timedelta(hours=grace_hours)
+    columns = [column.name for column in Job.__table__.columns]
+    archived = 0
+
+    while True:
+        rows = (
+            db.query(Job.id, Job.title, Job.description)
+            .filter(
+                Job.is_active == false(),
+                func.coalesce(Job.updated_at, Job.created_at) < cutoff,
+            )
+            .order_by(Job.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+
+        db.execute(
+            insert(JobArchive.__table__).from_select(
+                columns, select(*Job.__table__.columns).where(Job.id.in_(ids))
+            )
+        )
+        db.query(Job).filter(Job.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        get_job_vector_store().remove(ids)
+        record_archived((row.title, row.description) for row in rows)
+
+        archived += len(ids)
+        logger.info(f"Archived batch of {len(ids)} jobs ({archived} so far)")
+
+    return archived
+
+
+def run_lifecycle(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Expire stale jobs and archive the ones inactive past the grace period"""
+    expired = expire_jobs(db, now=now)
+    archived = archive_inactive_jobs(db, now=now)
+    return {"expired": expired, "archived": archived}
@@ -0,0 +1,345 @@
+"""
+CV-to-job matching over precomputed job vectors
+
+Job text is turned into a fixed-width float32 vector at ingest (signed feature
+hashing of the tokens, log term frequency times IDF, L2 normalized) and stored
+in a memory-mapped matrix on disk. Matching a CV is one matrix-vector product
+over that matrix followed by a partial sort, so it runs CPU-only with no
+external service.
+
+Files under ``Config.MATCH_INDEX_DIR``:
+    vectors.f32  (capacity x dim) float32 rows
+    ids.i64      job id of each row, 0 for a free row
+    meta.json    dim, count and capacity
+"""
+
+import json
+import logging
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import true
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.relevance import ensure_corpus_stats
+from config import get_config
+from scraper.ranking import corpus_stats, job_tokens, tokenize
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None  # type: ignore[assignment]
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 1024
+REBUILD_BATCH_SIZE = 1000
+# remove() compacts the store once this many rows, and this share of them, are
+# blank
+COMPACT_MIN_DEAD_ROWS = 1024
+COMPACT_DEAD_RATIO = 0.25
+COMPACT_CHUNK_ROWS = 4096
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we "
+    "will with you your".split()
+)
+
+
+def _bucket(token: str, dim: int) -> Tuple[int, float]:
+    # crc32 rather than hash(): it has to be stable across processes and restarts
+    value = zlib.crc32(token.encode())
+    return value % dim, (1.0 if value & 0x80000000 else -1.0)
+
+
+def vectorize_tokens(tokens: Iterable[str], dim: int) -> np.ndarray:
+    """Hashed, IDF-weighted, L2-normalized float32 vector for one document"""
+    counts: Dict[str, int] = {}
+    for token in tokens:
+        if len(token) > 1 and token not in STOP_WORDS:
+            counts[token] = counts.get(token, 0) + 1
+
+    vector = np.zeros(dim, dtype=np.float32)
+    n_docs = corpus_stats.n_docs
+    for token, count in counts.items():
+        index, sign = _bucket(token, dim)
+        idf = (
+            np.log1p((n_docs + 1) / (corpus_stats.doc_freq.get(token, 0) + 1))
+            if n_docs
+            else 1.0
+        )
+        vector[index] += sign * (1.0 + np.log(count)) * idf
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def vectorize_jobs(
+    jobs: Sequence[Tuple[Optional[str], Optional[str]]], dim: int
+) -> np.ndarray:
+    """Vectors for (title, description) pairs"""
+    matrix = np.zeros((len(jobs), dim), dtype=np.float32)
+    for row, (title, description) in enumerate(jobs):
+        matrix[row] = vectorize_tokens(job_tokens(title, description), dim)
+    return matrix
+
+
+def cv_text(content) -> str:
+    """Flatten the JSON content of a CV into plain text"""
+    if isinstance(content, dict):
+        return " ".join(cv_text(value) for value in content.values())
+    if isinstance(content, (list, tuple)):
+        return " ".join(cv_text(value) for value in content)
+    return content if isinstance(content, str) else ""
+
+
+class JobVectorStore:
+    """Memory-mapped matrix of job vectors with an id per row"""
+
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._meta_mtime: Optional[int] = None
+        # Mapped by _open()
+        self._vectors: np.memmap
+        self._ids: np.memmap
+        # job id -> row, only built for writers
+        self._rows: Optional[Dict[int, int]] = None
+        self.count = 0
+        self.capacity = 0
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Dict:
+        with open(self._file("meta.json")) as handle:
+            return json.load(handle)
+
+    def _write_meta(self) -> None:
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as handle:
+            json.dump(
+                {"dim": self.dim, "count": self.count, "capacity": self.capacity},
+                handle,
+            )
+        os.replace(tmp, self._file("meta.json"))
+        self._meta_mtime = os.stat(self._file("meta.json")).st_mtime_ns
+
+    def _map(self) -> None:
+        self._vectors = np.memmap(
+            self._file("vectors.f32"),
+            dtype=np.float32,
+            mode="r+",
+            shape=(self.capacity, self.dim),
+        )
+        self._ids = np.memmap(
+            self._file("ids.i64"), dtype=np.int64, mode="r+", shape=(self.capacity,)
+        )
+        self._rows = None
+
+    def _row_index(self) -> Dict[int, int]:
+        if self._rows is None:
+            ids = np.asarray(self._ids[: self.count])
+            used = np.flatnonzero(ids)
+            self._rows = dict(zip(ids[used].tolist(), used.tolist()))
+        return self._rows
+
+    def _resize(self, capacity: int) -> None:
+        for name, itemsize in (("vectors.f32", 4 * self.dim), ("ids.i64", 8)):
+            with open(self._file(name), "ab") as handle:
+                handle.truncate(capacity * itemsize)
+        self.capacity = capacity
+        self._map()
+
+    def _open(self) -> None:
+        """Open or create the store, re-mapping if another process changed it"""
+        meta_file = self._file("meta.json")
+        if not os.path.exists(meta_file):
+            os.makedirs(self.path, exist_ok=True)
+            self.count = 0
+            self._resize(INITIAL_CAPACITY)
+            self._write_meta()
+        mtime = os.stat(meta_file).st_mtime_ns
+        if mtime == self._meta_mtime:
+            return
+
+        meta = self._read_meta()
+        if meta["dim"] != self.dim:
+            raise ValueError(
+                f"Vector store at {self.path} has dim {meta['dim']}, "
+                f"expected {self.dim}; "
+                "rebuild it with python -m scripts.rebuild_job_vectors"
+            )
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self._map()
+        self._meta_mtime = mtime
+
+    @contextmanager
+    def _write_locked(self, fresh: bool = False):
+        """
+        Serialize writers across processes where the platform allows it
+
+        ``fresh`` starts the store over empty.
+        """
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._file(".lock"), "w") as handle:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                if fresh:
+                    # Ignores the old meta, so a store of another dim can be replaced
+                    self.count = 0
+                    self._resize(INITIAL_CAPACITY)
+                    self._ids[:] = 0
+                else:
+                    self._open()
+                yield
+
+    def upsert(self, job_ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Insert or overwrite the vectors of jobs"""
+        if not len(job_ids):
+            return
+        with self._write_locked():
+            rows = self._row_index()
+            new_ids = [job_id for job_id in job_ids if job_id not in rows]
+            needed = self.count + len(new_ids)
+            if needed > self.capacity:
+                self._resize(max(needed, self.capacity * 2))
+                rows = self._row_index()
+
+            for job_id, vector in zip(job_ids, vectors):
+                row = rows.get(job_id)
+                if row is None:
+                    row = self.count
+                    self.count += 1
+                    rows[job_id] = row
+                    self._ids[row] = job_id
+                self._vectors[row] = vector
+
+            self._vectors.flush()
+            self._ids.flush()
+            self._write_meta()
+
+    def remove(self, job_ids: Iterable[int]) -> None:
+        """Blank out rows of jobs that left the hot table, compacting when many are"""
+        with self._write_locked():
+            rows = self._row_index()
+            removed = False
+            for job_id in job_ids:
+                row = rows.pop(job_id, None)
+                if row is not None:
+                    self._ids[row] = 0
+                    self._vectors[row] = 0
+                    removed = True
+            if not removed:
+                return
+            dead = self.count - len(rows)
+            if dead >= max(COMPACT_MIN_DEAD_ROWS, self.count * COMPACT_DEAD_RATIO):
+                self._compact()
+            self._vectors.flush()
+            self._ids.flush()
+            self._write_meta()
+
+    def _compact(self) -> None:
+        """Move the live rows to the front so blank rows are reused, not scanned"""
+        live = np.flatnonzero(np.asarray(self._ids[: self.count]))
+        # Each row moves down, so copying in order never overwrites a row still to
+        # be moved
+        for start in range(0, len(live), COMPACT_CHUNK_ROWS):
+            rows = live[start : start + COMPACT_CHUNK_ROWS]
+            self._vectors[start : start + len(rows)] = self._vectors[rows]
+            self._ids[start : start + len(rows)] = self._ids[rows]
+        self._vectors[len(live) : self.count] = 0
+        self._ids[len(live) : self.count] = 0
+        logger.info(f"Compacted job vectors from {self.count} to {len(live)} rows")
+        self.count = len(live)
+        self._rows = None
+
+    def clear(self) -> None:
+        """Drop every row; used before a full rebuild"""
+        with self._write_locked(fresh=True):
+            self._ids.flush()
+            self._rows = {}
+            self._write_meta()
+
+    def top_k(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """The ``k`` best (job id, cosine score) pairs for a query vector"""
+        with self._lock:
+            self._open()
+            count = self.count
+            if not count:
+                return []
+            scores = self._vectors[:count] @ query
+            ids = np.asarray(self._ids[:count])
+
+        k = min(k, count)
+        best = np.argpartition(scores, -k)[-k:]
+        best = best[np.argsort(-scores[best])]
+        return [
+            (int(ids[row]), float(scores[row]))
+            for row in best
+            if ids[row] and scores[row] > 0
+        ]
+
+
+_store: Optional[JobVectorStore] = None
+
+
+def get_job_vector_store() -> JobVectorStore:
+    """Process-wide vector store"""
+    global _store
+    if _store is None:
+        _store = JobVectorStore(config.MATCH_INDEX_DIR, config.MATCH_VECTOR_DIM)
+    return _store
+
+
+def index_jobs(jobs: Sequence[Tuple[int, Optional[str], Optional[str]]]) -> None:
+    """Vectorize (id, title, description) rows and store them"""
+    if not jobs:
+        return
+    store = get_job_vector_store()
+    vectors = vectorize_jobs(
+        [(title, description) for _, title, description in jobs], store.dim
+    )
+    store.upsert([job_id for job_id, _, _ in jobs], vectors)
+
+
+def match_text(text: str, k: int) -> List[Tuple[int, float]]:
+    """Top ``k`` (job id, score) pairs for free text such as a CV"""
+    store = get_job_vector_store()
+    return store.top_k(vectorize_tokens(tokenize(text), store.dim), k)
+
+
+def rebuild_job_vectors(db: Session) -> int:
+    """Re-vectorize every active job, e.g. after changing ``MATCH_VECTOR_DIM``"""
+    # Match vectors are IDF weighted
+    ensure_corpus_stats(db)
+    store = get_job_vector_store()
+    store.clear()
+    rows = (
+        db.query(Job.id, Job.title, Job.description)
+        .filter(Job.is_active == true())
+        .order_by(Job.id)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    batch: List[Tuple[int, Optional[str], Optional[str]]] = []
+    indexed = 0
+    for row in rows:
+        batch.append((row.id, row.title, row.description))
+        if len(batch) == REBUILD_BATCH_SIZE:
+            index_jobs(batch)
+            indexed += len(batch)
+            batch = []
+    index_jobs(batch)
+    indexed += len(batch)
+
+    logger.info(f"Rebuilt job vectors for {indexed} jobs")
+    return indexed
@@ -0,0 +1,94 @@
+"""
+Relevance ranking for stored jobs
+
+Wraps the scraper's BM25 scorer with the process-wide corpus statistics,
+loaded from the jobs table once and then kept current as jobs are committed
+into it (ingest), change their text (ingest, enrichment) and leave it
+(archiving). Inactive jobs waiting to be archived still count, so the
+statistics always describe the jobs table.
+
+The table is read off the ingest path: at worker startup in a background
+thread, or by the first ranking. Jobs committed while it is being read are
+counted if the read still sees them and not otherwise, a drift of a few
+documents out of the whole corpus.
+"""
+
+import logging
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.job import Job
+from scraper.ranking import BM25Scorer, corpus_stats, job_tokens
+
+logger = logging.getLogger(__name__)
+
+WARM_BATCH_SIZE = 1000
+
+Document = Tuple[Optional[str], Optional[str]]
+
+# Concurrent first rankings read the table once
+_warm_lock = threading.Lock()
+
+
+def ensure_corpus_stats(db: Session) -> None:
+    """Load document frequencies for the jobs table the first time they are needed"""
+    if corpus_stats.warmed:
+        return
+
+    with _warm_lock:
+        if corpus_stats.warmed:
+            return
+        rows = db.query(Job.title, Job.description).execution_options(
+            yield_per=WARM_BATCH_SIZE
+        )
+        corpus_stats.warm(job_tokens(title, description) for title, description in rows)
+    logger.info(f"Loaded relevance statistics for {corpus_stats.n_docs} jobs")
+
+
+def warm_corpus_stats_in_background() -> threading.Thread:
+    """Load the corpus statistics in a thread of their own, e.g. at worker startup"""
+
+    def run():
+        db = SessionLocal()
+        try:
+            ensure_corpus_stats(db)
+        except Exception:
+            logger.exception("Loading relevance statistics failed")
+        finally:
+            db.close()
+
+    thread = threading.Thread(target=run, name="corpus-stats-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def record_ingested(documents: Iterable[Document]) -> None:
+    """Fold the (title, description) of committed new jobs into the corpus statistics"""
+    corpus_stats.add(job_tokens(title, description) for title, description in documents)
+
+
+def record_replaced(old: Iterable[Document], new: Iterable[Document]) -> None:
+    """Swap the committed old (title, description) of changed jobs for the new"""
+    corpus_stats.remove(job_tokens(title, description) for title, description in old)
+    corpus_stats.add(job_tokens(title, description) for title, description in new)
+
+
+def record_archived(documents: Iterable[Document]) -> None:
+    """Take the (title, description) of jobs moved out of the jobs table back out"""
+    corpus_stats.remove(
+        job_tokens(title, description) for title, description in documents
+    )
+
+
+def rank_jobs(db: Session, query: str, jobs: List[Job]) -> List[Job]:
+    """Order jobs by BM25 relevance to ``query``, newest first on ties"""
+    ensure_corpus_stats(db)
+    documents = [
+        job_tokens(job.title, job.description) for job in jobs  # type: ignore[arg-type]
+    ]
+    scores = BM25Scorer().score(query, documents)
+    order = sorted(range(len(jobs)), key=lambda i: (-scores[i], -jobs[i].id))
+    return [jobs[i] for i in order]
@@ -0,0 +1,187 @@
+"""
+Salary normalization
+
+Turns the free-form salary strings produced by the scrapers ("R300,000 -
+R800,000", "$120,000 - $180,000", "R25 000 per month", "Competitive") into a
+numeric annual range in ZAR so salaries can be filtered and sorted in SQL.
+Amounts count only next to a currency or a salary word ("per month",
+"salary", "CTC"), so stray numbers such as "Posted 2026" are not salaries.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.job_changes import next_change_seq
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+_CURRENCIES = {
+    "r": "ZAR",
+    "zar": "ZAR",
+    "$": "USD",
+    "usd": "USD",
+    "€": "EUR",
+    "eur": "EUR",
+    "£": "GBP",
+    "gbp": "GBP",
+}
+
+_AMOUNT = re.compile(
+    r"(?<![a-z])(?P<currency>ZAR|USD|EUR|GBP|R|\$|€|£)?\s?"
+    r"(?P<number>\d{1,3}(?:[ ,]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"\s?(?:(?P<multiplier>k|m(?:il(?:lion)?)?)(?![a-z]))?(?!\d)",
+    re.IGNORECASE,
+)
+
+_PERIODS = (
+    ("hour", re.compile(r"per\s+hour|/\s*h(?:ou)?r|\bp/?h\b|hourly", re.IGNORECASE)),
+    ("day", re.compile(r"per\s+day|/\s*day|daily", re.IGNORECASE)),
+    ("week", re.compile(r"per\s+week|/\s*w(?:ee)?k|weekly", re.IGNORECASE)),
+    (
+        "month",
+        re.compile(r"per\s+month|/\s*m(?:on)?th|\bp/?m\b|monthly", re.IGNORECASE),
+    ),
+    (
+        "year",
+        re.compile(
+            r"per\s+(?:annum|year)|/\s*(?:year|yr)|\bp\.?/?a\.?(?=\W|$)|annual|yearly",
+            re.IGNORECASE,
+        ),
+    ),
+)
+
+# Words that make a bare amount a salary; a quoted period counts too
+_SALARY_WORDS = re.compile(
+    r"\b(?:salary|salaries|remuneration|package|ctc|cost to company|wage|pay)\b",
+    re.IGNORECASE,
+)
+
+PERIODS_PER_YEAR = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+# South African boards usually quote monthly figures without saying so
+MONTHLY_THRESHOLD_ZAR = 100_000
+
+
+@dataclass
+class SalaryRange:
+    """Annual salary range in ZAR plus the currency and period it was quoted in"""
+
+    min: int
+    max: int
+    currency: str
+    period: str
+
+
+def parse_salary(text: Optional[str]) -> Optional[SalaryRange]:
+    """Parse a salary string; returns None when it carries no salary amount"""
+    if not text:
+        return None
+
+    currency = None
+    amounts = []
+    for match in _AMOUNT.finditer(text):
+        number = float(re.sub(r"[ ,]", "", match.group("number")))
+        multiplier = (match.group("multiplier") or "").lower()
+        if multiplier == "k":
+            number *= 1_000
+        elif multiplier.startswith("m"):
+            number *= 1_000_000
+        if match.group("currency"):
+            currency = currency or _CURRENCIES[match.group("currency").lower()]
+        elif currency is None and not multiplier and number < 1_000:
+            # Bare small numbers ("5 years experience") are not salaries
+            continue
+        amounts.append(number)
+
+    if not amounts:
+        return None
+
+    period = next((name for name, pattern in _PERIODS if pattern.search(text)), None)
+    if currency is None and period is None and not _SALARY_WORDS.search(text):
+        return None
+    currency = currency or "ZAR"
+    if period is None:
+        period = (
+            "month"
+            if currency == "ZAR" and max(amounts) < MONTHLY_THRESHOLD_ZAR
+            else "year"
+        )
+
+    factor = PERIODS_PER_YEAR[period] * config.SALARY_EXCHANGE_RATES.get(currency, 1.0)
+    low, high = min(amounts[0], amounts[-1]), max(amounts[0], amounts[-1])
+    return SalaryRange(
+        min=int(round(low * factor)),
+        max=int(round(high * factor)),
+        currency=currency,
+        period=period,
+    )
+
+
+def salary_columns(text: Optional[str]) -> dict:
+    """Structured salary column values for a job"""
+    parsed = parse_salary(text)
+    if parsed is None:
+        return {
+            "salary_min": None,
+            "salary_max": None,
+            "salary_currency": None,
+            "salary_period": None,
+        }
+    return {
+        "salary_min": parsed.min,
+        "salary_max": parsed.max,
+        "salary_currency": parsed.currency,
+        "salary_period": parsed.period,
+    }
+
+
+SALARY_COLUMNS = ("salary_min", "salary_max", "salary_currency", "salary_period")
+
+
+def backfill_salaries(db: Session, batch_size: int = 1000) -> int:
+    """
+    Re-parse the salary text of every job into the structured columns
+
+    Fills jobs stored before parsing existed and clears amounts the current
+    parser rejects. Each batch is one executemany UPDATE and commit; changed
+    jobs get a change number, so /jobs/changes and the facet index see them.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(
+                Job.id, Job.salary, *(getattr(Job, column) for column in SALARY_COLUMNS)
+            )
+            .filter(Job.id > last_id, Job.salary.isnot(None))
+            .order_by(Job.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        changes = []
+        for row in rows:
+            values = salary_columns(row.salary)
+            if any(values[column] != getattr(row, column) for column in SALARY_COLUMNS):
+                changes.append({"id": row.id, **values})
+        if changes:
+            change_seq = next_change_seq(db)
+            db.execute(
+                update(Job),
+                [{**change, "change_seq": change_seq} for change in changes],
+            )
+            updated += len(changes)
+        db.commit()
+        last_id = rows[-1].id
+
+    logger.info(f"Backfilled structured salaries for {updated} jobs")
+    return updated
@@ -0,0 +1,257 @@
+"""
+Saved search alerts
+
+Every saved search carries a watermark, the highest job change number
+(``app.services.job_changes``) it has already been evaluated against. Change
+numbers become visible in commit order, so a job committed late is still
+above the watermark when it shows up. The ``alerts.evaluate_saved_searches``
+task reads the active jobs changed above the lowest watermark once, after
+they are committed, and matches them against all saved searches together
+through an inverted index from search terms to searches, so the cost grows
+with the changed jobs rather than with the number of searches times the
+table size. Matches land in the ``search_alerts`` outbox, at most once per
+search and job, which ``send_digests`` mails out as one digest per user.
+
+Search terms match whole words of the job title, description or company;
+the company, location, source and salary filters behave like the
+``GET /api/jobs`` filters.
+"""
+
+import logging
+import smtplib
+from collections import Counter, defaultdict
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job
+from app.models.saved_search import SavedSearch, SearchAlert
+from app.models.user import User
+from app.services.job_dimensions import normalize_source
+from config import get_config
+from scraper.ranking import tokenize
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+EVALUATION_BATCH_SIZE = 1000
+
+
+def search_terms(text: Optional[str]) -> List[str]:
+    """Distinct word terms of a saved search"""
+    return list(dict.fromkeys(tokenize(text)))
+
+
+def _contains(value: Optional[str], pattern: str) -> bool:
+    if not value:
+        return False
+    return pattern.casefold() in value.casefold()
+
+
+def matches_filters(search, job: Job) -> bool:
+    """Check the non-text filters of a ``SavedSearch`` against a job"""
+    if search.company and not _contains(job.company, search.company):
+        return False
+    if search.location and not (
+        _contains(job.location, search.location)
+        or _contains(job.province, search.location)
+    ):
+        return False
+    if (
+        search.source
+        and (job.source or "").casefold() != normalize_source(search.source)[1]
+    ):
+        return False
+    if search.min_salary is not None and (
+        job.salary_max is None or job.salary_max < search.min_salary
+    ):
+        return False
+    if search.max_salary is not None and (
+        job.salary_min is None or job.salary_min > search.max_salary
+    ):
+        return False
+    return True
+
+
+class SearchMatcher:
+    """Inverted index from search terms to the saved searches using them"""
+
+    def __init__(self, searches: Sequence[SavedSearch]):
+        # Plain values to the type checker, not the Column attributes of the model
+        self.searches: List[Any] = list(searches)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._required: List[int] = []
+        self._unconditional: List[int] = []
+        for position, search in enumerate(self.searches):
+            terms = search_terms(search.search)
+            self._required.append(len(terms))
+            if not terms:
+                self._unconditional.append(position)
+            for term in terms:
+                self._postings[term].append(position)
+
+    def match(self, job) -> List[SavedSearch]:
+        """Saved searches whose terms and filters all match a job"""
+        hits: Counter = Counter()
+        for token in set(
+            tokenize(job.title) + tokenize(job.description) + tokenize(job.company)
+        ):
+            for position in self._postings.get(token, ()):
+                hits[position] += 1
+
+        candidates = [
+            position
+            for position, count in hits.items()
+            if count == self._required[position]
+        ]
+        return [
+            self.searches[position]
+            for position in candidates + self._unconditional
+            if matches_filters(self.searches[position], job)
+        ]
+
+
+def current_watermark(db: Session) -> int:
+    """Highest committed job change number; new saved searches start from here"""
+    return db.query(func.max(Job.change_seq)).scalar() or 0
+
+
+def _queue_alerts(db: Session, rows: List[Dict]) -> int:
+    """Insert alerts, skipping any already queued for the same search and job"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = (
+        dialect.insert(SearchAlert.__table__)
+        .on_conflict_do_nothing(index_elements=["saved_search_id", "job_id"])
+        .returning(SearchAlert.__table__.c.id)
+    )
+    return len(db.execute(statement, rows).all())
+
+
+def evaluate_saved_searches(db: Session) -> int:
+    """Queue alerts for active jobs changed since the watermarks, and commit"""
+    searches = db.query(SavedSearch).filter(SavedSearch.is_active.is_(True)).all()
+    if not searches:
+        return 0
+
+    matcher = SearchMatcher(searches)
+    start = min(search.last_change_seq for search in matcher.searches)
+    high = start
+    last = None
+    queued = 0
+
+    while True:
+        query = db.query(Job).filter(Job.is_active.is_(True), Job.change_seq > start)
+        if last is not None:
+            query = query.filter(
+                or_(
+                    Job.change_seq > last.change_seq,
+                    and_(Job.change_seq == last.change_seq, Job.id > last.id),
+                )
+            )
+        jobs = query.order_by(Job.change_seq, Job.id).limit(EVALUATION_BATCH_SIZE).all()
+        if not jobs:
+            break
+        rows = [
+            {
+                "saved_search_id": search.id,
+                "user_id": search.user_id,
+                "job_id": job.id,
+                "job_title": job.title,
+                "job_link": job.link,
+            }
+            for job in jobs
+            for search in matcher.match(job)
+            if job.change_seq > search.last_change_seq
+        ]
+        if rows:
+            # A job alerts a search once, whatever changes or evaluations follow
+            queued += _queue_alerts(db, rows)
+        last = jobs[-1]
+        high = last.change_seq
+
+    if high > start:
+        db.query(SavedSearch).filter(
+            SavedSearch.is_active.is_(True), SavedSearch.last_change_seq < high
+        ).update({SavedSearch.last_change_seq: high}, synchronize_session=False)
+    db.commit()
+
+    logger.info(
+        f"Evaluated {len(searches)} saved searches up to change {high}: "
+        f"{queued} new alerts"
+    )
+    return queued
+
+
+def _compose_digest(email: str, alerts: List) -> EmailMessage:
+    by_search: Dict[str, List[SearchAlert]] = defaultdict(list)
+    for alert, search_name in alerts:
+        by_search[search_name].append(alert)
+
+    lines = []
+    for search_name, items in by_search.items():
+        lines.append(f"{search_name} ({len(items)} new)")
+        lines.extend(f"  - {alert.job_title}: {alert.job_link}" for alert in items)
+        lines.append("")
+
+    message = EmailMessage()
+    message["Subject"] = f"{len(alerts)} new jobs for your saved searches"
+    message["From"] = settings.EMAILS_FROM
+    message["To"] = email
+    message.set_content("\n".join(lines))
+    return message
+
+
+def smtp_transport(message: EmailMessage) -> None:
+    """Deliver a message through the configured SMTP server"""
+    with smtplib.SMTP(settings.SMTP_HOST or "localhost", settings.SMTP_PORT) as smtp:
+        if settings.SMTP_USER:
+            smtp.starttls()
+            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
+        smtp.send_message(message)
+
+
+def send_digests(
+    db: Session, transport: Optional[Callable[[EmailMessage], None]] = None
+) -> int:
+    """Mail one digest per user with the pending alerts; returns the digests sent"""
+    if transport is None:
+        if not settings.SMTP_HOST:
+            logger.warning(
+                "SMTP_HOST is not set, leaving saved search alerts in the outbox"
+            )
+            return 0
+        transport = smtp_transport
+
+    pending = (
+        db.query(SearchAlert, SavedSearch.name, User.email)
+        .join(SavedSearch, SearchAlert.saved_search_id == SavedSearch.id)
+        .join(User, SearchAlert.user_id == User.id)
+        .filter(SearchAlert.sent_at.is_(None))
+        .order_by(SearchAlert.user_id, SearchAlert.id)
+        .limit(config.ALERT_DIGEST_MAX_ALERTS)
+        .all()
+    )
+    by_user: Dict[str, List] = defaultdict(list)
+    for alert, search_name, email in pending:
+        by_user[email].append((alert, search_name))
+
+    sent = 0
+    for email, alerts in by_user.items():
+        try:
+            transport(_compose_digest(email, alerts))
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"Failed to send saved search digest to {email}: {e}")
+            continue
+        now = datetime.utcnow()
+        for alert, _ in alerts:
+            alert.sent_at = now
+        db.commit()
+        sent += 1
+
+    logger.info(f"Sent {sent} saved search digests")
+    return sent
@@ -0,0 +1,355 @@
+"""
+Checkpointed multi-site scrape runs
+
+A run records every result page whose jobs have been persisted in
+``scrape_run_pages``; jobs are committed page by page instead of once at the
+end.
+
+The worker running an attempt holds the run's lease: its ``owner`` id and a
+``heartbeat_at`` renewed with every completed page and at least every third
+of ``SCRAPE_RUN_LEASE_MINUTES``. An attempt that ends closes the run as
+``completed`` when every site finished, or as ``partial`` when a site failed
+or returned no jobs. A run still ``running`` with an expired lease belongs to
+a worker that crashed or was redeployed; the next run for the same query,
+location and size takes it over and resumes it: finished sites are skipped
+and the others continue after their last completed page, so the boards are
+not scraped again from page 1. Runs with a live lease are never shared, so
+two identical scrapes at once each get their own run.
+
+The run's database work (claiming, page persistence, lease renewal, closing)
+runs in the threadpool, one call at a time per run, so a scrape awaited in an
+API request does not hold up the event loop between fetches.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.models.scrape_run import ScrapeRun, ScrapeRunPage
+from app.services.job_ingest import persist_jobs
+from config import get_config
+from scraper.scheduler import BACKGROUND
+from scraper.tracing import span
+from scraper.unified_scraper import JobResult, UnifiedJobScraper
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RunLeaseLost(Exception):
+    """Another worker took over the run after this one stopped heartbeating"""
+
+
+def run_key(query: str, location: str, max_jobs_per_site: int) -> str:
+    """Runs with the same key resume each other"""
+    return "|".join(
+        [
+            " ".join(query.lower().split()),
+            " ".join(location.lower().split()),
+            str(max_jobs_per_site),
+        ]
+    )
+
+
+def new_owner() -> str:
+    """Lease owner id of one scrape attempt"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _lease_expired(now: datetime):
+    cutoff = now - timedelta(minutes=config.SCRAPE_RUN_LEASE_MINUTES)
+    return or_(ScrapeRun.heartbeat_at.is_(None), ScrapeRun.heartbeat_at < cutoff)
+
+
+class RunLedger:
+    """Checkpoint handed to the scraper: where sites resume, and page persistence"""
+
+    def __init__(self, db: Session, run_id: int, owner: str):
+        self.db = db
+        self.run_id = run_id
+        self.owner = owner
+        self._progress: Dict[str, Tuple[int, int]] = {}
+        self._finished: Set[str] = set()
+        # Counts of this attempt; the run row accumulates them across attempts
+        self.counts = {"saved": 0, "updated": 0, "unchanged": 0}
+        # Sites scrape concurrently but share the session, so its calls queue up
+        self._db_lock = asyncio.Lock()
+        pages = db.query(
+            ScrapeRunPage.site,
+            ScrapeRunPage.page,
+            ScrapeRunPage.jobs_found,
+            ScrapeRunPage.is_last,
+        ).filter(ScrapeRunPage.run_id == run_id)
+        for site, page, jobs_found, last in pages:
+            self._record(site, page, jobs_found, last)
+
+    def _record(self, site: str, page: int, jobs_found: int, last: bool) -> None:
+        next_page, found = self._progress.get(site, (0, 0))
+        self._progress[site] = (max(next_page, page + 1), found + jobs_found)
+        if last:
+            self._finished.add(site)
+
+    def resume_point(self, site: str) -> Optional[Tuple[int, int]]:
+        """Next page and jobs found so far for a site, None once the site is finished"""
+        if site in self._finished:
+            return None
+        return self._progress.get(site, (0, 0))
+
+    def jobs_found(self, site: str) -> int:
+        """Jobs the run has persisted for a site across its attempts"""
+        return self._progress.get(site, (0, 0))[1]
+
+    def _renew(self, values: Optional[Dict[Any, Any]] = None) -> None:
+        """Renew the lease in the current transaction; raises RunLeaseLost"""
+        values = {**(values or {}), ScrapeRun.heartbeat_at: datetime.utcnow()}
+        renewed = (
+            self.db.query(ScrapeRun)
+            .filter(ScrapeRun.id == self.run_id, ScrapeRun.owner == self.owner)
+            .update(values, synchronize_session=False)
+        )
+        if not renewed:
+            raise RunLeaseLost(f"Scrape run {self.run_id} was taken over")
+
+    def heartbeat(self) -> None:
+        try:
+            self._renew()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    async def run_db(self, fn: Callable[..., T], *args) -> T:
+        """Run synchronous work on the run's session in the threadpool"""
+        async with self._db_lock:
+            return await run_in_threadpool(fn, *args)
+
+    def _persist_page(
+        self, site: str, page: int, jobs: List[JobResult], last: bool
+    ) -> Dict[str, int]:
+        try:
+            counts = persist_jobs(self.db, jobs) if jobs else {}
+            # Fails the page if another worker has taken the run over
+            self._renew(
+                {
+                    ScrapeRun.jobs_saved: ScrapeRun.jobs_saved + counts.get("saved", 0),
+                    ScrapeRun.jobs_updated: ScrapeRun.jobs_updated
+                    + counts.get("updated", 0),
+                }
+            )
+            self.db.add(
+                ScrapeRunPage(
+                    run_id=self.run_id,
+                    site=site,
+                    page=page,
+                    jobs_found=len(jobs),
+                    is_last=last,
+                )
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return counts
+
+    async def page_done(
+        self, site: str, page: int, jobs: List[JobResult], last: bool
+    ) -> None:
+        """Persist a page's jobs and mark the page completed in one transaction"""
+        attributes = {
+            "scraper.site": site,
+            "scraper.page": page,
+            "scraper.jobs": len(jobs),
+        }
+        with span("scrape_run.persist_page", **attributes):
+            counts = await self.run_db(self._persist_page, site, page, jobs, last)
+        for name, count in counts.items():
+            self.counts[name] += count
+        self._record(site, page, len(jobs), last)
+
+
+def _claim_expired_run(
+    db: Session, key: str, owner: str, now: datetime
+) -> Optional[int]:
+    """
+    Take over the latest running run of a key whose lease expired
+
+    Older expired runs, and those started before SCRAPE_RUN_RESUME_HOURS, are
+    abandoned. The claim is a conditional update, so of two workers racing
+    for the same run only one gets it.
+    """
+    resume_cutoff = now - timedelta(hours=config.SCRAPE_RUN_RESUME_HOURS)
+    expired = (
+        db.query(ScrapeRun.id, ScrapeRun.started_at)
+        .filter(
+            ScrapeRun.run_key == key,
+            ScrapeRun.status == "running",
+            _lease_expired(now),
+        )
+        .order_by(ScrapeRun.id.desc())
+        .all()
+    )
+
+    claimed = None
+    for run_id, started_at in expired:
+        candidate = db.query(ScrapeRun).filter(
+            ScrapeRun.id == run_id, ScrapeRun.status == "running", _lease_expired(now)
+        )
+        recent = (
+            started_at is not None and started_at.replace(tzinfo=None) >= resume_cutoff
+        )
+        if claimed is None and recent:
+            if candidate.update(
+                {ScrapeRun.owner: owner, ScrapeRun.heartbeat_at: now},
+                synchronize_session=False,
+            ):
+                claimed = run_id
+                continue
+        candidate.update(
+            {
+                ScrapeRun.status: "abandoned",
+                ScrapeRun.owner: None,
+                ScrapeRun.finished_at: now,
+            },
+            synchronize_session=False,
+        )
+    return claimed
+
+
+def _open_run(
+    db: Session,
+    key: str,
+    owner: str,
+    query: str,
+    location: str,
+    max_jobs_per_site: int,
+) -> Tuple[int, bool]:
+    """Claim an expired run of the key or start a new one; returns (id, resumed)"""
+    now = datetime.utcnow()
+    run_id = _claim_expired_run(db, key, owner, now)
+    resumed = run_id is not None
+    if run_id is None:
+        run_id = db.execute(
+            insert(ScrapeRun)
+            .values(
+                run_key=key,
+                query=query,
+                location=location,
+                max_jobs_per_site=max_jobs_per_site,
+                status="running",
+                jobs_saved=0,
+                jobs_updated=0,
+                owner=owner,
+                heartbeat_at=now,
+                started_at=now,
+            )
+            .returning(ScrapeRun.id)
+        ).scalar_one()
+    db.commit()
+    return run_id, resumed
+
+
+def _close_run(db: Session, run_id: int, owner: str, status: str) -> bool:
+    """Close the run unless another worker took it over"""
+    closed = (
+        db.query(ScrapeRun)
+        .filter(ScrapeRun.id == run_id, ScrapeRun.owner == owner)
+        .update(
+            {
+                ScrapeRun.status: status,
+                ScrapeRun.owner: None,
+                ScrapeRun.finished_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return bool(closed)
+
+
+async def _keep_alive(ledger: RunLedger) -> None:
+    """Renew the lease while pages take long, e.g. behind a slow board's rate limit"""
+    while True:
+        await asyncio.sleep(max(config.SCRAPE_RUN_LEASE_MINUTES * 60 / 3, 1))
+        try:
+            await ledger.run_db(ledger.heartbeat)
+        except RunLeaseLost as e:
+            logger.warning(str(e))
+            return
+
+
+async def run_checkpointed_scrape(
+    db: Session,
+    query: str,
+    location: str = "South Africa",
+    max_jobs_per_site: int = 10,
+    keywords: Optional[List[str]] = None,
+    priority: int = BACKGROUND,
+    scraper: Optional[UnifiedJobScraper] = None,
+) -> Dict:
+    """
+    Scrape every enabled site, resuming a crashed run of the same search
+
+    ``jobs`` in the result are the ranked JobResults of this attempt.
+    """
+    key = run_key(query, location, max_jobs_per_site)
+    owner = new_owner()
+    run_id, resumed = await run_in_threadpool(
+        _open_run, db, key, owner, query, location, max_jobs_per_site
+    )
+    ledger = await run_in_threadpool(RunLedger, db, run_id, owner)
+    if resumed:
+        logger.info(f"Resuming scrape run {run_id} for '{query}' in '{location}'")
+
+    keep_alive = asyncio.ensure_future(_keep_alive(ledger))
+    try:
+        if scraper is not None:
+            scraper.checkpoint = ledger
+            sites = scraper.sites_due()
+            jobs = await scraper.scrape_all_sites(
+                query, location, max_jobs_per_site, keywords, as_dicts=False
+            )
+        else:
+            async with UnifiedJobScraper(
+                priority=priority, checkpoint=ledger
+            ) as scraper:
+                sites = scraper.sites_due()
+                jobs = await scraper.scrape_all_sites(
+                    query, location, max_jobs_per_site, keywords, as_dicts=False
+                )
+    finally:
+        keep_alive.cancel()
+
+    # Sites that failed or found nothing are left for a fresh run, not resumed
+    incomplete = [
+        site
+        for site in sites
+        if ledger.resume_point(site) is not None or not ledger.jobs_found(site)
+    ]
+    status = "partial" if incomplete else "completed"
+    if incomplete:
+        logger.warning(
+            f"Scrape run {run_id} closed as partial: {', '.join(incomplete)}"
+        )
+    if not await ledger.run_db(_close_run, db, run_id, owner, status):
+        # Another worker took the run over and will close it
+        status = "running"
+
+    return {
+        "run_id": run_id,
+        "status": status,
+        "resumed": resumed,
+        "jobs": jobs,
+        "saved_count": ledger.counts["saved"],
+        "updated_count": ledger.counts["updated"],
+        "unchanged_count": ledger.counts["unchanged"],
+    }
@@ -0,0 +1,79 @@
+"""
+Background tasks executed by the Celery worker
+"""
+
+from app.celery import celery
+from app.core.database import SessionLocal
+from app.services import job_enrichment, job_lifecycle, saved_searches, scrape_runs
+from config import get_config
+from scraper.scheduler import run_scrape
+
+config = get_config()
+
+
+@celery.task(name="jobs.run_lifecycle")
+def run_job_lifecycle():
+    """Expire stale jobs and move inactive ones into the archive"""
+    db = SessionLocal()
+    try:
+        return job_lifecycle.run_lifecycle(db)
+    finally:
+        db.close()
+
+
+@celery.task(name="alerts.evaluate_saved_searches")
+def evaluate_saved_searches():
+    """Queue alerts for the jobs committed since the last evaluation"""
+    db = SessionLocal()
+    try:
+        return saved_searches.evaluate_saved_searches(db)
+    finally:
+        db.close()
+
+
+@celery.task(name="alerts.send_digests")
+def send_alert_digests():
+    """Mail the pending saved search alerts"""
+    db = SessionLocal()
+    try:
+        return saved_searches.send_digests(db)
+    finally:
+        db.close()
+
+
+@celery.task(name="jobs.enrich_details")
+def enrich_job_details(max_jobs=None):
+    """Fetch detail pages for jobs that have not been enriched yet"""
+    if not config.ENRICHMENT_ENABLED:
+        return {"enriched": 0, "failed": 0}
+    db = SessionLocal()
+    try:
+        return run_scrape(job_enrichment.enrich_pending_jobs(db, max_jobs=max_jobs))
+    finally:
+        db.close()
+
+
+@celery.task(name="jobs.scheduled_scrape")
+def run_scheduled_scrapes():
+    """Scrape the default searches; a crashed run is resumed by the next one"""
+    if not config.SCHEDULER_ENABLED:
+        return []
+    db = SessionLocal()
+    try:
+        results = []
+        for search in config.DEFAULT_SCRAPING_CONFIGS:
+            result = run_scrape(
+                scrape_runs.run_checkpointed_scrape(
+                    db,
+                    query=search["query"],
+                    location=search["location"],
+                    max_jobs_per_site=max(1, search["max_jobs"] // 4),
+                    keywords=search.get("keywords"),
+                )
+            )
+            results.append(
+                {key: value for key, value in result.items() if key != "jobs"}
+            )
+        return results
+    finally:
+        db.close()
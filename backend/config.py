@@ -10,6 +10,7 @@ class Config:
     
     # Database settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dive_jobs.db")
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "False").lower() == "true"  # create_all on API startup
     
     # API settings
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
@@ -28,12 +29,25 @@ class Config:
     SCRAPING_ENABLED = os.getenv("SCRAPING_ENABLED", "True").lower() == "true"
     DEFAULT_SCRAPE_LIMIT = int(os.getenv("DEFAULT_SCRAPE_LIMIT", "20"))
     MAX_SCRAPE_LIMIT = int(os.getenv("MAX_SCRAPE_LIMIT", "100"))
+    SCRAPER_FIXTURE_MODE = os.getenv("SCRAPER_FIXTURE_MODE", "False").lower() == "true"  # Sample data instead of live boards, for demos and tests
     
     # Rate limiting for scraping
     SCRAPE_DELAY_MIN = float(os.getenv("SCRAPE_DELAY_MIN", "1.0"))
     SCRAPE_DELAY_MAX = float(os.getenv("SCRAPE_DELAY_MAX", "3.0"))
+    SCRAPE_MAX_IN_FLIGHT = int(os.getenv("SCRAPE_MAX_IN_FLIGHT", "20"))  # Page fetches in flight across all scrapes in a process
+    SCRAPE_CONNECTIONS_PER_HOST = int(os.getenv("SCRAPE_CONNECTIONS_PER_HOST", "4"))
     
-    # Job sites configuration
+    # Extraction health: sites whose selectors stop finding jobs are fetched less often
+    SCRAPER_HEALTH_EMPTY_PAGES = int(os.getenv("SCRAPER_HEALTH_EMPTY_PAGES", "3"))  # Empty first pages in a row
+    SCRAPER_HEALTH_COLLAPSE_RATIO = float(os.getenv("SCRAPER_HEALTH_COLLAPSE_RATIO", "0.2"))  # Of the baseline jobs per KB
+    SCRAPER_DEMOTION_HOURS = float(os.getenv("SCRAPER_DEMOTION_HOURS", "1"))  # Doubles per consecutive demotion
+    SCRAPER_DEMOTION_MAX_HOURS = float(os.getenv("SCRAPER_DEMOTION_MAX_HOURS", "24"))
+    
+    # Job sites configuration: boards, selectors and throttling live in this file and are
+    # reloaded on change; only the sites listed below can be enabled
+    SCRAPER_SITES_FILE = os.getenv(
+        "SCRAPER_SITES_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper", "sites.json")
+    )
     ENABLED_JOB_SITES = [
         "indeed_za",
         "careers24", 
@@ -98,17 +112,85 @@ class Config:
         }
     ]
     
+    # Detail page enrichment
+    ENRICHMENT_ENABLED = os.getenv("ENRICHMENT_ENABLED", "False").lower() == "true"
+    ENRICHMENT_CONCURRENCY = int(os.getenv("ENRICHMENT_CONCURRENCY", "4"))  # Detail pages in flight across all sites
+    ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "50"))  # Jobs committed per batch
+    ENRICHMENT_INTERVAL_MINUTES = int(os.getenv("ENRICHMENT_INTERVAL_MINUTES", "30"))
+    ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))  # Failed fetches before a job is left alone
+    ENRICHMENT_RETRY_HOURS = int(os.getenv("ENRICHMENT_RETRY_HOURS", "24"))  # Wait before refetching a failed page
+    
     # Scheduler settings
     SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "False").lower() == "true"
     SCRAPE_INTERVAL_HOURS = int(os.getenv("SCRAPE_INTERVAL_HOURS", "6"))
     DAILY_SCRAPE_TIME = os.getenv("DAILY_SCRAPE_TIME", "02:00")
+    SCRAPE_RUN_RESUME_HOURS = int(os.getenv("SCRAPE_RUN_RESUME_HOURS", "12"))  # Unfinished runs older than this start over
+    SCRAPE_RUN_LEASE_MINUTES = float(os.getenv("SCRAPE_RUN_LEASE_MINUTES", "10"))  # Running runs without a heartbeat this long are resumed
+    
+    # Job lifecycle settings
+    JOB_EXPIRY_DAYS = int(os.getenv("JOB_EXPIRY_DAYS", "30"))  # Days since last seen by the scraper
+    JOB_ARCHIVE_BATCH_SIZE = int(os.getenv("JOB_ARCHIVE_BATCH_SIZE", "1000"))
+    JOB_ARCHIVE_GRACE_HOURS = float(os.getenv("JOB_ARCHIVE_GRACE_HOURS", "72"))  # Keep deactivated jobs visible to /jobs/changes pollers
+    JOB_LIFECYCLE_INTERVAL_HOURS = int(os.getenv("JOB_LIFECYCLE_INTERVAL_HOURS", "6"))
     
     # Logging settings
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE = os.getenv("LOG_FILE", "dive_scraper.log")
     
+    # Rate limiting and admission control (see app/core/rate_limit.py)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "redis")  # redis (shared by all API processes) or memory
+    RATE_LIMIT_REDIS_TIMEOUT = float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT", "0.2"))  # Seconds before falling back to memory
+    RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "120"))  # Tokens refilled per client
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "60"))  # Bucket size; a list call costs 1, a 100 job scrape 25
+    RATE_LIMIT_HEAVY_COST = int(os.getenv("RATE_LIMIT_HEAVY_COST", "10"))  # Requests costing this much use the heavy slots
+    # Proxies whose X-Forwarded-For names the client (IPs or CIDRs); the default covers nginx on Docker networks
+    RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,::1,172.16.0.0/12")
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))  # Per API process
+    MAX_CONCURRENT_HEAVY_REQUESTS = int(os.getenv("MAX_CONCURRENT_HEAVY_REQUESTS", "4"))  # Of those, heavy ones
+    ADMISSION_QUEUE_SECONDS = float(os.getenv("ADMISSION_QUEUE_SECONDS", "10"))  # Wait for a slot before answering 503
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "200"))  # Waiting requests beyond this get 503 at once
+    
+    # Profiling settings (see app/core/profiling.py)
+    PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "2000"))  # Requests logged as slow; 0 disables
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.0"))  # Share of requests profiled in case they turn out slow
+    PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))  # Profiles and slow queries kept per process
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))  # Statements logged with their plan; 0 disables
+    SLOW_QUERY_EXPLAIN_MINUTES = int(os.getenv("SLOW_QUERY_EXPLAIN_MINUTES", "10"))  # Re-explain a statement at most this often
+    
+    # Tracing settings (pip install -r requirements-tracing.txt)
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")  # otlp, file or console; empty disables tracing
+    TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")  # Written by the file exporter
+    TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))  # Share of new traces recorded
+    
+    # Search settings
+    FACET_INDEX_REBUILD_MINUTES = int(os.getenv("FACET_INDEX_REBUILD_MINUTES", "60"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))  # Rows fetched and encoded at a time by /jobs/export
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))  # Records deduplicated and written at a time by bulk imports
+    RELEVANCE_CANDIDATE_LIMIT = int(os.getenv("RELEVANCE_CANDIDATE_LIMIT", "2000"))  # Jobs scored per sort=relevance query
+    COALESCE_READS = os.getenv("COALESCE_READS", "True").lower() == "true"  # Identical concurrent /jobs and /stats reads share one execution
+    
+    # CV-to-job matching
+    MATCH_INDEX_DIR = os.getenv("MATCH_INDEX_DIR", "./data/job_vectors")
+    MATCH_VECTOR_DIM = int(os.getenv("MATCH_VECTOR_DIM", "128"))
+    
+    # Saved search alerts
+    ALERT_EVALUATION_INTERVAL_MINUTES = int(os.getenv("ALERT_EVALUATION_INTERVAL_MINUTES", "5"))  # Matching of newly committed jobs
+    ALERT_DIGEST_INTERVAL_MINUTES = int(os.getenv("ALERT_DIGEST_INTERVAL_MINUTES", "60"))
+    ALERT_DIGEST_MAX_ALERTS = int(os.getenv("ALERT_DIGEST_MAX_ALERTS", "5000"))  # Outbox rows mailed per run
+    
+    # Salary normalization: rates used to convert scraped salaries to ZAR
+    SALARY_EXCHANGE_RATES = {
+        "ZAR": 1.0,
+        "USD": float(os.getenv("USD_TO_ZAR", "18.5")),
+        "EUR": float(os.getenv("EUR_TO_ZAR", "20.0")),
+        "GBP": float(os.getenv("GBP_TO_ZAR", "23.5")),
+    }
+    
     # Cache settings
-    CACHE_DURATION_HOURS = int(os.getenv("CACHE_DURATION_HOURS", "6"))
+    CACHE_DURATION_HOURS = int(os.getenv("CACHE_DURATION_HOURS", "6"))  # Scraped result pages are fresh this long; 0 disables the cache
+    CACHE_STALE_HOURS = int(os.getenv("CACHE_STALE_HOURS", "24"))  # Then served while a background refresh runs
+    CACHE_MAX_PAGES = int(os.getenv("CACHE_MAX_PAGES", "2000"))
     
     # User agent rotation
     USER_AGENTS = [
@@ -122,6 +204,7 @@ class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     DATABASE_URL = "sqlite:///./dive_jobs_dev.db"
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "True").lower() == "true"
 
 class ProductionConfig(Config):
     """Production configuration"""
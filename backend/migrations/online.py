@@ -0,0 +1,75 @@
+"""
+Online schema changes for large tables
+
+Helpers for migrations that touch the multi-million-row ``jobs`` table
+without locking out readers:
+
+* PostgreSQL builds the index with ``CREATE INDEX CONCURRENTLY`` outside the
+  migration transaction. Reads and writes continue during the build. An
+  interrupted concurrent build leaves an INVALID index behind, which is
+  dropped and rebuilt when the migration is run again.
+* SQLite has no concurrent build. The index goes through batch mode, which
+  issues a plain ``CREATE INDEX`` (readers of a WAL database are not
+  blocked) and only rebuilds the table for changes SQLite cannot make in
+  place.
+
+Other dialects fall back to a regular ``op.create_index``.
+"""
+
+from typing import Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def _postgres_index_state(name: str) -> Optional[bool]:
+    """True for a valid index, False for an invalid one, None if it does not exist"""
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": name},
+    ).scalar()
+
+
+def create_index_online(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[sa.TextClause] = None,
+) -> None:
+    """Create an index without blocking reads; ``where`` makes it a partial index"""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            # Generating SQL offline cannot inspect the catalog
+            state = None if op.get_context().as_sql else _postgres_index_state(name)
+            if state:
+                return
+            if state is False:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(
+                name, table, list(columns), unique=unique, postgresql_concurrently=True, postgresql_where=where
+            )
+    elif dialect == "sqlite":
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_index(name, list(columns), unique=unique, sqlite_where=where)
+    else:
+        op.create_index(name, table, list(columns), unique=unique)
+
+
+def drop_index_online(name: str, table: str) -> None:
+    """Drop an index without blocking reads"""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    elif dialect == "sqlite":
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(name)
+    else:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,126 @@
+"""initial schema
+
+Tables as they stood before migrations were introduced. Databases created
+by the old create_all startup hook are adopted with ``alembic stamp 0001``
+and then brought up to date with ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 08:58:43.693246
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('preview_image', sa.String(), nullable=True),
+    sa.Column('html_template', sa.Text(), nullable=False),
+    sa.Column('css_styles', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('templates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_templates_id'), ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    op.create_table('cvs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.JSON(), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['template_id'], ['templates.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('cvs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cvs_id'), ['id'], unique=False)
+
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('company', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('salary', sa.String(length=255), nullable=True),
+    sa.Column('job_type', sa.String(length=100), nullable=True),
+    sa.Column('experience_level', sa.String(length=100), nullable=True),
+    sa.Column('date_posted', sa.DateTime(), nullable=True),
+    sa.Column('application_deadline', sa.DateTime(), nullable=True),
+    sa.Column('link', sa.String(length=500), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('link')
+    )
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_jobs_company'), ['company'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_date_posted'), ['date_posted'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_is_active'), ['is_active'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_location'), ['location'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_source'), ['source'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_title'), ['title'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jobs_title'))
+        batch_op.drop_index(batch_op.f('ix_jobs_source'))
+        batch_op.drop_index(batch_op.f('ix_jobs_location'))
+        batch_op.drop_index(batch_op.f('ix_jobs_is_active'))
+        batch_op.drop_index(batch_op.f('ix_jobs_id'))
+        batch_op.drop_index(batch_op.f('ix_jobs_date_posted'))
+        batch_op.drop_index(batch_op.f('ix_jobs_company'))
+
+    op.drop_table('jobs')
+    with op.batch_alter_table('cvs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cvs_id'))
+
+    op.drop_table('cvs')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('templates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_templates_id'))
+
+    op.drop_table('templates')
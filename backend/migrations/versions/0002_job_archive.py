@@ -0,0 +1,55 @@
+"""job archive
+
+Cold storage table for inactive jobs, mirroring the jobs columns without
+their indexes or constraints.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs_archive',
+    sa.Column('archive_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('company', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('salary', sa.String(length=255), nullable=True),
+    sa.Column('job_type', sa.String(length=100), nullable=True),
+    sa.Column('experience_level', sa.String(length=100), nullable=True),
+    sa.Column('date_posted', sa.DateTime(), nullable=True),
+    sa.Column('application_deadline', sa.DateTime(), nullable=True),
+    sa.Column('link', sa.String(length=500), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('archive_id')
+    )
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_jobs_archive_archived_at'), ['archived_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_archive_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jobs_archive_id'))
+        batch_op.drop_index(batch_op.f('ix_jobs_archive_archived_at'))
+
+    op.drop_table('jobs_archive')
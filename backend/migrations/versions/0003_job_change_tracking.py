@@ -0,0 +1,44 @@
+"""job change tracking
+
+Content hash and last-seen time of scraped jobs, and an index on
+``updated_at`` for the /jobs/changes feed. Existing jobs start without a
+hash, so their next scrape counts as a change and fills it in.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:40:01.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('jobs', 'jobs_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+            batch_op.add_column(sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+    create_index_online('ix_jobs_last_seen_at', 'jobs', ['last_seen_at'])
+    create_index_online('ix_jobs_updated_at', 'jobs', ['updated_at'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_jobs_updated_at', 'jobs')
+    drop_index_online('ix_jobs_last_seen_at', 'jobs')
+
+    for table in ('jobs_archive', 'jobs'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('last_seen_at')
+            batch_op.drop_column('content_hash')
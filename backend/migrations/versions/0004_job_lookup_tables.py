@@ -0,0 +1,211 @@
+"""job lookup tables
+
+Companies, locations and sources move out of free-text columns on jobs
+(and the archive) into lookup tables referenced by foreign keys. Existing
+values are folded with the same normalization the scrapers use, so "Acme
+(Pty) Ltd" and "ACME" share a company; blank companies and sources are filed
+under "Unknown", blank locations become NULL.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:40:02.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.job_dimensions import (
+    clean_text,
+    normalize_company,
+    normalize_location,
+    normalize_source,
+    province_for,
+    required_name,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_TABLES = ('jobs', 'jobs_archive')
+
+# (text column, lookup table, normalizer, required, text column length)
+LOOKUPS = (
+    ('company', 'companies', normalize_company, True, 255),
+    ('location', 'locations', normalize_location, False, 255),
+    ('source', 'sources', normalize_source, True, 100),
+)
+
+
+def _lookup_rows(raw_names, normalize, required, with_province):
+    """Lookup rows keyed by normalized name, and the key each raw value maps to"""
+    rows = {}
+    keys = {}
+    # Sorted, so the spelling a lookup is displayed with does not depend on row order
+    for raw in sorted(raw_names - {None}):
+        name = required_name(raw) if required else clean_text(raw)
+        if not name:
+            continue
+        display, key = normalize(name)
+        keys[raw] = key
+        if key not in rows:
+            rows[key] = {'name': display, 'normalized_name': key}
+            if with_province:
+                rows[key]['province'] = province_for(display)
+    return rows, keys
+
+
+def _migrate_values() -> None:
+    bind = op.get_bind()
+    for column, table_name, normalize, required, _ in LOOKUPS:
+        jobs = [sa.table(name, sa.column(column), sa.column(f'{column}_id')) for name in JOB_TABLES]
+        raw_names = set()
+        for table in jobs:
+            raw_names.update(bind.execute(sa.select(table.c[column]).distinct()).scalars())
+
+        with_province = table_name == 'locations'
+        lookup = sa.table(
+            table_name,
+            sa.column('id'), sa.column('name'), sa.column('normalized_name'),
+            *([sa.column('province')] if with_province else []),
+        )
+        rows, keys = _lookup_rows(raw_names, normalize, required, with_province)
+        if not rows:
+            continue
+        bind.execute(lookup.insert(), list(rows.values()))
+        ids = dict(bind.execute(sa.select(lookup.c.normalized_name, lookup.c.id)).all())
+
+        # One statement per distinct value, served by the old text column index
+        params = [{'raw_name': raw, 'lookup_id': ids[key]} for raw, key in keys.items()]
+        for table in jobs:
+            bind.execute(
+                table.update()
+                .where(table.c[column] == sa.bindparam('raw_name'))
+                .values({f'{column}_id': sa.bindparam('lookup_id')}),
+                params,
+            )
+
+
+def upgrade() -> None:
+    op.create_table('companies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('normalized_name')
+    )
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_companies_id'), ['id'], unique=False)
+
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('province', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('normalized_name')
+    )
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_locations_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_locations_province'), ['province'], unique=False)
+
+    op.create_table('sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('normalized_name', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('normalized_name')
+    )
+    with op.batch_alter_table('sources', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sources_id'), ['id'], unique=False)
+
+    for table in JOB_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('company_id', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('location_id', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('source_id', sa.Integer(), nullable=True))
+
+    _migrate_values()
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jobs_company'))
+        batch_op.drop_index(batch_op.f('ix_jobs_location'))
+        batch_op.drop_index(batch_op.f('ix_jobs_source'))
+        batch_op.drop_column('company')
+        batch_op.drop_column('location')
+        batch_op.drop_column('source')
+        batch_op.alter_column('company_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('source_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('jobs_company_id_fkey', 'companies', ['company_id'], ['id'])
+        batch_op.create_foreign_key('jobs_location_id_fkey', 'locations', ['location_id'], ['id'])
+        batch_op.create_foreign_key('jobs_source_id_fkey', 'sources', ['source_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_jobs_company_id'), ['company_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_location_id'), ['location_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_source_id'), ['source_id'], unique=False)
+
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.drop_column('company')
+        batch_op.drop_column('location')
+        batch_op.drop_column('source')
+        batch_op.alter_column('company_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('source_id', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    for table in JOB_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column, _, _, _, length in LOOKUPS:
+                batch_op.add_column(sa.Column(column, sa.String(length=length), nullable=True))
+
+    bind = op.get_bind()
+    for table_name in JOB_TABLES:
+        for column, lookup_name, _, _, _ in LOOKUPS:
+            table = sa.table(table_name, sa.column(column), sa.column(f'{column}_id'))
+            lookup = sa.table(lookup_name, sa.column('id'), sa.column('name'))
+            name = sa.select(lookup.c.name).where(lookup.c.id == table.c[f'{column}_id']).scalar_subquery()
+            bind.execute(table.update().values({column: name}))
+
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.alter_column('company', existing_type=sa.String(length=255), nullable=False)
+        batch_op.alter_column('source', existing_type=sa.String(length=100), nullable=False)
+        batch_op.drop_column('source_id')
+        batch_op.drop_column('location_id')
+        batch_op.drop_column('company_id')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jobs_source_id'))
+        batch_op.drop_index(batch_op.f('ix_jobs_location_id'))
+        batch_op.drop_index(batch_op.f('ix_jobs_company_id'))
+        batch_op.drop_constraint('jobs_source_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('jobs_location_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('jobs_company_id_fkey', type_='foreignkey')
+        batch_op.drop_column('source_id')
+        batch_op.drop_column('location_id')
+        batch_op.drop_column('company_id')
+        batch_op.alter_column('company', existing_type=sa.String(length=255), nullable=False)
+        batch_op.alter_column('source', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index(batch_op.f('ix_jobs_company'), ['company'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_location'), ['location'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_source'), ['source'], unique=False)
+
+    with op.batch_alter_table('sources', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sources_id'))
+
+    op.drop_table('sources')
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_locations_province'))
+        batch_op.drop_index(batch_op.f('ix_locations_id'))
+
+    op.drop_table('locations')
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_companies_id'))
+
+    op.drop_table('companies')
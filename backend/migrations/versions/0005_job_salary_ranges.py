@@ -0,0 +1,47 @@
+"""job salary ranges
+
+Parsed salary range of a job in annual ZAR, with the currency and period
+it was quoted in.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 09:40:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('jobs', 'jobs_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('salary_min', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('salary_max', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('salary_currency', sa.String(length=3), nullable=True))
+            batch_op.add_column(sa.Column('salary_period', sa.String(length=10), nullable=True))
+
+    create_index_online('ix_jobs_salary_min', 'jobs', ['salary_min'])
+    create_index_online('ix_jobs_salary_max', 'jobs', ['salary_max'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_jobs_salary_max', 'jobs')
+    drop_index_online('ix_jobs_salary_min', 'jobs')
+
+    for table in ('jobs_archive', 'jobs'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('salary_period')
+            batch_op.drop_column('salary_currency')
+            batch_op.drop_column('salary_max')
+            batch_op.drop_column('salary_min')
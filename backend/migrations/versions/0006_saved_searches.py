@@ -0,0 +1,80 @@
+"""saved searches
+
+Saved job searches and the outbox of alerts awaiting the next digest.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:40:04.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('saved_searches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('search', sa.String(length=255), nullable=True),
+    sa.Column('company', sa.String(length=255), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('source', sa.String(length=100), nullable=True),
+    sa.Column('min_salary', sa.Integer(), nullable=True),
+    sa.Column('max_salary', sa.Integer(), nullable=True),
+    sa.Column('last_job_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_saved_searches_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_saved_searches_is_active'), ['is_active'], unique=False)
+        batch_op.create_index(batch_op.f('ix_saved_searches_user_id'), ['user_id'], unique=False)
+
+    op.create_table('search_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('job_title', sa.String(length=255), nullable=False),
+    sa.Column('job_link', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('saved_search_id', 'job_id')
+    )
+    with op.batch_alter_table('search_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_search_alerts_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_search_alerts_saved_search_id'), ['saved_search_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_search_alerts_sent_at'), ['sent_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_search_alerts_user_id'), ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('search_alerts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_search_alerts_user_id'))
+        batch_op.drop_index(batch_op.f('ix_search_alerts_sent_at'))
+        batch_op.drop_index(batch_op.f('ix_search_alerts_saved_search_id'))
+        batch_op.drop_index(batch_op.f('ix_search_alerts_id'))
+
+    op.drop_table('search_alerts')
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_saved_searches_user_id'))
+        batch_op.drop_index(batch_op.f('ix_saved_searches_is_active'))
+        batch_op.drop_index(batch_op.f('ix_saved_searches_id'))
+
+    op.drop_table('saved_searches')
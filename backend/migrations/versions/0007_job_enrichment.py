@@ -0,0 +1,38 @@
+"""job enrichment
+
+When a job's detail page was last fetched; existing jobs start unenriched.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 09:40:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('jobs', 'jobs_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('enriched_at', sa.DateTime(timezone=True), nullable=True))
+
+    create_index_online('ix_jobs_enriched_at', 'jobs', ['enriched_at'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_jobs_enriched_at', 'jobs')
+
+    for table in ('jobs_archive', 'jobs'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('enriched_at')
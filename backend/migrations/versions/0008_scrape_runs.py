@@ -0,0 +1,71 @@
+"""scrape runs
+
+Ledger of multi-site scrapes and the result pages each has persisted, so an
+interrupted run can be resumed.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 09:40:06.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('scrape_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_key', sa.String(length=500), nullable=False),
+    sa.Column('query', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=False),
+    sa.Column('max_jobs_per_site', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('jobs_saved', sa.Integer(), nullable=False),
+    sa.Column('jobs_updated', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scrape_runs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scrape_runs_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scrape_runs_run_key'), ['run_key'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scrape_runs_status'), ['status'], unique=False)
+
+    op.create_table('scrape_run_pages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('site', sa.String(length=100), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('jobs_found', sa.Integer(), nullable=False),
+    sa.Column('is_last', sa.Boolean(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['scrape_runs.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('run_id', 'site', 'page')
+    )
+    with op.batch_alter_table('scrape_run_pages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scrape_run_pages_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_scrape_run_pages_run_id'), ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scrape_run_pages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scrape_run_pages_run_id'))
+        batch_op.drop_index(batch_op.f('ix_scrape_run_pages_id'))
+
+    op.drop_table('scrape_run_pages')
+    with op.batch_alter_table('scrape_runs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scrape_runs_status'))
+        batch_op.drop_index(batch_op.f('ix_scrape_runs_run_key'))
+        batch_op.drop_index(batch_op.f('ix_scrape_runs_id'))
+
+    op.drop_table('scrape_runs')
@@ -0,0 +1,37 @@
+"""job search and pagination indexes
+
+Composite indexes for the active job listing, the salary sort and the
+/jobs/changes keyset feed, plus a partial index over the jobs still waiting
+for detail page enrichment. Built online so production reads continue.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online('ix_jobs_active_id', 'jobs', ['is_active', 'id'])
+    create_index_online('ix_jobs_active_salary_max', 'jobs', ['is_active', 'salary_max', 'id'])
+    create_index_online('ix_jobs_updated_at_id', 'jobs', ['updated_at', 'id'])
+    create_index_online('ix_jobs_pending_enrichment', 'jobs', ['id'], where=sa.text('enriched_at IS NULL'))
+
+
+def downgrade() -> None:
+    drop_index_online('ix_jobs_pending_enrichment', 'jobs')
+    drop_index_online('ix_jobs_updated_at_id', 'jobs')
+    drop_index_online('ix_jobs_active_salary_max', 'jobs')
+    drop_index_online('ix_jobs_active_id', 'jobs')
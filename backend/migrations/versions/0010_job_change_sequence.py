@@ -0,0 +1,67 @@
+"""job change sequence
+
+Commit-ordered change numbers for the /jobs/changes feed and the facet
+index, replacing the ``updated_at`` watermark. Existing jobs all get change
+number 1, so a consumer starting from 0 receives them once.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.create_table('job_change_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    counter = sa.table('job_change_counter', sa.column('id'), sa.column('value'))
+    op.bulk_insert(counter, [{'id': 1, 'value': 1}])
+
+    for table in ('jobs', 'jobs_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('change_seq', sa.Integer(), nullable=True))
+
+    # Id ranges keep each update short on a large table
+    bind = op.get_bind()
+    jobs = sa.table('jobs', sa.column('id'), sa.column('change_seq'))
+    max_id = bind.execute(sa.select(sa.func.max(jobs.c.id))).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            jobs.update()
+            .where(jobs.c.id >= start, jobs.c.id < start + BACKFILL_BATCH_SIZE)
+            .values(change_seq=1)
+        )
+
+    create_index_online('ix_jobs_change_seq_id', 'jobs', ['change_seq', 'id'])
+    drop_index_online('ix_jobs_updated_at_id', 'jobs')
+    drop_index_online('ix_jobs_updated_at', 'jobs')
+
+
+def downgrade() -> None:
+    create_index_online('ix_jobs_updated_at', 'jobs', ['updated_at'])
+    create_index_online('ix_jobs_updated_at_id', 'jobs', ['updated_at', 'id'])
+    drop_index_online('ix_jobs_change_seq_id', 'jobs')
+
+    for table in ('jobs_archive', 'jobs'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('change_seq')
+
+    op.drop_table('job_change_counter')
@@ -0,0 +1,47 @@
+"""saved search change watermark
+
+Saved searches are evaluated against commit-ordered job change numbers
+instead of job ids. They were evaluated at every ingest so far, so each
+starts from the current change number.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_change_seq', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE saved_searches SET last_change_seq = "
+        "COALESCE((SELECT MAX(change_seq) FROM jobs), 0)"
+    )
+
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.alter_column('last_change_seq', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('last_job_id')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_job_id', sa.Integer(), nullable=True))
+
+    op.execute("UPDATE saved_searches SET last_job_id = COALESCE((SELECT MAX(id) FROM jobs), 0)")
+
+    with op.batch_alter_table('saved_searches', schema=None) as batch_op:
+        batch_op.alter_column('last_job_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('last_change_seq')
@@ -0,0 +1,33 @@
+"""scrape run leases
+
+Owner and heartbeat of the worker running a scrape run; only runs whose
+lease expired are resumed by another worker.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('scrape_runs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('owner', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scrape_runs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('owner')
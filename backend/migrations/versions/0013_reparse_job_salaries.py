@@ -0,0 +1,38 @@
+"""reparse job salaries
+
+Fills the structured salary columns of jobs stored before salaries were
+parsed, and clears amounts taken from text that was not a salary
+("Posted 2026"). Runs the application's parser in batches; changed jobs
+get a change number.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.orm import Session
+
+from app.services.salary import backfill_salaries
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    session = Session(bind=op.get_bind())
+    try:
+        backfill_salaries(session)
+    finally:
+        session.close()
+
+
+def downgrade() -> None:
+    # The parsed columns are derived from the salary text; nothing to undo
+    pass
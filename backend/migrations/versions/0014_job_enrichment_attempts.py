@@ -0,0 +1,35 @@
+"""job enrichment attempts
+
+Failed detail page fetches per job and when the last one failed, so dead
+links are retried with a backoff and eventually left alone.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('jobs', 'jobs_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('enrich_attempts', sa.Integer(), nullable=False, server_default='0'))
+            batch_op.add_column(sa.Column('enrich_failed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('jobs_archive', 'jobs'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('enrich_failed_at')
+            batch_op.drop_column('enrich_attempts')
@@ -0,0 +1,105 @@
+"""
+Search result page cache
+
+Result pages are cached per normalized (site, query, location, page), so two
+users running the same search minutes apart share one scrape. Entries are
+fresh for ``CACHE_DURATION_HOURS``; after that they are still served for up
+to ``CACHE_STALE_HOURS`` (stale-while-revalidate) while a background refresh
+of the page is queued. Pages that could not be fetched are never cached.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str, int]
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class PageCache:
+    """In-process LRU of result page HTML with stale-while-revalidate refreshes"""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = config.CACHE_DURATION_HOURS * 3600 if ttl_seconds is None else ttl_seconds
+        self.stale = config.CACHE_STALE_HOURS * 3600 if stale_seconds is None else stale_seconds
+        self.max_entries = max_entries or config.CACHE_MAX_PAGES
+        self.clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str]]" = OrderedDict()
+        self._refreshing: Set[CacheKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {"hits": 0, "stale": 0, "misses": 0}
+
+    @staticmethod
+    def key(site: str, query: str, location: str, page: int) -> CacheKey:
+        return (site, _normalize(query), _normalize(location), page)
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[str], bool]:
+        """The cached page and whether it is stale; ``(None, False)`` on a miss"""
+        entry = self._entries.get(key) if self.ttl > 0 else None
+        if entry is not None:
+            age = self.clock() - entry[0]
+            if age <= self.ttl + self.stale:
+                self._entries.move_to_end(key)
+                stale = age > self.ttl
+                self.stats["stale" if stale else "hits"] += 1
+                return entry[1], stale
+            del self._entries[key]
+        self.stats["misses"] += 1
+        return None, False
+
+    def age(self, key: CacheKey) -> Optional[float]:
+        """Seconds since the cached page was fetched, None if it is not cached"""
+        entry = self._entries.get(key)
+        return self.clock() - entry[0] if entry is not None else None
+
+    def store(self, key: CacheKey, html: str) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (self.clock(), html)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, key: CacheKey, fetch: Callable[[], Awaitable[Optional[str]]]) -> None:
+        """Queue a background refetch of a stale page, once per key"""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def run():
+            try:
+                html = await fetch()
+                if html:
+                    self.store(key, html)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(run())
+        # Keep a reference so the task is not collected before it finishes
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._refreshing.clear()
+
+
+page_cache = PageCache()
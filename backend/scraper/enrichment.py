@@ -0,0 +1,237 @@
+"""
+Job detail page enrichment
+
+Search result pages only carry a snippet of each job. This stage fetches the
+job's own page and extracts the full description, the real posting date, the
+job type and the experience level. Schema.org ``JobPosting`` JSON-LD is used
+when the page has it, the site's ``detail_selectors`` otherwise.
+
+Pages are fetched by a fixed pool of workers through the scraper's session,
+so the per-site rate limit applies to detail pages as well.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from bs4 import BeautifulSoup  # type: ignore[import-untyped]
+
+from scraper.registry import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = {
+    "FULL_TIME": "Full-time",
+    "PART_TIME": "Part-time",
+    "CONTRACTOR": "Contract",
+    "TEMPORARY": "Temporary",
+    "INTERN": "Internship",
+    "VOLUNTEER": "Volunteer",
+    "PER_DIEM": "Per diem",
+}
+
+_JOB_TYPE_TEXT = (
+    ("Full-time", re.compile(r"full[\s-]?time|permanent", re.IGNORECASE)),
+    ("Part-time", re.compile(r"part[\s-]?time", re.IGNORECASE)),
+    ("Contract", re.compile(r"contract|freelance|fixed[\s-]term", re.IGNORECASE)),
+    ("Temporary", re.compile(r"temporary|temp\b", re.IGNORECASE)),
+    ("Internship", re.compile(r"intern(ship)?|learnership|graduate programme", re.IGNORECASE)),
+)
+
+_EXPERIENCE_LEVELS = (
+    ("Executive", re.compile(r"\b(head of|director|chief|vp|executive)\b", re.IGNORECASE)),
+    ("Lead", re.compile(r"\b(lead|principal|staff|manager)\b", re.IGNORECASE)),
+    ("Senior", re.compile(r"\b(senior|snr|sr\.?)\b", re.IGNORECASE)),
+    ("Entry", re.compile(r"\b(junior|jnr|jr\.?|graduate|entry[\s-]level|intern|trainee)\b", re.IGNORECASE)),
+    ("Mid", re.compile(r"\b(intermediate|mid[\s-]?level)\b", re.IGNORECASE)),
+)
+
+_RELATIVE_DATE = re.compile(r"(\d+)\+?\s*(minute|hour|day|week|month)s?\s+ago", re.IGNORECASE)
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+)?(?:Z|[+-]\d{2}:?\d{2})?")
+_DAY_MONTH_YEAR = re.compile(r"\b(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})\b")
+_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+
+@dataclass
+class DetailTask:
+    """A stored job whose detail page should be fetched"""
+    job_id: int
+    link: str
+    site: str
+    title: Optional[str] = None
+
+
+def parse_posted_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse ISO, "12 March 2026" and relative ("3 days ago", "yesterday") posting dates"""
+    if not text:
+        return None
+    now = now or datetime.utcnow()
+    lowered = text.lower()
+
+    if "just posted" in lowered or "today" in lowered:
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if "yesterday" in lowered:
+        return (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    match = _RELATIVE_DATE.search(text)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2).lower()
+        days = {"minute": 1 / 1440, "hour": 1 / 24, "day": 1, "week": 7, "month": 30}[unit]
+        return now - timedelta(days=amount * days)
+
+    match = _ISO_DATE.search(text)
+    if match:
+        try:
+            parsed = datetime.fromisoformat(match.group(0).replace("Z", "+00:00"))
+            return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+        except ValueError:
+            pass
+
+    match = _DAY_MONTH_YEAR.search(text)
+    if match:
+        for month_format in ("%B", "%b"):
+            try:
+                return datetime.strptime(" ".join(match.groups()), f"%d {month_format} %Y")
+            except ValueError:
+                continue
+    return None
+
+
+def normalize_job_type(value) -> Optional[str]:
+    """Map schema.org employment types or free text to the labels used in the jobs table"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.upper() in JOB_TYPES:
+        return JOB_TYPES[value.upper()]
+    for label, pattern in _JOB_TYPE_TEXT:
+        if pattern.search(value):
+            return label
+    return None
+
+
+def infer_experience_level(*texts: Optional[str]) -> Optional[str]:
+    """Seniority keywords in the title (checked first) or the description"""
+    for text in texts:
+        if not text:
+            continue
+        for label, pattern in _EXPERIENCE_LEVELS:
+            if pattern.search(text):
+                return label
+    return None
+
+
+def _html_to_text(value: str) -> str:
+    text = BeautifulSoup(value, "html.parser").get_text("\n") if _TAG.search(value) else value
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def json_ld_postings(soup: BeautifulSoup) -> List[Dict]:
+    """Every schema.org JobPosting embedded in a page as JSON-LD"""
+    postings = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict):
+            data = data.get("@graph", [data])
+        for item in data if isinstance(data, list) else []:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                postings.append(item)
+    return postings
+
+
+def parse_job_detail(html: str, config: ScrapingConfig, title: Optional[str] = None) -> Dict:
+    """Fields found on a job detail page; missing ones are left out"""
+    if config.detail_page_hook:
+        return config.detail_page_hook(html, config)
+
+    soup = BeautifulSoup(html, "html.parser")
+    fields: Dict = {}
+
+    postings = json_ld_postings(soup)
+    if postings:
+        posting = postings[0]
+        if posting.get("description"):
+            fields["description"] = _html_to_text(posting["description"])
+        fields["date_posted"] = parse_posted_date(posting.get("datePosted"))
+        fields["job_type"] = normalize_job_type(posting.get("employmentType"))
+        experience = posting.get("experienceRequirements")
+        if isinstance(experience, dict):
+            months = experience.get("monthsOfExperience")
+            if months is not None:
+                years = float(months) / 12
+                fields["experience_level"] = "Entry" if years < 2 else "Mid" if years < 5 else "Senior"
+        elif isinstance(experience, str):
+            fields["experience_level"] = infer_experience_level(experience)
+
+    for name, selector in config.compiled_detail.items():
+        if fields.get(name):
+            continue
+        element = selector.select_one(soup)
+        if element is None:
+            continue
+        text = element.get_text("\n", strip=True)
+        if name == "description":
+            fields[name] = _html_to_text(text)
+        elif name == "date_posted":
+            fields[name] = parse_posted_date(element.get("datetime") or text)
+        elif name == "job_type":
+            fields[name] = normalize_job_type(text)
+        else:
+            fields[name] = text or None
+
+    if not fields.get("experience_level"):
+        fields["experience_level"] = infer_experience_level(title, fields.get("description"))
+
+    return {name: value for name, value in fields.items() if value}
+
+
+class DetailEnricher:
+    """Fetches and parses detail pages with a bounded pool of workers"""
+
+    def __init__(self, scraper, concurrency: int = 4):
+        self.scraper = scraper
+        self.concurrency = concurrency
+
+    async def enrich(self, tasks: Sequence[DetailTask]) -> Dict[int, Optional[Dict]]:
+        """
+        Fetch every task's page; returns parsed fields per job id.
+
+        A job maps to None when its page could not be fetched, so the caller
+        can leave it for a later run.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for task in tasks:
+            queue.put_nowait(task)
+        results: Dict[int, Optional[Dict]] = {}
+
+        async def worker():
+            while True:
+                try:
+                    task = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                config = self.scraper.configs.get(task.site)
+                html = await self.scraper._fetch_page(task.link, task.site) if config else None
+                if html is None:
+                    results[task.job_id] = None
+                    continue
+                try:
+                    results[task.job_id] = parse_job_detail(html, config, task.title)
+                except Exception as e:
+                    logger.warning(f"Error parsing detail page {task.link}: {e}")
+                    results[task.job_id] = {}
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(tasks)))]
+        await asyncio.gather(*workers)
+        return results
@@ -1,44 +1,61 @@
-import requests
+"""
+Google Jobs adapter for the unified scraper
+
+Google Jobs has no public API and its result pages are rendered client side,
+so live scraping reads whatever schema.org ``JobPosting`` JSON-LD the search
+page embeds. Realistic South African sample data is only served when
+``SCRAPER_FIXTURE_MODE`` is on.
+"""
+
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import time
 import random
-from typing import List, Dict, Optional
-import re
+from typing import List, Dict
 from urllib.parse import quote_plus
 
+from config import get_config
+from scraper.enrichment import json_ld_postings, normalize_job_type, parse_posted_date
+from scraper.unified_scraper import JobResult
+
+config = get_config()
+
+
 class GoogleJobsScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-    
-    def scrape_jobs(self, query: str = "python developer", location: str = "south africa", limit: int = 10) -> List[Dict]:
-        """
-        Scrape job listings from Google Jobs
-        Note: Google Jobs has anti-scraping measures, so this provides sample data based on typical SA job market
-        """
-        print(f"Fetching Google Jobs data for: {query} in {location}")
-        
-        try:
-            # In a real implementation, you might use Google Jobs API or other methods
-            # For now, we'll provide realistic sample data based on South African job market
-            jobs = self._get_google_jobs_sample_data(query, location, limit)
-            
-            # Simulate API call delay
-            time.sleep(random.uniform(1, 2))
-            
-            return jobs
-            
-        except Exception as e:
-            print(f"Error fetching Google Jobs data: {e}")
-            return self._get_google_jobs_sample_data(query, location, limit)
+    """Async Google Jobs adapter; see ``scraper.registry`` for the adapter protocol"""
+
+    async def scrape(self, scraper, site: str, site_config, query: str, location: str,
+                     max_jobs: int) -> List[JobResult]:
+        """Fetch Google Jobs results for a query through the shared scraper session"""
+        if config.SCRAPER_FIXTURE_MODE:
+            return [JobResult(**job) for job in self._get_google_jobs_sample_data(query, location, max_jobs)]
+
+        html, fetched_at = await scraper._results_page(site, site_config, query, location, 0)
+        if not html:
+            return []
+        return scraper.seen_on(self._parse_postings(html, site_config)[:max_jobs], fetched_at)
+
+    def _parse_postings(self, html: str, site_config) -> List[JobResult]:
+        """Job postings embedded in the page as JSON-LD"""
+        jobs = []
+        for posting in json_ld_postings(BeautifulSoup(html, 'html.parser')):
+            organization = posting.get('hiringOrganization') or {}
+            job_location = posting.get('jobLocation') or {}
+            if isinstance(job_location, list):
+                job_location = job_location[0] if job_location else {}
+            address = job_location.get('address') or {}
+            if not posting.get('title') or not organization.get('name'):
+                continue
+            jobs.append(JobResult(
+                title=posting['title'],
+                company=organization['name'],
+                location=address.get('addressLocality') or address.get('addressRegion') or "South Africa",
+                description=BeautifulSoup(posting.get('description') or '', 'html.parser').get_text(' ', strip=True),
+                job_type=normalize_job_type(posting.get('employmentType')),
+                date_posted=parse_posted_date(posting.get('datePosted')),
+                link=posting.get('url') or '',
+                source=site_config.name
+            ))
+        return jobs
     
     def _get_google_jobs_sample_data(self, query: str, location: str, limit: int) -> List[Dict]:
         """
@@ -247,12 +264,3 @@ class GoogleJobsScraper:
             jobs.append(job_data)
         
         return jobs
-    
-    def search_google_jobs_api(self, query: str, location: str, limit: int) -> List[Dict]:
-        """
-        Alternative method using Google Jobs API (requires API key)
-        This is a placeholder for future implementation
-        """
-        # This would require Google Jobs API integration
-        # For now, return sample data
-        return self._get_google_jobs_sample_data(query, location, limit)
@@ -0,0 +1,170 @@
+"""
+Per-site extraction health
+
+Every result page fetched from a board is recorded as a sample (pages
+served from the page cache are not): containers found, jobs extracted, the
+share of optional fields (location, description, salary, link) that were
+filled, the bytes fetched and which selector set matched.
+Per site the tracker keeps running totals and two exponentially weighted
+averages of the yield (jobs per KB fetched): a fast one following the last
+few pages and a slow baseline.
+
+A site is demoted when its markup apparently changed, i.e. several first
+result pages in a row produced no jobs with any selector set, or when the
+fast yield falls below ``SCRAPER_HEALTH_COLLAPSE_RATIO`` of the baseline.
+First pages where the board says the search matched nothing (its
+``no_results`` selector, or wording like "no jobs found") do not count.
+Demoted sites are skipped by multi-site scrapes until their back-off
+(``SCRAPER_DEMOTION_HOURS``, doubling per consecutive demotion up to
+``SCRAPER_DEMOTION_MAX_HOURS``) has passed; the next scrape is then a probe,
+and a productive page restores the site.
+
+The tracker lives in process memory, so each worker keeps its own view.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional
+
+from config import get_config
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+FAST_ALPHA = 0.3
+SLOW_ALPHA = 0.05
+# Pages needed before the yield averages are trusted
+MIN_SAMPLES = 10
+
+
+@dataclass
+class ExtractionSample:
+    """What parsing one result page produced"""
+    containers: int
+    jobs: int
+    fields_filled: int
+    fields_total: int
+    nbytes: int
+    selector_set: Optional[int] = None  # Index of the matching set, 0 is the primary selectors
+    no_results: bool = False  # The board says the search matched nothing
+
+
+@dataclass
+class SiteHealth:
+    pages: int = 0
+    containers: int = 0
+    jobs: int = 0
+    bytes: int = 0
+    fill_ratio: float = 0.0  # EWMA of the fields-filled share
+    fast_yield: float = 0.0  # EWMA of jobs per KB, recent pages
+    slow_yield: float = 0.0  # EWMA of jobs per KB, baseline
+    empty_first_pages: int = 0
+    fallback_pages: int = 0
+    last_selector_set: Optional[int] = None
+    demotions: int = 0
+    demoted_until: Optional[float] = None
+    updated_at: Optional[float] = None
+    selector_sets: Dict[int, int] = field(default_factory=dict)
+
+
+def _ewma(current: float, value: float, alpha: float, first: bool) -> float:
+    return value if first else current + alpha * (value - current)
+
+
+class ExtractionHealth:
+    """Extraction statistics and demotion state per site"""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._sites: Dict[str, SiteHealth] = {}
+        self._lock = threading.Lock()
+
+    def record(self, site: str, sample: ExtractionSample, first_page: bool = False) -> None:
+        now = self.clock()
+        with self._lock:
+            health = self._sites.setdefault(site, SiteHealth())
+            first = health.pages == 0
+            health.pages += 1
+            health.containers += sample.containers
+            health.jobs += sample.jobs
+            health.bytes += sample.nbytes
+            health.updated_at = now
+
+            if sample.fields_total:
+                health.fill_ratio = _ewma(
+                    health.fill_ratio, sample.fields_filled / sample.fields_total, FAST_ALPHA, first
+                )
+            # An empty later page is just the end of the results, not a yield drop,
+            # and neither is a search the board says matched nothing
+            if sample.jobs or (first_page and not sample.no_results):
+                page_yield = sample.jobs / max(sample.nbytes / 1024, 1e-9)
+                unseeded = health.slow_yield == 0 and health.fast_yield == 0
+                health.fast_yield = _ewma(health.fast_yield, page_yield, FAST_ALPHA, unseeded)
+                health.slow_yield = _ewma(health.slow_yield, page_yield, SLOW_ALPHA, unseeded)
+
+            if sample.selector_set is not None:
+                health.last_selector_set = sample.selector_set
+                health.selector_sets[sample.selector_set] = health.selector_sets.get(sample.selector_set, 0) + 1
+                if sample.selector_set > 0:
+                    health.fallback_pages += 1
+
+            probing = health.demoted_until is not None
+            if sample.jobs:
+                health.empty_first_pages = 0
+                if probing:
+                    logger.info(f"Restoring {site}: extraction is producing jobs again")
+                    health.demoted_until = None
+                    health.demotions = 0
+                    probing = False
+            elif first_page and not sample.no_results:
+                health.empty_first_pages += 1
+
+            collapsed = (
+                # A probe of a demoted site that still finds nothing backs off further
+                (probing and first_page and not sample.jobs and not sample.no_results)
+                or health.empty_first_pages >= config.SCRAPER_HEALTH_EMPTY_PAGES
+                or (
+                    health.pages >= MIN_SAMPLES
+                    and health.slow_yield > 0
+                    and health.fast_yield < config.SCRAPER_HEALTH_COLLAPSE_RATIO * health.slow_yield
+                )
+            )
+            if collapsed:
+                health.demotions += 1
+                hours = min(
+                    config.SCRAPER_DEMOTION_HOURS * 2 ** (health.demotions - 1), config.SCRAPER_DEMOTION_MAX_HOURS
+                )
+                logger.warning(
+                    f"Demoting {site} for {hours:g}h: yield {health.fast_yield:.3f} jobs/KB against "
+                    f"{health.slow_yield:.3f}, {health.empty_first_pages} empty first pages"
+                )
+                health.demoted_until = now + hours * 3600
+                # Start the evidence over so the probe is judged on its own pages
+                health.empty_first_pages = 0
+                health.fast_yield = health.slow_yield
+
+    def should_fetch(self, site: str) -> bool:
+        """False while the site sits out its demotion back-off"""
+        health = self._sites.get(site)
+        return health is None or health.demoted_until is None or self.clock() >= health.demoted_until
+
+    def snapshot(self) -> Dict[str, Dict]:
+        now = self.clock()
+        with self._lock:
+            return {
+                site: {
+                    **asdict(health),
+                    "demoted": health.demoted_until is not None and now < health.demoted_until,
+                }
+                for site, health in self._sites.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+
+
+# Shared by every scraper in the process
+extraction_health = ExtractionHealth()
@@ -1,66 +1,56 @@
-import requests
-from bs4 import BeautifulSoup
+"""
+Indeed adapter for the unified scraper
+
+South African searches crawl za.indeed.com and everything else www.indeed.com,
+both through the generic result-page loop with the Indeed selectors from the
+site registry. Sample data is only served when ``SCRAPER_FIXTURE_MODE`` is on.
+"""
+
+from dataclasses import replace
 from datetime import datetime, timedelta
-import time
 import random
-from typing import List, Dict, Optional
+from typing import List, Dict
+
+from config import get_config
+from scraper.unified_scraper import JobResult
+
+config = get_config()
+
+INTERNATIONAL_NAME = "Indeed"
+INTERNATIONAL_BASE_URL = "https://www.indeed.com"
+INTERNATIONAL_SEARCH_URL = "https://www.indeed.com/jobs?q={query}&l={location}&start={start}"
+
+SA_KEYWORDS = ['south africa', 'cape town', 'johannesburg', 'durban', 'pretoria', 'za', 'gauteng', 'western cape']
+
+
+def is_sa_location(location: str) -> bool:
+    """Whether a location should be searched on the South African Indeed site"""
+    return any(keyword in location.lower() for keyword in SA_KEYWORDS)
+
 
 class IndeedScraper:
-    def __init__(self):
-        self.base_url = "https://www.indeed.com"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-    
-    def scrape_jobs(self, query: str = "python developer", location: str = "remote", limit: int = 10) -> List[Dict]:
-        """
-        Scrape job listings from Indeed and South African job sites
-        """
-        print(f"Scraping jobs for: {query} in {location}")
-
-        all_jobs = []
-
-        # Check if location is South Africa related
-        sa_keywords = ['south africa', 'cape town', 'johannesburg', 'durban', 'pretoria', 'za', 'gauteng', 'western cape']
-        is_sa_location = any(keyword in location.lower() for keyword in sa_keywords)
-
-        if is_sa_location:
-            # Use South African scraper for SA locations
-            print("Using South African job scraper...")
-            try:
-                from .south_africa_scraper import SouthAfricaJobScraper
-                sa_scraper = SouthAfricaJobScraper()
-                sa_jobs = sa_scraper.scrape_jobs(query, location, limit)
-                all_jobs.extend(sa_jobs)
-            except ImportError as e:
-                print(f"Could not import SA scraper: {e}")
-                # Only return empty list for now - no sample data
-                all_jobs = []
-        else:
-            # For international locations, try real scraping first
-            print("Attempting to scrape international job sites...")
-            try:
-                # Try to scrape real international jobs (placeholder for future implementation)
-                real_jobs = self._scrape_international_jobs(query, location, limit)
-                all_jobs.extend(real_jobs)
-            except Exception as e:
-                print(f"Real scraping failed: {e}")
-                # Only generate sample data if specifically requested or for demo purposes
-                if limit <= 5:  # Only for small requests
-                    sample_jobs = self._get_international_sample_jobs(query, location, min(3, limit))
-                    all_jobs.extend(sample_jobs)
-
-        return all_jobs[:limit]
-
-    def _scrape_international_jobs(self, query: str, location: str, limit: int) -> List[Dict]:
-        """
-        Attempt to scrape real international jobs
-        This is a placeholder for future real scraping implementation
-        """
-        # For now, return empty list to avoid mock data
-        # In the future, this would contain real scraping logic for Indeed.com, LinkedIn, etc.
-        print(f"Real international scraping not yet implemented for {query} in {location}")
-        return []
+    """Async Indeed adapter; see ``scraper.registry`` for the adapter protocol"""
+
+    async def scrape(self, scraper, site: str, site_config, query: str, location: str,
+                     max_jobs: int) -> List[JobResult]:
+        """Scrape Indeed for a query through the shared scraper session"""
+        if not is_sa_location(location):
+            # Jobs are labelled with the name, so it has to change with the site
+            site_config = replace(
+                site_config,
+                name=INTERNATIONAL_NAME,
+                base_url=INTERNATIONAL_BASE_URL,
+                search_url=INTERNATIONAL_SEARCH_URL,
+            )
+
+        if config.SCRAPER_FIXTURE_MODE:
+            if is_sa_location(location):
+                sample_jobs = self._get_sa_sample_jobs(query, location, max_jobs)
+            else:
+                sample_jobs = self._get_international_sample_jobs(query, location, max_jobs)
+            return [JobResult(**{**job, "source": site_config.name}) for job in sample_jobs]
+
+        return await scraper._scrape_pages(site, site_config, query, location, max_jobs)
 
     def _get_international_sample_jobs(self, query: str, location: str, limit: int) -> List[Dict]:
         """
@@ -114,9 +104,6 @@ class IndeedScraper:
                 "source": "Indeed"
             })
 
-        # Simulate processing time
-        time.sleep(random.uniform(1, 2))
-
         return sample_jobs
 
     def _get_sa_sample_jobs(self, query: str, location: str, limit: int) -> List[Dict]:
@@ -147,24 +134,8 @@ class IndeedScraper:
                 "job_type": "Full-time",
                 "experience_level": "Senior",
                 "date_posted": datetime.now() - timedelta(days=random.randint(0, 7)),
-                "link": f"https://spane4all.co.za/job/{i+1}",
-                "source": "Spane4all"
+                "link": f"https://za.indeed.com/viewjob?jk=sample{i+1}",
+                "source": "Indeed South Africa"
             })
 
         return sample_jobs
-
-    def _parse_job_card(self, job_element) -> Optional[Dict]:
-        """
-        Parse individual job card element
-        To be implemented with real scraping logic
-        """
-        # This will contain the actual parsing logic later
-        pass
-    
-    def _get_job_details(self, job_url: str) -> Optional[Dict]:
-        """
-        Get detailed job information from job page
-        To be implemented with real scraping logic
-        """
-        # This will contain the actual detail scraping logic later
-        pass
@@ -0,0 +1,169 @@
+"""
+Vectorized BM25 relevance scoring for job results
+
+A whole batch of jobs is scored at once: term frequencies for the query terms
+go into a scipy sparse matrix, BM25 saturation is applied to its non-zero
+entries and the scores come out of a single sparse-dense product. Corpus
+statistics (document frequencies, average length) are shared per process and
+updated incrementally as jobs are ingested and archived.
+
+numpy and scipy are imported on the first scoring call, so the API process
+does not pay for them at startup.
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Title terms count this many times as often as description terms
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens; keeps tech terms like c++, c# and node.js intact"""
+    return _TOKEN.findall((text or "").lower())
+
+
+def job_tokens(title: Optional[str], description: Optional[str]) -> List[str]:
+    """Tokens of a job document, with the title weighted up"""
+    return tokenize(title) * TITLE_WEIGHT + tokenize(description)
+
+
+class CorpusStats:
+    """
+    Document frequencies and lengths of the ingested job corpus
+
+    Loaded once with ``warm``; until then ``add`` and ``remove`` are no-ops,
+    since the documents they carry are counted when the corpus is read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.doc_freq: Counter = Counter()
+        self.n_docs = 0
+        self.total_length = 0
+        self.warmed = False
+
+    @staticmethod
+    def _count(documents: Iterable[List[str]]) -> Tuple[Counter, int, int]:
+        doc_freq: Counter = Counter()
+        n_docs = 0
+        total_length = 0
+        for tokens in documents:
+            doc_freq.update(set(tokens))
+            n_docs += 1
+            total_length += len(tokens)
+        return doc_freq, n_docs, total_length
+
+    def warm(self, documents: Iterable[List[str]]) -> bool:
+        """Load the statistics of the whole corpus; False if they already were"""
+        # Tokenized outside the lock, so add and remove do not wait for the read
+        doc_freq, n_docs, total_length = self._count(documents)
+        with self._lock:
+            if self.warmed:
+                return False
+            self.doc_freq.update(doc_freq)
+            self.n_docs += n_docs
+            self.total_length += total_length
+            self.warmed = True
+        return True
+
+    def add(self, documents: Iterable[List[str]]) -> None:
+        """Fold tokenized documents that joined the corpus into the statistics"""
+        doc_freq, n_docs, total_length = self._count(documents)
+        with self._lock:
+            if not self.warmed:
+                return
+            self.doc_freq.update(doc_freq)
+            self.n_docs += n_docs
+            self.total_length += total_length
+
+    def remove(self, documents: Iterable[List[str]]) -> None:
+        """Take tokenized documents that left the corpus out of the statistics"""
+        doc_freq, n_docs, total_length = self._count(documents)
+        with self._lock:
+            if not self.warmed:
+                return
+            # Counter subtraction drops terms no document uses any more
+            self.doc_freq -= doc_freq
+            self.n_docs = max(self.n_docs - n_docs, 0)
+            self.total_length = max(self.total_length - total_length, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.doc_freq = Counter()
+            self.n_docs = 0
+            self.total_length = 0
+            self.warmed = False
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.n_docs if self.n_docs else 0.0
+
+
+# Shared by the scraper and the API within a process
+corpus_stats = CorpusStats()
+
+
+class BM25Scorer:
+    """Scores batches of tokenized documents against a query"""
+
+    def __init__(
+        self, stats: Optional[CorpusStats] = None, k1: float = 1.5, b: float = 0.75
+    ):
+        self.stats = stats if stats is not None else corpus_stats
+        self.k1 = k1
+        self.b = b
+
+    def score(self, query: str, documents: Sequence[List[str]]) -> "np.ndarray":
+        """BM25 score of every document for ``query``"""
+        import numpy as np
+        from scipy import sparse  # type: ignore[import-untyped]
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not documents:
+            return np.zeros(len(documents), dtype=np.float64)
+
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        rows, columns = [], []
+        lengths = np.empty(len(documents), dtype=np.float64)
+        for row, tokens in enumerate(documents):
+            lengths[row] = len(tokens)
+            for token in tokens:
+                column = vocabulary.get(token)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+        tf = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, columns)),
+            shape=(len(documents), len(terms)),
+        )
+        tf.sum_duplicates()
+
+        # Fall back to the batch itself when the corpus has not been loaded yet
+        if self.stats.n_docs:
+            n_docs = self.stats.n_docs
+            avg_length = self.stats.avg_length
+            doc_freq = np.array(
+                [self.stats.doc_freq.get(term, 0) for term in terms], dtype=np.float64
+            )
+        else:
+            n_docs = len(documents)
+            avg_length = float(lengths.mean()) or 1.0
+            doc_freq = np.bincount(tf.indices, minlength=len(terms)).astype(np.float64)
+
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        # Saturate the non-zero term frequencies in place, row by row length norm
+        row_of_entry = np.repeat(np.arange(len(documents)), np.diff(tf.indptr))
+        norm = self.k1 * (1 - self.b + self.b * lengths / (avg_length or 1.0))
+        tf.data = tf.data * (self.k1 + 1) / (tf.data + norm[row_of_entry])
+
+        return tf @ idf
@@ -0,0 +1,211 @@
+"""
+Job site adapter registry
+
+Site configurations live in a declarative JSON (or YAML, when PyYAML is
+installed) file rather than in code. The file is re-read whenever its
+modification time changes, so boards can be added, disabled or throttled, and
+``max_pages``/``rate_limit`` tuned, without a redeploy. CSS selectors are
+compiled once with soupsieve and cached, and a site may name optional Python
+hooks for pagination and detail parsing as ``"package.module:function"``:
+
+    pagination(config, query, location, page) -> URL of the zero-based page, or None to stop
+    detail(container, job) -> the JobResult refined from its listing element, or None to drop it
+    detail_page(html, config) -> dict of fields parsed from a job's own page (see scraper.enrichment)
+
+An optional ``no_results`` selector matches the board's "no jobs found"
+notice, so empty searches are not mistaken for broken selectors.
+
+When a board changes its markup, ``fallback_selectors`` lists alternate
+selector sets, each overriding the primary selectors it names; they are
+tried in order on a page where the primary set finds no jobs, and the set
+that matched is recorded in the site's extraction health (scraper.health).
+
+Boards that are not a plain result-page crawl name an ``"adapter"`` class
+instead; it is instantiated once per load and its coroutine
+``scrape(scraper, site, config, query, location, max_jobs)`` returns the
+site's JobResults. Adapters fetch through ``scraper._fetch_page`` so they
+share the scraper's session, rate limiter and deduplication, and may fall
+back to the generic ``scraper._scrape_pages``.
+
+Example entry::
+
+    "careers24": {
+        "name": "Careers24",
+        "base_url": "https://www.careers24.com",
+        "search_url": "https://www.careers24.com/jobs/search?q={query}&l={location}&p={page}",
+        "selectors": {"job_container": ".job-result-card", "title": ".job-title", ...},
+        "fallback_selectors": [{"job_container": "article.job-card", "title": "h2 a"}],
+        "rate_limit": 2.0,
+        "max_pages": 5,
+        "enabled": true,
+        "hooks": {"pagination": "scraper.hooks:careers24_page_url"}
+    }
+"""
+
+import importlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote_plus
+
+import soupsieve
+
+from config import get_config
+
+try:
+    import yaml  # type: ignore[import-untyped]
+except ImportError:  # YAML site files are optional
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_SELECTORS = ("job_container", "title", "company")
+
+
+@lru_cache(maxsize=512)
+def compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once per process"""
+    return soupsieve.compile(selector)
+
+
+def load_hook(path: Optional[str]) -> Optional[Callable]:
+    """Resolve a ``"module:function"`` hook reference"""
+    if not path:
+        return None
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+@dataclass
+class ScrapingConfig:
+    """Configuration for each job site"""
+    name: str
+    base_url: str
+    search_url: str
+    selectors: Dict[str, str] = field(default_factory=dict)
+    fallback_selectors: List[Dict[str, str]] = field(default_factory=list)  # Tried in order when selectors find no jobs
+    rate_limit: float = 2.0  # seconds between requests
+    max_pages: int = 5
+    enabled: bool = True
+    page_size: int = 10  # Offset step for ``{start}`` style pagination
+    detail_selectors: Dict[str, str] = field(default_factory=dict)  # Fields read from job detail pages
+    hooks: Dict[str, str] = field(default_factory=dict)
+    adapter: Optional[Any] = None  # "module:Class" in the file, an instance once loaded
+    compiled: Dict[str, soupsieve.SoupSieve] = field(init=False, repr=False)
+    selector_sets: List[Dict[str, soupsieve.SoupSieve]] = field(init=False, repr=False)
+    compiled_detail: Dict[str, soupsieve.SoupSieve] = field(init=False, repr=False)
+    pagination_hook: Optional[Callable] = field(init=False, repr=False)
+    detail_hook: Optional[Callable] = field(init=False, repr=False)
+    detail_page_hook: Optional[Callable] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if isinstance(self.adapter, str):
+            self.adapter = load_hook(self.adapter)()
+        missing = [name for name in REQUIRED_SELECTORS if not self.selectors.get(name)]
+        if missing and not self.adapter:
+            raise ValueError(f"{self.name} is missing selectors: {', '.join(missing)}")
+        self.compiled = {name: compile_selector(selector) for name, selector in self.selectors.items()}
+        # Each fallback set overrides the primary selectors it names
+        self.selector_sets = [self.compiled]
+        for index, fallback in enumerate(self.fallback_selectors, 1):
+            merged = {**self.selectors, **fallback}
+            missing = [name for name in REQUIRED_SELECTORS if not merged.get(name)]
+            if missing:
+                raise ValueError(f"{self.name} fallback selector set {index} is missing: {', '.join(missing)}")
+            self.selector_sets.append({name: compile_selector(selector) for name, selector in merged.items()})
+        self.compiled_detail = {
+            name: compile_selector(selector) for name, selector in self.detail_selectors.items()
+        }
+        self.pagination_hook = load_hook(self.hooks.get("pagination"))
+        self.detail_hook = load_hook(self.hooks.get("detail"))
+        self.detail_page_hook = load_hook(self.hooks.get("detail_page"))
+
+    def page_url(self, query: str, location: str, page: int) -> Optional[str]:
+        """URL of the zero-based ``page`` of results, or None when there are no more pages"""
+        if self.pagination_hook:
+            return self.pagination_hook(self, query, location, page)
+        return self.search_url.format(
+            query=quote_plus(query),
+            location=quote_plus(location),
+            page=page + 1,
+            start=page * self.page_size,
+        )
+
+
+class SiteRegistry:
+    """Site configurations backed by a file, reloaded when it changes"""
+
+    def __init__(self, path: str, allowed_sites: Optional[list] = None):
+        self.path = path
+        self.allowed_sites = allowed_sites
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._sites: Dict[str, ScrapingConfig] = {}
+
+    def _read(self) -> Dict:
+        with open(self.path) as handle:
+            if self.path.endswith((".yaml", ".yml")):
+                if yaml is None:
+                    raise RuntimeError("PyYAML is required for YAML site files")
+                return yaml.safe_load(handle) or {}
+            return json.load(handle)
+
+    def _build(self, raw: Dict) -> Dict[str, ScrapingConfig]:
+        sites = {}
+        for key, values in raw.items():
+            try:
+                site = ScrapingConfig(**values)
+            except (TypeError, ValueError, ImportError, AttributeError, soupsieve.SelectorSyntaxError) as e:
+                # One broken entry must not take the other boards down
+                logger.error(f"Skipping site {key} from {self.path}: {e}")
+                continue
+            if self.allowed_sites is not None and key not in self.allowed_sites:
+                site.enabled = False
+            sites[key] = site
+
+        if self.allowed_sites is not None:
+            unknown = [key for key in self.allowed_sites if key not in sites]
+            if unknown:
+                logger.warning(f"Enabled job sites without a configuration: {', '.join(unknown)}")
+        return sites
+
+    def sites(self) -> Dict[str, ScrapingConfig]:
+        """Current site configurations, keyed by site id"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            logger.error(f"Cannot read site configurations from {self.path}: {e}")
+            return self._sites
+
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    try:
+                        self._sites = self._build(self._read())
+                        logger.info(f"Loaded {len(self._sites)} job sites from {self.path}")
+                    except Exception as e:
+                        # Keep serving the last good configuration
+                        logger.error(f"Invalid site configuration file {self.path}: {e}")
+                    self._mtime = mtime
+        return self._sites
+
+    def get(self, site: str) -> Optional[ScrapingConfig]:
+        return self.sites().get(site)
+
+    def key_for_source(self, source: Optional[str]) -> Optional[str]:
+        """Site id of the board whose display name a stored job carries as its source"""
+        wanted = (source or "").casefold()
+        for key, site in self.sites().items():
+            if site.name.casefold() == wanted:
+                return key
+        return None
+
+
+_config = get_config()
+
+# Shared by every scraper in the process
+site_registry = SiteRegistry(_config.SCRAPER_SITES_FILE, _config.ENABLED_JOB_SITES)
@@ -0,0 +1,190 @@
+"""
+Process-wide scrape scheduler
+
+Every ``UnifiedJobScraper`` in a process fetches through one scheduler per
+event loop, which owns:
+
+* a single ``aiohttp`` session and connector, so concurrent scrapes share
+  connections instead of opening a pool each;
+* a global in-flight budget. When it is exhausted, waiting fetches are
+  granted slots by priority class, so interactive user scrapes go ahead of
+  queued background refreshes;
+* the per-site rate limit, so concurrent scrapes of one board are spaced out
+  together rather than each on its own clock;
+* coalescing: concurrent fetches of the same page of the same site (the URL
+  is derived from site, query, location and page) share one request.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from config import get_config
+from scraper.tracing import span
+
+config = get_config()
+logger = logging.getLogger(__name__)
+
+# Priority classes, lower is served first
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# Result handed to coalesced waiters when the fetch they joined was cancelled
+_ABANDONED = object()
+
+
+class ScrapeScheduler:
+    """Shared session, fetch budget, rate limits and request coalescing for one event loop"""
+
+    def __init__(self, max_in_flight: Optional[int] = None, limit_per_host: Optional[int] = None):
+        self.max_in_flight = max_in_flight or config.SCRAPE_MAX_IN_FLIGHT
+        self.limit_per_host = limit_per_host or config.SCRAPE_CONNECTIONS_PER_HOST
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._next_slot: Dict[str, float] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {"fetches": 0, "coalesced": 0}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_in_flight,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=30,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, connect=10, sock_read=15),
+                headers={
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Language': 'en-US,en;q=0.5',
+                    'Accept-Encoding': 'gzip, deflate',
+                    'Connection': 'keep-alive',
+                    'Upgrade-Insecure-Requests': '1',
+                }
+            )
+        return self.session
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def respect_rate_limit(self, site: str, interval: float) -> None:
+        """Wait for the site's next request slot, shared by every scraper in the process"""
+        # Reserve the slot before sleeping so concurrent callers queue up behind each other
+        now = time.time()
+        slot = max(now, self._next_slot.get(site, 0) + interval)
+        self._next_slot[site] = slot
+        if slot > now:
+            with span("scraper.rate_limit_wait", **{"scraper.site": site, "scraper.wait_seconds": slot - now}):
+                await asyncio.sleep(slot - now)
+
+    @asynccontextmanager
+    async def slot(self, priority: int = INTERACTIVE):
+        """Hold one unit of the global in-flight budget"""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+            try:
+                with span("scraper.slot_wait", **{"scraper.priority": priority, "scraper.queued": len(self._waiters)}):
+                    await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Hand the slot straight to the most urgent waiter
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def fetch(
+        self,
+        site: str,
+        url: str,
+        download: Callable[[], Awaitable[Optional[str]]],
+        priority: int = INTERACTIVE,
+        rate_limit: float = 0.0,
+    ) -> Optional[str]:
+        """Run ``download`` for a page unless the same page is already being fetched"""
+        key = (site, url)
+        while key in self._pending:
+            self.stats["coalesced"] += 1
+            result = await asyncio.shield(self._pending[key])
+            if result is not _ABANDONED:
+                return result
+            # The fetch was cancelled by its caller; the first waiter back takes it over
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            await self.respect_rate_limit(site, rate_limit)
+            async with self.slot(priority):
+                self.stats["fetches"] += 1
+                result = await download()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Cancelling the future would cancel the coalesced waiters too
+            future.set_result(_ABANDONED)
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching {site}: {url} - {str(e)}")
+            future.set_result(None)
+            return None
+        finally:
+            del self._pending[key]
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ScrapeScheduler]" = weakref.WeakKeyDictionary()
+
+
+def get_scheduler() -> ScrapeScheduler:
+    """The scheduler of the running event loop"""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = ScrapeScheduler()
+    return scheduler
+
+
+async def close_scheduler() -> None:
+    """Close the shared session of the running event loop"""
+    scheduler = _schedulers.pop(asyncio.get_running_loop(), None)
+    if scheduler is not None:
+        await scheduler.close()
+
+
+def run_scrape(coroutine):
+    """``asyncio.run`` for worker code, closing the loop's shared session afterwards"""
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await close_scheduler()
+
+    return asyncio.run(main())
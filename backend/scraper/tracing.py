@@ -0,0 +1,28 @@
+"""
+Tracing spans for the scraper
+
+Thin wrapper over the OpenTelemetry API, which is optional
+(requirements-tracing.txt). Without it, or while no tracer provider is
+configured (see ``app.core.tracing``), ``span`` costs next to nothing and
+yields None.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - tracing extras not installed
+    trace = None  # type: ignore[assignment]
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional["trace.Span"]]:
+    """A child span of the current one; attributes that are None are left out"""
+    if trace is None:
+        yield None
+        return
+    with trace.get_tracer("dive.scraper").start_as_current_span(
+        name, attributes={key: value for key, value in attributes.items() if value is not None}
+    ) as current:
+        yield current
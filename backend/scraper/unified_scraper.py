@@ -9,28 +9,48 @@ import time
 import random
 import hashlib
 import json
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse, quote_plus
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
 import logging
 from collections import defaultdict
 import re
-import os
 import sys
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import get_config
+from scraper.ranking import BM25Scorer, job_tokens
+from scraper.registry import ScrapingConfig, SiteRegistry, site_registry
+from scraper.cache import PageCache, page_cache
+from scraper.health import ExtractionHealth, ExtractionSample, extraction_health
+from scraper.scheduler import BACKGROUND, INTERACTIVE, ScrapeScheduler, get_scheduler, run_scrape
+from scraper.tracing import span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+_config = get_config()
+
+# Fields a listing may carry beyond title and company, for the extraction fill ratio
+OPTIONAL_FIELDS = ("location", "description", "salary", "link")
+
+# A board saying the search matched nothing, for sites without a "no_results" selector
+NO_RESULTS_TEXT = re.compile(
+    r"\bno (?:matching )?(?:jobs|results|vacancies)(?: were)? found\b|did not match any jobs|\b0 jobs found\b",
+    re.IGNORECASE,
+)
+
+@dataclass(slots=True)
 class JobResult:
-    """Standardized job result structure"""
+    """
+    Standardized job result structure
+
+    Slotted (no per-instance ``__dict__``) since large runs hold thousands of
+    them; persistence reads the attributes directly, ``to_dict`` is only for
+    API responses.
+    """
     title: str
     company: str
     location: str
@@ -41,6 +61,9 @@ class JobResult:
     date_posted: Optional[datetime] = None
     link: str = ""
     source: str = ""
+    relevance_score: Optional[float] = None
+    # When the board showed the job, if earlier than now (a page from the cache)
+    seen_at: Optional[datetime] = None
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for API response"""
@@ -54,133 +77,66 @@ class JobResult:
             'experience_level': self.experience_level,
             'date_posted': self.date_posted.isoformat() if self.date_posted else None,
             'link': self.link,
-            'source': self.source
+            'source': self.source,
+            'relevance_score': self.relevance_score,
+            'seen_at': self.seen_at.isoformat() if self.seen_at else None
         }
 
-@dataclass
-class ScrapingConfig:
-    """Configuration for each job site"""
-    name: str
-    base_url: str
-    search_url: str
-    selectors: Dict[str, str]
-    rate_limit: float = 2.0  # seconds between requests
-    max_pages: int = 5
-    enabled: bool = True
+    def __post_init__(self):
+        # Company and location names repeat across a run's listings; share one copy
+        if self.company:
+            self.company = sys.intern(self.company)
+        if self.location:
+            self.location = sys.intern(self.location)
 
 class UnifiedJobScraper:
     """High-performance unified job scraper"""
     
-    def __init__(self):
-        self.ua = UserAgent()
+    def __init__(self, registry: Optional[SiteRegistry] = None, priority: int = INTERACTIVE,
+                 cache: Optional[PageCache] = None, checkpoint=None, health: Optional[ExtractionHealth] = None):
+        # Rotated per request from the local list; no browser database to load or download
+        self.user_agents = list(_config.USER_AGENTS)
         self.session: Optional[aiohttp.ClientSession] = None
-        self.seen_jobs: Set[str] = set()
-        self.rate_limits: Dict[str, float] = {}
+        self.scheduler: Optional[ScrapeScheduler] = None
+        self.priority = priority
+        self.seen_jobs: Set[bytes] = set()
         
-        # Job site configurations
-        self.configs = {
-            'indeed_za': ScrapingConfig(
-                name='Indeed South Africa',
-                base_url='https://za.indeed.com',
-                search_url='https://za.indeed.com/jobs?q={query}&l={location}&start={start}',
-                selectors={
-                    'job_container': '.jobsearch-SerpJobCard, .job_seen_beacon',
-                    'title': '.jobTitle a span, .jobTitle-color-purple',
-                    'company': '.companyName, [data-testid="company-name"]',
-                    'location': '.companyLocation, [data-testid="job-location"]',
-                    'description': '.job-snippet, [data-testid="job-snippet"]',
-                    'salary': '.salary-snippet, .salaryText',
-                    'link': '.jobTitle a, h2 a'
-                },
-                rate_limit=1.5
-            ),
-            'careers24': ScrapingConfig(
-                name='Careers24',
-                base_url='https://www.careers24.com',
-                search_url='https://www.careers24.com/jobs/search?q={query}&l={location}&p={page}',
-                selectors={
-                    'job_container': '.job-result-card, .search-result',
-                    'title': '.job-title, h3 a',
-                    'company': '.company-name, .employer',
-                    'location': '.job-location, .location',
-                    'description': '.job-description, .snippet',
-                    'salary': '.salary, .remuneration',
-                    'link': '.job-title a, h3 a'
-                },
-                rate_limit=2.0
-            ),
-            'pnet': ScrapingConfig(
-                name='PNet',
-                base_url='https://www.pnet.co.za',
-                search_url='https://www.pnet.co.za/jobs/search-results?q={query}&l={location}&p={page}',
-                selectors={
-                    'job_container': '.job-item, .search-item',
-                    'title': '.job-title, h2 a',
-                    'company': '.company, .employer-name',
-                    'location': '.location, .job-location',
-                    'description': '.description, .job-summary',
-                    'salary': '.salary, .package',
-                    'link': '.job-title a, h2 a'
-                },
-                rate_limit=2.5
-            ),
-            'spane4all': ScrapingConfig(
-                name='Spane4All',
-                base_url='https://spane4all.co.za',
-                search_url='https://spane4all.co.za/jobs?search={query}&location={location}&page={page}',
-                selectors={
-                    'job_container': '.job-listing, .job-card',
-                    'title': '.job-title, h3',
-                    'company': '.company-name, .employer',
-                    'location': '.job-location, .location',
-                    'description': '.job-description, .summary',
-                    'salary': '.salary, .compensation',
-                    'link': '.job-title a, h3 a'
-                },
-                rate_limit=1.0
-            )
-        }
+        self.registry = registry or site_registry
+        self.cache = cache or page_cache
+        self.health = health or extraction_health
+        # Optional run ledger: resume_point(site) -> (page, jobs found) or None once the site
+        # is finished, and async page_done(site, page, jobs, last) after every parsed page
+        self.checkpoint = checkpoint
+        self._enabled_overrides: Dict[str, bool] = {}
+    
+    @property
+    def configs(self) -> Dict[str, ScrapingConfig]:
+        """Site configurations from the registry, reloaded when the file changes"""
+        return self.registry.sites()
+    
+    def _is_enabled(self, site: str) -> bool:
+        config = self.configs.get(site)
+        if config is None:
+            return False
+        return self._enabled_overrides.get(site, config.enabled)
     
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(
-            limit=50,
-            limit_per_host=10,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-            keepalive_timeout=30,
-            enable_cleanup_closed=True
-        )
-        
-        timeout = aiohttp.ClientTimeout(
-            total=30,
-            connect=10,
-            sock_read=15
-        )
-        
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={
-                'User-Agent': self.ua.random,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-        )
+        # The session, fetch budget and rate limits are shared with every other scraper in the process
+        self.scheduler = get_scheduler()
+        self.session = self.scheduler.get_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        # The shared session outlives this scraper; it is closed with the scheduler
+        self.session = None
     
-    def _generate_job_hash(self, job: JobResult) -> str:
+    def _generate_job_hash(self, job: JobResult) -> bytes:
         """Generate unique hash for deduplication"""
         key_string = f"{job.title.lower().strip()}|{job.company.lower().strip()}|{job.location.lower().strip()}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        # Raw digest: half the size of the hex string in the seen set
+        return hashlib.md5(key_string.encode()).digest()
     
     def _is_duplicate(self, job: JobResult) -> bool:
         """Check if job is duplicate"""
@@ -195,56 +151,150 @@ class UnifiedJobScraper:
         config = self.configs.get(site)
         if not config:
             return
+        await (self.scheduler or get_scheduler()).respect_rate_limit(site, config.rate_limit)
+    
+    async def _fetch_page(self, url: str, site: str, priority: Optional[int] = None) -> Optional[str]:
+        """Fetch a single page through the shared scheduler"""
+        config = self.configs.get(site)
+        scheduler = self.scheduler or get_scheduler()
         
-        last_request = self.rate_limits.get(site, 0)
-        time_since_last = time.time() - last_request
+        async def download() -> Optional[str]:
+            session = self.session or scheduler.get_session()
+            try:
+                async with session.get(url, headers={'User-Agent': random.choice(self.user_agents)}) as response:
+                    outcome["http.status_code"] = response.status
+                    if response.status == 200:
+                        content = await response.text()
+                        logger.info(f"Successfully fetched {site}: {url}")
+                        return content
+                    else:
+                        logger.warning(f"HTTP {response.status} for {site}: {url}")
+                        return None
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout fetching {site}: {url}")
+                outcome["scraper.timeout"] = True
+                return None
         
-        if time_since_last < config.rate_limit:
-            sleep_time = config.rate_limit - time_since_last
-            await asyncio.sleep(sleep_time)
+        # Filled in by download(); stays empty when a concurrent fetch of the same page is shared
+        outcome: Dict[str, Union[int, bool]] = {}
+        with span("scraper.fetch_page", **{"scraper.site": site, "http.url": url}) as current:
+            # Identical pages requested by concurrent scrapes are fetched once
+            html = await scheduler.fetch(
+                site, url, download,
+                priority=self.priority if priority is None else priority,
+                rate_limit=config.rate_limit if config else 0.0
+            )
+            if current is not None:
+                current.set_attributes({**outcome, "scraper.shared_fetch": not outcome, "scraper.bytes": len(html or "")})
+            return html
+    
+    async def _results_page(self, site: str, config: ScrapingConfig, query: str, location: str,
+                            page: int) -> Tuple[Optional[str], Optional[datetime]]:
+        """
+        A search result page, and when it was fetched if it came from the page cache
+
+        Jobs of a cached page were last seen on the board when it was fetched,
+        not now; see ``seen_on``.
+        """
+        url = config.page_url(query, location, page)
+        if not url:
+            return None, None
+        
+        key = self.cache.key(site, query, location, page)
+        html, stale = self.cache.lookup(key)
+        if html is not None:
+            fetched_at = datetime.utcnow() - timedelta(seconds=self.cache.age(key) or 0)
+            if stale:
+                self.cache.refresh(key, lambda: self._fetch_page(url, site, priority=BACKGROUND))
+            return html, fetched_at
         
-        self.rate_limits[site] = time.time()
+        html = await self._fetch_page(url, site)
+        if html:
+            self.cache.store(key, html)
+        return html, None
     
-    async def _fetch_page(self, url: str, site: str) -> Optional[str]:
-        """Fetch a single page with error handling"""
-        try:
-            await self._respect_rate_limit(site)
-            
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    logger.info(f"Successfully fetched {site}: {url}")
-                    return content
-                else:
-                    logger.warning(f"HTTP {response.status} for {site}: {url}")
-                    return None
-                    
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout fetching {site}: {url}")
-            return None
-        except Exception as e:
-            logger.error(f"Error fetching {site}: {url} - {str(e)}")
-            return None
+    @staticmethod
+    def seen_on(jobs: List[JobResult], fetched_at: Optional[datetime]) -> List[JobResult]:
+        """Stamp jobs parsed from a cached page with the time the page was fetched"""
+        if fetched_at is not None:
+            for job in jobs:
+                job.seen_at = fetched_at
+        return jobs
+    
+    @staticmethod
+    def _select_one(selectors: Dict, name: str, container):
+        """Optional selectors may be left out of a site configuration"""
+        selector = selectors.get(name)
+        return selector.select_one(container) if selector else None
     
     def _extract_jobs_from_html(self, html: str, config: ScrapingConfig) -> List[JobResult]:
         """Extract jobs from HTML using BeautifulSoup"""
-        jobs = []
+        return self._extract_page(html, config)[0]
+    
+    def _extract_page(self, html: str, config: ScrapingConfig) -> Tuple[List[JobResult], ExtractionSample]:
+        """Extract jobs with the first selector set that finds any, and describe how extraction went"""
+        with span("scraper.extract_jobs", **{"scraper.site": config.name, "scraper.bytes": len(html)}) as current:
+            jobs, sample = self._parse_page(html, config)
+            if current is not None:
+                current.set_attribute("scraper.jobs", sample.jobs)
+                current.set_attribute("scraper.containers", sample.containers)
+            return jobs, sample
+    
+    def _parse_page(self, html: str, config: ScrapingConfig) -> Tuple[List[JobResult], ExtractionSample]:
+        sample = ExtractionSample(containers=0, jobs=0, fields_filled=0, fields_total=0, nbytes=len(html))
         
         try:
             soup = BeautifulSoup(html, 'html.parser')
-            job_containers = soup.select(config.selectors['job_container'])
+        except Exception as e:
+            logger.error(f"Error parsing HTML for {config.name}: {str(e)}")
+            return [], sample
+        
+        for index, selectors in enumerate(config.selector_sets):
+            jobs, containers, filled = self._extract_with_selectors(soup, selectors, config)
+            if index == 0:
+                sample.containers = containers
+            if jobs:
+                if index > 0:
+                    logger.warning(f"Primary selectors found no jobs for {config.name}, fallback set {index} matched")
+                sample.containers = containers
+                sample.jobs = len(jobs)
+                sample.fields_filled = filled
+                sample.fields_total = len(jobs) * len(OPTIONAL_FIELDS)
+                sample.selector_set = index
+                return jobs, sample
+        
+        sample.no_results = self._says_no_results(soup, config)
+        return [], sample
+    
+    @staticmethod
+    def _says_no_results(soup: BeautifulSoup, config: ScrapingConfig) -> bool:
+        """Whether a page without jobs is the board saying the search matched nothing"""
+        selector = config.compiled.get("no_results")
+        if selector is not None:
+            return selector.select_one(soup) is not None
+        return bool(NO_RESULTS_TEXT.search(soup.get_text(" ")))
+    
+    def _extract_with_selectors(self, soup: BeautifulSoup, selectors: Dict,
+                                config: ScrapingConfig) -> Tuple[List[JobResult], int, int]:
+        """Jobs found with one selector set, the containers matched and the optional fields filled"""
+        jobs = []
+        job_containers = []
+        filled = 0
+        
+        try:
+            job_containers = selectors['job_container'].select(soup)
             
             logger.info(f"Found {len(job_containers)} job containers for {config.name}")
             
             for container in job_containers:
                 try:
                     # Extract job data
-                    title_elem = container.select_one(config.selectors['title'])
-                    company_elem = container.select_one(config.selectors['company'])
-                    location_elem = container.select_one(config.selectors['location'])
-                    description_elem = container.select_one(config.selectors['description'])
-                    salary_elem = container.select_one(config.selectors['salary'])
-                    link_elem = container.select_one(config.selectors['link'])
+                    title_elem = selectors['title'].select_one(container)
+                    company_elem = selectors['company'].select_one(container)
+                    location_elem = self._select_one(selectors, 'location', container)
+                    description_elem = self._select_one(selectors, 'description', container)
+                    salary_elem = self._select_one(selectors, 'salary', container)
+                    link_elem = self._select_one(selectors, 'link', container)
                     
                     # Skip if missing essential data
                     if not title_elem or not company_elem:
@@ -278,9 +328,14 @@ class UnifiedJobScraper:
                         date_posted=datetime.now()
                     )
                     
-                    # Check for duplicates
-                    if not self._is_duplicate(job):
-                        jobs.append(job)
+                    # Site-specific detail parsing may refine or drop the job
+                    if config.detail_hook:
+                        job = config.detail_hook(container, job)
+                        if job is None:
+                            continue
+                    
+                    jobs.append(job)
+                    filled += sum(1 for elem in (location_elem, description_elem, salary_elem) if elem) + bool(link)
                     
                 except Exception as e:
                     logger.warning(f"Error extracting job from {config.name}: {str(e)}")
@@ -289,44 +344,73 @@ class UnifiedJobScraper:
         except Exception as e:
             logger.error(f"Error parsing HTML for {config.name}: {str(e)}")
         
-        return jobs
+        return jobs, len(job_containers), filled
     
     async def _scrape_site(self, site: str, query: str, location: str, max_jobs: int = 20) -> List[JobResult]:
-        """Scrape a single job site"""
+        """Scrape a single job site through its adapter or the generic HTML page loop"""
         config = self.configs.get(site)
-        if not config or not config.enabled:
+        if config is None or not self._is_enabled(site):
             logger.warning(f"Site {site} not configured or disabled")
             return []
         
-        jobs = []
-        page = 0
-        start = 0
+        # A resumed run skips the sites it already finished
+        start = self.checkpoint.resume_point(site) if self.checkpoint else (0, 0)
+        if start is None:
+            logger.info(f"Skipping {config.name}, already completed in this run")
+            return []
         
         logger.info(f"Starting to scrape {config.name} for '{query}' in '{location}'")
         
-        while len(jobs) < max_jobs and page < config.max_pages:
-            # Build URL
-            if '{start}' in config.search_url:
-                url = config.search_url.format(
-                    query=quote_plus(query),
-                    location=quote_plus(location),
-                    start=start
-                )
-                start += 10  # Indeed-style pagination
-            else:
-                url = config.search_url.format(
-                    query=quote_plus(query),
-                    location=quote_plus(location),
-                    page=page + 1
-                )
-            
-            # Fetch page
-            html = await self._fetch_page(url, site)
+        if config.adapter:
+            jobs = await config.adapter.scrape(self, site, config, query, location, max_jobs)
+            # Adapters that do not page through _scrape_pages are checkpointed as a single page
+            if self.checkpoint and jobs and self.checkpoint.resume_point(site) == start:
+                await self.checkpoint.page_done(site, start[0], jobs, True)
+        else:
+            jobs = await self._scrape_pages(site, config, query, location, max_jobs)
+        
+        # Deduplicate across every site of this scraper
+        jobs = [job for job in jobs if not self._is_duplicate(job)]
+        
+        logger.info(f"Total scraped from {config.name}: {len(jobs)} jobs")
+        return jobs[:max_jobs]
+    
+    async def _scrape_pages(self, site: str, config: ScrapingConfig, query: str, location: str,
+                            max_jobs: int) -> List[JobResult]:
+        """
+        Fetch and parse result pages until enough jobs are found or the pages run out.
+        
+        With a checkpoint, the loop starts after the last page the run completed
+        and hands every page's jobs to the checkpoint as soon as it is parsed.
+        """
+        jobs = []
+        page, found = 0, 0
+        if self.checkpoint:
+            resume = self.checkpoint.resume_point(site)
+            if resume is None:
+                return []
+            page, found = resume
+        
+        while found + len(jobs) < max_jobs and page < config.max_pages:
+            # Fetch page ({page} or Indeed-style {start} offsets, unless the site has a hook)
+            html, fetched_at = await self._results_page(site, config, query, location, page)
             if not html:
+                # Not checkpointed, so a resumed run fetches this page again
                 break
             
-            # Extract jobs
-            page_jobs = self._extract_jobs_from_html(html, config)
+            # Extract jobs, trying the fallback selector sets if the primary ones find none
+            page_jobs, sample = self._extract_page(html, config)
+            self.seen_on(page_jobs, fetched_at)
+            if fetched_at is None:
+                # A cached page was recorded when it was fetched; counting it again skews the health
+                self.health.record(site, sample, first_page=page == 0)
+            if self.checkpoint:
+                last = (
+                    not page_jobs
+                    or found + len(jobs) + len(page_jobs) >= max_jobs
+                    or page + 1 >= config.max_pages
+                )
+                await self.checkpoint.page_done(site, page, page_jobs, last)
             if not page_jobs:
                 logger.info(f"No more jobs found on page {page + 1} for {config.name}")
                 break
@@ -336,19 +420,33 @@ class UnifiedJobScraper:
             
             logger.info(f"Scraped {len(page_jobs)} jobs from {config.name} page {page}")
         
-        logger.info(f"Total scraped from {config.name}: {len(jobs)} jobs")
-        return jobs[:max_jobs]
+        return jobs
+    
+    def _rank_jobs(self, jobs: List[JobResult], query: str, keywords: Optional[List[str]] = None) -> List[JobResult]:
+        """Score the whole batch with BM25 and order it by relevance, newest first on ties"""
+        ranking_query = " ".join([query, *(keywords or [])])
+        scores = BM25Scorer().score(ranking_query, [job_tokens(job.title, job.description) for job in jobs])
+        for job, score in zip(jobs, scores):
+            job.relevance_score = round(float(score), 4)
+        return sorted(
+            jobs,
+            key=lambda job: (job.relevance_score, job.date_posted or datetime.min),
+            reverse=True
+        )
     
-    async def scrape_all_sites(self, query: str, location: str = "South Africa", max_jobs_per_site: int = 10) -> List[Dict]:
-        """Scrape all enabled job sites concurrently with mock data fallback"""
+    async def scrape_all_sites(self, query: str, location: str = "South Africa", max_jobs_per_site: int = 10,
+                               keywords: Optional[List[str]] = None, as_dicts: bool = True) -> List:
+        """
+        Scrape all enabled job sites concurrently and rank the combined results
+
+        ``as_dicts=False`` returns the JobResults themselves, for callers that
+        persist them rather than return them from the API.
+        """
         logger.info(f"Starting unified scraping for '{query}' in '{location}'")
 
         # Create scraping tasks
-        tasks = []
-        for site in self.configs.keys():
-            if self.configs[site].enabled:
-                task = self._scrape_site(site, query, location, max_jobs_per_site)
-                tasks.append(task)
+        sites = self.sites_due()
+        tasks = [self._scrape_site(site, query, location, max_jobs_per_site) for site in sites]
 
         # Execute all tasks concurrently
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -359,7 +457,7 @@ class UnifiedJobScraper:
 
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                site = list(self.configs.keys())[i]
+                site = sites[i]
                 logger.error(f"Error scraping {site}: {str(result)}")
             else:
                 all_jobs.extend(result)
@@ -371,42 +469,52 @@ class UnifiedJobScraper:
             logger.info("No jobs found from scraping")
             return []
 
-        # Convert to dictionaries and sort by date
-        job_dicts = [job.to_dict() for job in all_jobs]
-        job_dicts.sort(key=lambda x: x.get('date_posted', ''), reverse=True)
+        # Rank by relevance to the query and keywords
+        ranked = self._rank_jobs(all_jobs, query, keywords)
 
-        logger.info(f"Unified scraping completed: {len(job_dicts)} total jobs found from {successful_scrapes} sites")
-        return job_dicts
+        logger.info(f"Unified scraping completed: {len(ranked)} total jobs found from {successful_scrapes} sites")
+        return [job.to_dict() for job in ranked] if as_dicts else ranked
     
-    async def scrape_single_site(self, site: str, query: str, location: str = "South Africa", max_jobs: int = 20) -> List[Dict]:
+    async def scrape_single_site(self, site: str, query: str, location: str = "South Africa", max_jobs: int = 20,
+                                 keywords: Optional[List[str]] = None) -> List[Dict]:
         """Scrape a single specific site"""
         jobs = await self._scrape_site(site, query, location, max_jobs)
-        return [job.to_dict() for job in jobs]
+        return [job.to_dict() for job in self._rank_jobs(jobs, query, keywords)]
     
     def get_available_sites(self) -> List[str]:
         """Get list of available job sites"""
-        return [site for site, config in self.configs.items() if config.enabled]
+        return [site for site in self.configs if self._is_enabled(site)]
+    
+    def sites_due(self) -> List[str]:
+        """Available sites, minus those demoted for poor extraction that are still backing off"""
+        sites = self.get_available_sites()
+        demoted = [site for site in sites if not self.health.should_fetch(site)]
+        if demoted:
+            logger.info(f"Skipping demoted sites: {', '.join(demoted)}")
+        return [site for site in sites if site not in demoted]
     
     def enable_site(self, site: str):
-        """Enable a job site"""
+        """Enable a job site for this scraper"""
         if site in self.configs:
-            self.configs[site].enabled = True
+            self._enabled_overrides[site] = True
     
     def disable_site(self, site: str):
-        """Disable a job site"""
+        """Disable a job site for this scraper"""
         if site in self.configs:
-            self.configs[site].enabled = False
+            self._enabled_overrides[site] = False
 
 # Convenience functions for backward compatibility
-async def scrape_jobs_unified(query: str, location: str = "South Africa", max_jobs: int = 50) -> List[Dict]:
+async def scrape_jobs_unified(query: str, location: str = "South Africa", max_jobs: int = 50,
+                              keywords: Optional[List[str]] = None, priority: int = INTERACTIVE) -> List[Dict]:
     """Main scraping function - scrapes all sites"""
-    async with UnifiedJobScraper() as scraper:
-        return await scraper.scrape_all_sites(query, location, max_jobs // 4)  # Distribute across sites
+    async with UnifiedJobScraper(priority=priority) as scraper:
+        return await scraper.scrape_all_sites(query, location, max_jobs // 4, keywords)  # Distribute across sites
 
-async def scrape_jobs_single_site(site: str, query: str, location: str = "South Africa", max_jobs: int = 20) -> List[Dict]:
+async def scrape_jobs_single_site(site: str, query: str, location: str = "South Africa", max_jobs: int = 20,
+                                  keywords: Optional[List[str]] = None, priority: int = INTERACTIVE) -> List[Dict]:
     """Scrape a single site"""
-    async with UnifiedJobScraper() as scraper:
-        return await scraper.scrape_single_site(site, query, location, max_jobs)
+    async with UnifiedJobScraper(priority=priority) as scraper:
+        return await scraper.scrape_single_site(site, query, location, max_jobs, keywords)
 
 # Test function
 async def test_scraper():
@@ -418,4 +526,4 @@ async def test_scraper():
             print(f"- {job['title']} at {job['company']} ({job['source']})")
 
 if __name__ == "__main__":
-    asyncio.run(test_scraper())
+    run_scrape(test_scraper())
@@ -0,0 +1,52 @@
+"""
+Bulk load a job dump into the database
+
+Reads an NDJSON, CSV or Parquet file and persists it with the same
+normalization and dedup as scraped jobs (see ``app.services.job_import``),
+then prints the counts and the throughput.
+
+Usage (from the backend directory)::
+
+    python -m scripts.import_jobs jobs.ndjson [--format csv] [--chunk-size 5000] [--json]
+"""
+
+import argparse
+import json
+import sys
+
+from app.core.database import SessionLocal
+from app.services.job_import import FORMATS, detect_format, import_jobs, read_records
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Records written per chunk")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error(f"cannot tell the format of {args.path}, pass --format")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = import_jobs(db, read_records(stream, fmt), chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(
+            f"{report['rows']} rows in {report['seconds']:.1f}s ({report['rows_per_second']} rows/s): "
+            f"{report['saved']} new, {report['updated']} updated, {report['unchanged']} unchanged, "
+            f"{report['rejected']} rejected"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
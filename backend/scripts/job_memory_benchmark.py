@@ -0,0 +1,113 @@
+"""
+Memory held per scraped job in the scraper pipeline
+
+Builds the same synthetic listings two ways under ``tracemalloc`` and reports
+bytes and live allocations per job:
+
+* ``dicts`` - the previous pipeline: plain dataclass results plus the dict
+  copy ``to_dict`` made of each for persistence
+* ``records`` - slotted ``JobResult`` objects handed straight to ``persist_jobs``
+
+Usage (from the backend directory)::
+
+    python -m scripts.job_memory_benchmark [--jobs 20000] [--json]
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from scraper.unified_scraper import JobResult
+
+
+@dataclass
+class UnslottedJobResult:
+    """``JobResult`` as it was before it was slotted"""
+    title: str
+    company: str
+    location: str
+    description: str
+    salary: Optional[str] = None
+    job_type: Optional[str] = None
+    experience_level: Optional[str] = None
+    date_posted: Optional[datetime] = None
+    link: str = ""
+    source: str = ""
+    relevance_score: Optional[float] = None
+
+
+def listing(n: int) -> Dict:
+    """Freshly allocated strings, as a parser produces them"""
+    return {
+        "title": f"Python Developer {n}",
+        "company": "".join(["Company ", str(n % 200)]),
+        "location": "".join(["Cape Town, ", "Western Cape"]),
+        "description": f"Build payments APIs for team {n}. " * 6,
+        "salary": "".join(["R400,000 - R", str(600 + n % 10), ",000"]),
+        "link": f"https://www.example.co.za/jobs/{n}",
+        "source": "PNet",
+        "date_posted": datetime(2026, 1, 5),
+    }
+
+
+def dict_pipeline(count: int) -> List:
+    results = [UnslottedJobResult(**listing(n)) for n in range(count)]
+    return [results, [JobResult.to_dict(result) for result in results]]
+
+
+def record_pipeline(count: int) -> List:
+    return [JobResult(**listing(n)) for n in range(count)]
+
+
+def measure(build: Callable[[int], List], count: int) -> Dict:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        held = build(count)
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename")) - blocks_before
+    finally:
+        tracemalloc.stop()
+    del held
+    size = current - before
+    return {
+        "bytes_per_job": round(size / count),
+        "allocations_per_job": round(blocks / count, 1),
+        "jobs_per_mb": round(count / (size / 2 ** 20)),
+        "peak_mb": round((peak - before) / 2 ** 20, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = {
+        "jobs": args.jobs,
+        "dicts": measure(dict_pipeline, args.jobs),
+        "records": measure(record_pipeline, args.jobs),
+    }
+    report["jobs_per_mb_ratio"] = round(report["records"]["jobs_per_mb"] / report["dicts"]["jobs_per_mb"], 2)
+
+    if args.json:
+        print(json.dumps(report))
+        return 0
+    for name in ("dicts", "records"):
+        result = report[name]
+        print(
+            f"{name:8} {result['bytes_per_job']:6} B/job  {result['allocations_per_job']:5} allocations/job  "
+            f"{result['jobs_per_mb']:6} jobs/MB  peak {result['peak_mb']} MB"
+        )
+    print(f"records hold {report['jobs_per_mb_ratio']}x as many jobs per MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Rebuild the CV matching vectors from the jobs table
+
+Re-vectorizes every active job into ``MATCH_INDEX_DIR``. Run it after changing
+``MATCH_VECTOR_DIM``, or when the vector files were lost or have drifted from
+the database (e.g. after restoring a backup).
+
+Usage (from the backend directory)::
+
+    python -m scripts.rebuild_job_vectors
+"""
+
+import argparse
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.services.job_vectors import rebuild_job_vectors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        indexed = rebuild_job_vectors(db)
+    finally:
+        db.close()
+
+    print(f"Indexed {indexed} jobs in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
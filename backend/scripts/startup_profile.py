@@ -0,0 +1,103 @@
+"""
+Import-time profile of the API process
+
+Imports ``app.main`` in a fresh interpreter under ``python -X importtime`` and
+reports the total import time and the top-level packages that account for
+most of it. The scraper stack (aiohttp, BeautifulSoup, soupsieve) belongs in
+workers and is only loaded by the API once a scrape is requested, and numpy
+and scipy only once jobs are ranked, matched or faceted, so they are flagged
+if they show up.
+
+Usage (from the backend directory)::
+
+    python scripts/startup_profile.py [--top 15] [--budget 1.0] [--json profile.json]
+
+Exits non-zero when the import time exceeds ``--budget`` seconds or a
+forbidden module was imported, so CI can track startup time.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = (
+    "aiohttp",
+    "bs4",
+    "soupsieve",
+    "fake_useragent",
+    "scraper.unified_scraper",
+    "numpy",
+    "scipy",
+)
+
+
+def profile_imports(module: str = "app.main") -> List[Tuple[str, int, int]]:
+    """(module, self microseconds, cumulative microseconds) for every import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def summarize(imports: List[Tuple[str, int, int]], top: int) -> Dict:
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in imports:
+        by_package[name.split(".")[0]] += self_us
+    names = {name for name, _, _ in imports}
+    return {
+        "total_seconds": round(sum(self_us for _, self_us, _ in imports) / 1e6, 3),
+        "modules": len(imports),
+        "packages": [
+            {"package": package, "seconds": round(us / 1e6, 3)}
+            for package, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "forbidden": [module for module in FORBIDDEN if module in names],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=None, help="Fail above this many seconds")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = summarize(profile_imports(args.module), args.top)
+
+    print(f"import {args.module}: {report['total_seconds']:.3f}s across {report['modules']} modules")
+    for entry in report["packages"]:
+        print(f"  {entry['seconds']:8.3f}s  {entry['package']}")
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    failed = False
+    if report["forbidden"]:
+        print(f"Imported at startup but only needed by workers: {', '.join(report['forbidden'])}")
+        failed = True
+    if args.budget is not None and report["total_seconds"] > args.budget:
+        print(f"Import time {report['total_seconds']:.3f}s is over the {args.budget:.3f}s budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Summarize spans written by the file trace exporter
+
+Reads ``TRACING_FILE`` (``TRACING_EXPORTER=file``) and prints, for the slowest
+traces, the span tree with durations and the critical path: starting at the
+root, the child that finished last is the one the parent waited for. A
+totals table shows where time went across all traces by span name (self
+time, i.e. not covered by child spans), e.g. ``scraper.rate_limit_wait``
+against ``scraper.fetch_page`` against ``scrape_run.persist_page``.
+
+Usage (from the backend directory)::
+
+    python -m scripts.trace_report [traces.jsonl] [--traces 3] [--trace TRACE_ID]
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import get_config
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def load_spans(path: str) -> List[Dict]:
+    spans = []
+    with open(path) as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            raw = json.loads(line)
+            spans.append({
+                "name": raw["name"],
+                "trace_id": raw["context"]["trace_id"],
+                "span_id": raw["context"]["span_id"],
+                "parent_id": raw.get("parent_id"),
+                "start": _timestamp(raw["start_time"]),
+                "end": _timestamp(raw["end_time"]),
+                "service": raw.get("resource", {}).get("attributes", {}).get("service.name"),
+                "attributes": raw.get("attributes", {}),
+            })
+    return spans
+
+
+def _covered(intervals: List[tuple]) -> float:
+    """Length of the union of (start, end) intervals"""
+    total, reach = 0.0, None
+    for start, end in sorted(intervals):
+        if reach is None or start > reach:
+            total += end - start
+            reach = end
+        elif end > reach:
+            total += end - reach
+            reach = end
+    return total
+
+
+def self_times(spans: List[Dict]) -> Dict[str, float]:
+    children = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"]].append(span)
+    totals: Dict[str, float] = defaultdict(float)
+    for span in spans:
+        covered = _covered([(child["start"], child["end"]) for child in children[span["span_id"]]])
+        totals[span["name"]] += max(span["end"] - span["start"] - covered, 0.0)
+    return totals
+
+
+def critical_path(root: Dict, children: Dict[str, List[Dict]]) -> List[Dict]:
+    path = [root]
+    while children.get(path[-1]["span_id"]):
+        path.append(max(children[path[-1]["span_id"]], key=lambda span: span["end"]))
+    return path
+
+
+def _label(span: Dict) -> str:
+    attributes = span["attributes"]
+    details = [
+        str(attributes[key])
+        for key in ("http.route", "scraper.site", "http.status_code", "celery.task_name", "db.statement")
+        if key in attributes
+    ]
+    detail = f" [{', '.join(details)[:80]}]" if details else ""
+    return f"{(span['end'] - span['start']) * 1000:9.1f} ms  {span['name']}{detail}"
+
+
+def print_trace(trace_spans: List[Dict]) -> None:
+    ids = {span["span_id"] for span in trace_spans}
+    children = defaultdict(list)
+    roots = []
+    for span in sorted(trace_spans, key=lambda span: span["start"]):
+        if span["parent_id"] in ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+
+    def walk(span: Dict, depth: int) -> None:
+        print("  " * depth + _label(span))
+        for child in children[span["span_id"]]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        print(f"trace {root['trace_id']} ({root['service']})")
+        walk(root, 1)
+        print("  critical path: " + " > ".join(span["name"] for span in critical_path(root, children)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", default=get_config().TRACING_FILE)
+    parser.add_argument("--traces", type=int, default=3, help="Show this many of the slowest traces")
+    parser.add_argument("--trace", default=None, help="Show only this trace id")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    if not spans:
+        print(f"No spans in {args.path}")
+        return 1
+
+    by_trace: Dict[str, List[Dict]] = defaultdict(list)
+    for span in spans:
+        by_trace[span["trace_id"]].append(span)
+
+    selected: List[Optional[str]]
+    if args.trace:
+        wanted = args.trace if args.trace.startswith("0x") else f"0x{args.trace}"
+        selected = [wanted] if wanted in by_trace else []
+    else:
+        duration = {
+            trace_id: max(span["end"] for span in items) - min(span["start"] for span in items)
+            for trace_id, items in by_trace.items()
+        }
+        selected = sorted(duration, key=duration.get, reverse=True)[: args.traces]
+    for trace_id in selected:
+        print_trace(by_trace[trace_id])
+        print()
+
+    print(f"Self time by span over {len(by_trace)} traces:")
+    for name, seconds in sorted(self_times(spans).items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"  {seconds:9.3f} s  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+# Keep the job vector store of the test run out of the working tree
+os.environ.setdefault("MATCH_INDEX_DIR", tempfile.mkdtemp(prefix="dive-vectors-"))
+# Rate limit buckets per test, not in a Redis that may be running locally
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+
+
+@pytest.fixture(autouse=True)
+def reset_scraper_state():
+    """Scraped pages and extraction health must not leak from one test into another"""
+    from scraper.cache import page_cache
+    from scraper.health import extraction_health
+
+    page_cache.clear()
+    extraction_health.clear()
+    yield
+    page_cache.clear()
+    extraction_health.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    from app.core.rate_limit import rate_limiter
+
+    rate_limiter.memory.clear()
+    yield
+    rate_limiter.memory.clear()
+
+
+@pytest.fixture
+def db_session():
+    """Fresh in-memory SQLite database per test"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db_session):
+    """Test client whose requests share the in-memory database"""
+    from fastapi.testclient import TestClient
+
+    from app.core.database import get_db, get_read_db, get_read_sessions
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
+    app.dependency_overrides[get_read_sessions] = lambda: sessionmaker(bind=db_session.get_bind())
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def user(db_session):
+    from app.models.user import User
+
+    user = User(email="jobseeker@example.com", full_name="Job Seeker", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Bearer token headers for ``user``"""
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
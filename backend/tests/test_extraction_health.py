@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+from config import get_config
+from scraper.health import ExtractionHealth, ExtractionSample, extraction_health
+from scraper.registry import SiteRegistry
+from scraper.unified_scraper import UnifiedJobScraper
+from tests.test_site_registry import SITE
+
+OLD_MARKUP = """
+<div class="job"><h2 class="title"><a href="/jobs/1">Python Developer</a></h2>
+  <span class="company">Yoco</span><span class="location">Cape Town</span></div>
+"""
+NEW_MARKUP = """
+<article class="card"><h3><a href="/jobs/1">Python Developer</a></h3>
+  <span class="company">Yoco</span></article>
+"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BoardScraper(UnifiedJobScraper):
+    def __init__(self, registry, html, health):
+        super().__init__(registry=registry, health=health)
+        self.html = html
+        self.fetched = 0
+
+    async def _fetch_page(self, url, site, priority=None):
+        self.fetched += 1
+        return self.html
+
+
+def registry(tmp_path, **overrides):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps({"board": {**SITE, "rate_limit": 0, "max_pages": 1, **overrides}}))
+    return SiteRegistry(str(path))
+
+
+def test_fallback_selector_sets_are_tried_in_order(tmp_path):
+    fallbacks = [{"job_container": "section.job"}, {"job_container": "article.card", "title": "h3", "link": "h3 a"}]
+    health = ExtractionHealth()
+    scraper = BoardScraper(registry(tmp_path, fallback_selectors=fallbacks), NEW_MARKUP, health)
+
+    jobs = asyncio.run(scraper._scrape_site("board", "python", "cape town", 5))
+
+    assert [(job.title, job.link) for job in jobs] == [("Python Developer", "https://board.example/jobs/1")]
+    stats = health.snapshot()["board"]
+    assert (stats["last_selector_set"], stats["fallback_pages"], stats["jobs"]) == (2, 1, 1)
+    # Link filled, location, description and salary missing
+    assert stats["fill_ratio"] == 0.25
+
+
+def test_invalid_fallback_set_skips_the_site(tmp_path):
+    assert registry(tmp_path, fallback_selectors=[{"title": ""}]).sites() == {}
+
+
+def test_collapsed_site_is_demoted_then_restored_by_a_probe(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config(), "SCRAPER_HEALTH_EMPTY_PAGES", 2)
+    monkeypatch.setattr(get_config(), "SCRAPER_DEMOTION_HOURS", 1)
+    clock = Clock()
+    health = ExtractionHealth(clock=clock)
+    scraper = BoardScraper(registry(tmp_path), NEW_MARKUP, health)
+
+    for query in ("python", "java"):
+        scraper.cache.clear()
+        asyncio.run(scraper.scrape_all_sites(query, "cape town", 5))
+    assert health.snapshot()["board"]["demoted"] is True
+    assert scraper.sites_due() == []
+
+    # Skipped while backing off
+    asyncio.run(scraper.scrape_all_sites("go", "cape town", 5))
+    assert scraper.fetched == 2
+
+    # A probe that still finds nothing doubles the back-off
+    clock.now += 3600
+    asyncio.run(scraper.scrape_all_sites("go", "cape town", 5))
+    assert health.snapshot()["board"]["demotions"] == 2
+    clock.now += 3600
+    assert scraper.sites_due() == []
+
+    clock.now += 3600
+    scraper.html = OLD_MARKUP
+    jobs = asyncio.run(scraper.scrape_all_sites("rust", "cape town", 5))
+    assert len(jobs) == 1
+    assert (health.snapshot()["board"]["demoted"], scraper.sites_due()) == (False, ["board"])
+
+
+def test_cached_pages_and_empty_searches_are_not_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config(), "SCRAPER_HEALTH_EMPTY_PAGES", 2)
+    health = ExtractionHealth()
+    scraper = BoardScraper(registry(tmp_path, selectors={**SITE["selectors"], "no_results": ".empty"}), OLD_MARKUP, health)
+
+    for _ in range(3):
+        asyncio.run(scraper.scrape_all_sites("python", "cape town", 5))
+        scraper.seen_jobs.clear()
+    assert (scraper.fetched, health.snapshot()["board"]["pages"]) == (1, 1)
+
+    scraper.html = '<p class="empty">Nothing matched</p>'
+    for query in ("cobol", "fortran", "ada"):
+        asyncio.run(scraper.scrape_all_sites(query, "cape town", 5))
+    board = health.snapshot()["board"]
+    assert (board["pages"], board["empty_first_pages"], board["demoted"]) == (4, 0, False)
+
+    # Without the selector the board's wording is recognized
+    health.clear()
+    scraper = BoardScraper(registry(tmp_path), "<p>No jobs found for your search</p>", health)
+    for query in ("pascal", "basic"):
+        asyncio.run(scraper.scrape_all_sites(query, "cape town", 5))
+    assert health.snapshot()["board"]["empty_first_pages"] == 0
+
+
+def test_yield_collapse_demotes_a_site(monkeypatch):
+    monkeypatch.setattr(get_config(), "SCRAPER_HEALTH_COLLAPSE_RATIO", 0.5)
+    health = ExtractionHealth()
+    for _ in range(10):
+        health.record("board", ExtractionSample(containers=20, jobs=20, fields_filled=80, fields_total=80, nbytes=10240), True)
+    assert health.should_fetch("board")
+
+    for _ in range(3):
+        health.record("board", ExtractionSample(containers=20, jobs=2, fields_filled=8, fields_total=8, nbytes=10240), True)
+
+    assert not health.should_fetch("board")
+
+
+def test_health_endpoint(client):
+    extraction_health.record("pnet", ExtractionSample(containers=0, jobs=0, fields_filled=0, fields_total=0, nbytes=512), True)
+
+    response = client.get("/api/scraper/health")
+
+    assert response.status_code == 200
+    assert response.json()["sites"]["pnet"]["empty_first_pages"] == 1
+    assert response.json()["sites"]["pnet"]["demoted"] is False
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from datetime import datetime
+
+from app.models.job import Job
+from app.services.job_enrichment import enrich_pending_jobs
+from app.services.job_ingest import persist_jobs
+from scraper.enrichment import parse_job_detail, parse_posted_date
+from scraper.registry import SiteRegistry
+from scraper.unified_scraper import UnifiedJobScraper
+from tests.test_job_ingest import scraped
+from tests.test_site_registry import SITE
+
+POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Python Developer",
+    "description": "<p>Build payments APIs.</p><ul><li>Django</li><li>PostgreSQL</li></ul>",
+    "datePosted": "2026-02-10T08:00:00Z",
+    "employmentType": "FULL_TIME",
+    "experienceRequirements": {"@type": "OccupationalExperienceRequirements", "monthsOfExperience": 72},
+}
+JSON_LD_PAGE = f'<script type="application/ld+json">{json.dumps(POSTING)}</script>'
+SELECTOR_PAGE = '<div class="body">Junior role in our <b>Durban</b> office</div><span class="when">3 days ago</span>'
+
+
+class FakeBoardScraper(UnifiedJobScraper):
+    def __init__(self, registry, pages):
+        super().__init__(registry=registry)
+        self.pages = pages
+        self.fetched = []
+
+    async def _fetch_page(self, url, site):
+        self.fetched.append(url)
+        return self.pages.get(url)
+
+
+def board_registry(tmp_path):
+    path = tmp_path / "sites.json"
+    site = {**SITE, "name": "PNet", "rate_limit": 0, "detail_selectors": {"description": ".body", "date_posted": ".when"}}
+    path.write_text(json.dumps({"board": site}))
+    return SiteRegistry(str(path))
+
+
+def test_parse_job_detail_prefers_json_ld_and_falls_back_to_selectors(tmp_path):
+    config = board_registry(tmp_path).get("board")
+
+    fields = parse_job_detail(JSON_LD_PAGE, config)
+    assert fields == {
+        "description": "Build payments APIs.\nDjango\nPostgreSQL",
+        "date_posted": datetime(2026, 2, 10, 8, 0),
+        "job_type": "Full-time",
+        "experience_level": "Senior",
+    }
+
+    fields = parse_job_detail(SELECTOR_PAGE, config, title="Support Engineer")
+    assert fields["description"] == "Junior role in our\nDurban\noffice"
+    assert fields["experience_level"] == "Entry"
+    assert (datetime.utcnow() - fields["date_posted"]).days == 3
+
+
+def test_parse_posted_date_formats():
+    now = datetime(2026, 3, 20, 15, 30)
+    assert parse_posted_date("Posted yesterday", now) == datetime(2026, 3, 19)
+    assert parse_posted_date("30+ days ago", now) == datetime(2026, 2, 18, 15, 30)
+    assert parse_posted_date("Posted 12 March 2026", now) == datetime(2026, 3, 12)
+    assert parse_posted_date("Competitive", now) is None
+
+
+def test_enrichment_is_resumable_and_skips_enriched_jobs(db_session, tmp_path):
+    persist_jobs(db_session, [scraped("https://a"), scraped("https://b"), scraped("https://c")])
+    db_session.commit()
+    scraper = FakeBoardScraper(board_registry(tmp_path), {"https://a": JSON_LD_PAGE, "https://b": SELECTOR_PAGE})
+
+    assert asyncio.run(enrich_pending_jobs(db_session, max_jobs=1, scraper=scraper)) == {"enriched": 1, "failed": 0}
+    assert asyncio.run(enrich_pending_jobs(db_session, scraper=scraper)) == {"enriched": 1, "failed": 1}
+    assert scraper.fetched == ["https://a", "https://b", "https://c"]
+
+    jobs = {job.link: job for job in db_session.query(Job)}
+    assert jobs["https://a"].job_type == "Full-time"
+    assert jobs["https://a"].description.startswith("Build payments APIs.")
+    assert jobs["https://b"].enriched_at is not None
+    assert jobs["https://c"].enriched_at is None
+
+    # A changed listing is queued for enrichment again
+    persist_jobs(db_session, [scraped("https://a", title="Python Engineer")])
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.query(Job).filter(Job.link == "https://a").one().enriched_at is None
+
+
+def test_failed_pages_back_off_and_are_given_up(db_session, tmp_path, monkeypatch):
+    from config import get_config
+
+    monkeypatch.setattr(get_config(), "ENRICHMENT_MAX_ATTEMPTS", 2)
+    persist_jobs(db_session, [scraped("https://dead")])
+    db_session.commit()
+    scraper = FakeBoardScraper(board_registry(tmp_path), {})
+
+    def enrich():
+        return asyncio.run(enrich_pending_jobs(db_session, scraper=scraper))
+
+    def age_failures():
+        db_session.query(Job).update({Job.enrich_failed_at: datetime(2026, 1, 1)})
+        db_session.commit()
+
+    assert enrich() == {"enriched": 0, "failed": 1}
+    # Inside the retry window the dead link is not fetched again
+    assert enrich() == {"enriched": 0, "failed": 0}
+    age_failures()
+    assert enrich() == {"enriched": 0, "failed": 1}
+    # Past the attempt limit it is left alone
+    age_failures()
+    assert enrich() == {"enriched": 0, "failed": 0}
+    assert scraper.fetched == ["https://dead", "https://dead"]
+
+    job = db_session.query(Job).one()
+    assert (job.enrich_attempts, job.enriched_at) == (2, None)
+
+    # A changed listing gets a fresh set of attempts
+    persist_jobs(db_session, [scraped("https://dead", title="Python Engineer")])
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.query(Job).one().enrich_attempts == 0
+
+
+def test_enriched_descriptions_replace_their_corpus_stats(db_session, tmp_path):
+    from app.services.relevance import ensure_corpus_stats
+    from scraper.ranking import corpus_stats
+
+    persist_jobs(db_session, [scraped("https://a", description="Short teaser")])
+    db_session.commit()
+    corpus_stats.reset()
+    ensure_corpus_stats(db_session)
+    scraper = FakeBoardScraper(board_registry(tmp_path), {"https://a": JSON_LD_PAGE})
+
+    asyncio.run(enrich_pending_jobs(db_session, scraper=scraper))
+
+    assert corpus_stats.n_docs == 1
+    assert "teaser" not in corpus_stats.doc_freq and corpus_stats.doc_freq["django"] == 1
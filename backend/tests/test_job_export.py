@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.services.job_export import COLUMN_NAMES
+from app.services.job_ingest import persist_jobs
+from config import get_config
+from tests.test_job_ingest import scraped
+
+
+@pytest.fixture
+def jobs(db_session, monkeypatch):
+    # Several batches, so chunks are encoded and streamed one batch at a time
+    monkeypatch.setattr(get_config(), "EXPORT_BATCH_SIZE", 2)
+    persist_jobs(
+        db_session,
+        [scraped(f"https://jobs/{n}", company="Yoco" if n % 2 else "Takealot") for n in range(5)],
+    )
+    db_session.commit()
+
+
+def test_csv_export_streams_every_matching_job(client, jobs):
+    response = client.get("/api/jobs/export")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["link"] for row in rows] == [f"https://jobs/{n}" for n in range(5)]
+    assert rows[0]["company"] == "Takealot"
+    assert rows[0]["date_posted"] == "2026-01-05T00:00:00"
+
+
+def test_ndjson_export_applies_list_filters(client, jobs):
+    response = client.get("/api/jobs/export", params={"format": "ndjson", "company": "Yoco"})
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["link"] for row in rows] == ["https://jobs/1", "https://jobs/3"]
+    assert rows[0]["salary_min"] == 400000
+
+
+def test_parquet_export_has_one_row_group_per_batch(client, jobs):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = client.get("/api/jobs/export", params={"format": "parquet"})
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("link").to_pylist() == [f"https://jobs/{n}" for n in range(5)]
+    assert table.schema.field("salary_max").type == "int64"
+
+
+def test_export_with_no_matches(client, jobs):
+    response = client.get("/api/jobs/export", params={"search": "astronaut"})
+
+    assert response.text.splitlines() == [",".join(COLUMN_NAMES)]
+    assert client.get("/api/jobs/export", params={"format": "ndjson", "search": "astronaut"}).text == ""
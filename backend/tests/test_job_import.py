@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+from app.models.job import Job
+from app.services.job_import import detect_format, import_jobs, read_records
+from app.services.job_ingest import _copy_field, persist_jobs
+from tests.test_job_ingest import scraped
+
+
+@pytest.fixture
+def admin_headers(auth_headers, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["jobseeker@example.com"])
+    return auth_headers
+
+
+def ndjson(*records):
+    return io.BytesIO("".join(json.dumps(record) + "\n" for record in records).encode())
+
+
+def test_import_dedups_against_existing_jobs_and_within_the_file(db_session):
+    persist_jobs(db_session, [scraped("https://a"), scraped("https://b")])
+    db_session.commit()
+
+    records = read_records(
+        ndjson(
+            scraped("https://a"),
+            scraped("https://c", title="  Data   Engineer "),
+            scraped("https://b", title="Senior Python Developer"),
+            # Imported by the previous chunk, updated by this one
+            scraped("https://c", title="Data Engineer", company="Takealot"),
+            scraped("https://d", company=""),
+        ),
+        "ndjson",
+    )
+    report = import_jobs(db_session, records, chunk_size=2)
+
+    assert {name: report[name] for name in ("rows", "rejected", "saved", "updated", "unchanged")} == {
+        "rows": 5, "rejected": 1, "saved": 1, "updated": 2, "unchanged": 1,
+    }
+    assert report["rows_per_second"] > 0
+    jobs = {job.link: job for job in db_session.query(Job)}
+    assert sorted(jobs) == ["https://a", "https://b", "https://c"]
+    assert (jobs["https://c"].title, jobs["https://c"].company) == ("Data Engineer", "Takealot")
+    assert jobs["https://c"].salary_min == 400000
+
+
+def test_csv_export_round_trips_through_import(client, db_session, admin_headers):
+    persist_jobs(db_session, [scraped(f"https://jobs/{n}") for n in range(3)])
+    db_session.commit()
+    dump = client.get("/api/jobs/export").content
+    db_session.query(Job).delete()
+    db_session.commit()
+
+    response = client.post(
+        "/api/jobs/import", files={"file": ("jobs.csv", dump, "text/csv")}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["saved"] == 3
+    assert db_session.query(Job).filter(Job.link == "https://jobs/1").one().company == "Yoco"
+
+
+def test_parquet_import(client, db_session, admin_headers):
+    pytest.importorskip("pyarrow.parquet")
+    persist_jobs(db_session, [scraped("https://a"), scraped("https://b")])
+    db_session.commit()
+    dump = client.get("/api/jobs/export", params={"format": "parquet"}).content
+
+    response = client.post("/api/jobs/import", files={"file": ("jobs.parquet", dump)}, headers=admin_headers)
+
+    assert response.json()["unchanged"] == 2
+
+
+def test_import_rejects_unknown_or_broken_files(client, db_session, admin_headers):
+    def post(name, content):
+        return client.post("/api/jobs/import", files={"file": (name, content)}, headers=admin_headers)
+
+    assert post("jobs.txt", b"x").status_code == 400
+    assert post("jobs.ndjson", b'{"title": "Dev"}\n{oops\n').status_code == 400
+    assert db_session.query(Job).count() == 0
+
+
+def test_import_is_admin_only(client, db_session, auth_headers):
+    dump = ndjson(scraped("https://a")).getvalue()
+    assert client.post("/api/jobs/import", files={"file": ("jobs.ndjson", dump)}).status_code == 401
+    response = client.post("/api/jobs/import", files={"file": ("jobs.ndjson", dump)}, headers=auth_headers)
+    assert response.status_code == 403
+    assert db_session.query(Job).count() == 0
+
+
+def test_detect_format_and_copy_encoding():
+    assert [detect_format(name) for name in ("a.JSONL", "b.csv", "c.parquet", "d")] == ["ndjson", "csv", "parquet", None]
+    assert _copy_field(None) == "\\N"
+    assert _copy_field("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
@@ -0,0 +1,172 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.job import Company, Job, JobChangeCounter, Source
+from app.services.job_changes import next_change_seq
+from app.services.job_ingest import persist_jobs
+
+
+def scraped(link, **overrides):
+    job = {
+        "title": "Python Developer",
+        "company": "Yoco",
+        "location": "Cape Town, Western Cape",
+        "description": "Build payments APIs",
+        "salary": "R400,000 - R600,000",
+        "date_posted": datetime(2026, 1, 5).isoformat(),
+        "link": link,
+        "source": "PNet",
+    }
+    job.update(overrides)
+    return job
+
+
+def test_persist_jobs_classifies_new_changed_and_unchanged(db_session):
+    persist_jobs(db_session, [scraped("https://a"), scraped("https://b")])
+    db_session.commit()
+    before = {job.link: job.updated_at for job in db_session.query(Job)}
+
+    counts = persist_jobs(
+        db_session,
+        [scraped("https://a"), scraped("https://b", salary="R700,000"), scraped("https://c")],
+    )
+    db_session.commit()
+    db_session.expire_all()
+
+    assert counts == {"saved": 1, "updated": 1, "unchanged": 1}
+    jobs = {job.link: job for job in db_session.query(Job)}
+    assert jobs["https://b"].salary == "R700,000"
+    assert jobs["https://a"].updated_at == before["https://a"]
+    assert jobs["https://a"].last_seen_at > before["https://a"]
+
+
+def test_persist_jobs_reactivates_expired_job(db_session):
+    persist_jobs(db_session, [scraped("https://a")])
+    db_session.query(Job).update({Job.is_active: False})
+    db_session.commit()
+
+    persist_jobs(db_session, [scraped("https://a")])
+    db_session.commit()
+
+    assert db_session.query(Job).one().is_active is True
+
+
+def test_persist_jobs_marks_cached_jobs_seen_when_their_page_was_fetched(db_session):
+    fetched_at = datetime(2026, 1, 6, 8, 0)
+    persist_jobs(db_session, [scraped("https://a", seen_at=fetched_at.isoformat())])
+    db_session.commit()
+    assert db_session.query(Job).one().last_seen_at == fetched_at
+
+    persist_jobs(db_session, [scraped("https://a")])
+    db_session.commit()
+    seen = db_session.query(Job).one().last_seen_at
+    assert seen > fetched_at
+
+    # An older cached copy of the page does not move it backwards
+    persist_jobs(db_session, [scraped("https://a", seen_at=fetched_at.isoformat())])
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.query(Job).one().last_seen_at == seen
+
+
+def test_job_changes_feed_pages_through_updates(client, db_session):
+    persist_jobs(db_session, [scraped(f"https://job/{i}") for i in range(3)])
+    db_session.commit()
+
+    first = client.get("/api/jobs/changes", params={"limit": 2}).json()
+    assert len(first["changes"]) == 2
+    assert first["has_more"] is True
+
+    rest = client.get(
+        "/api/jobs/changes",
+        params={"since": first["next_since"], "after_id": first["next_after_id"]},
+    ).json()
+    assert [job["link"] for job in rest["changes"]] == ["https://job/2"]
+
+    # A later transaction gets a later change number, whatever its timestamps
+    persist_jobs(db_session, [scraped("https://job/0", salary="R900,000"), scraped("https://job/1")])
+    db_session.commit()
+
+    latest = client.get(
+        "/api/jobs/changes",
+        params={"since": rest["next_since"], "after_id": rest["next_after_id"]},
+    ).json()
+    assert [job["link"] for job in latest["changes"]] == ["https://job/0"]
+    assert latest["next_since"] == rest["next_since"] + 1
+
+
+def test_change_counter_is_seeded_with_the_table(db_session):
+    assert next_change_seq(db_session) == 1
+    assert next_change_seq(db_session) == 2
+
+    db_session.query(JobChangeCounter).delete()
+    with pytest.raises(RuntimeError):
+        next_change_seq(db_session)
+    db_session.rollback()
+
+
+def test_persist_jobs_canonicalizes_companies_locations_and_sources(db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", company="Yoco (Pty) Ltd", location="Sandton, Gauteng"),
+            scraped("https://b", company="  yoco ", location="johannesburg"),
+        ],
+    )
+    db_session.commit()
+
+    assert db_session.query(Company).count() == 1
+    assert db_session.query(Source).count() == 1
+    jobs = {job.link: job for job in db_session.query(Job)}
+    assert jobs["https://a"].province == "Gauteng"
+    assert jobs["https://b"].location == "Johannesburg, Gauteng"
+
+
+def test_persist_jobs_files_blank_companies_under_unknown(db_session):
+    counts = persist_jobs(
+        db_session,
+        [
+            scraped("https://a", company=""),
+            scraped("https://b", company=None),
+            scraped("https://c", company="   "),
+            scraped("https://d"),
+        ],
+    )
+    db_session.commit()
+
+    assert counts["saved"] == 4
+    companies = {job.link: job.company for job in db_session.query(Job)}
+    assert companies == {"https://a": "Unknown", "https://b": "Unknown", "https://c": "Unknown", "https://d": "Yoco"}
+
+
+def test_job_filters_and_stats_use_lookup_tables(client, db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", company="Yoco"),
+            scraped("https://b", company="Takealot", location="Durban"),
+            scraped("https://c", company="Takealot", source="Careers24"),
+        ],
+    )
+    db_session.commit()
+
+    jobs = client.get("/api/jobs", params={"location": "KwaZulu"}).json()
+    assert [job["link"] for job in jobs] == ["https://b"]
+    assert len(client.get("/api/jobs", params={"source": "careers24"}).json()) == 1
+
+    stats = client.get("/api/stats").json()
+    assert stats["jobs_per_company"][0] == {"company": "Takealot", "count": 2}
+
+
+def test_persist_jobs_takes_scraper_records_directly(db_session):
+    from scraper.unified_scraper import JobResult
+
+    record = JobResult(**{**scraped("https://a"), "date_posted": datetime(2026, 1, 5)})
+    assert not hasattr(record, "__dict__")
+
+    assert persist_jobs(db_session, [record])["saved"] == 1
+    # Same content hash whichever way the job arrives
+    assert persist_jobs(db_session, [scraped("https://a")])["unchanged"] == 1
+    job = db_session.query(Job).one()
+    assert (job.company, job.date_posted, job.salary_min) == ("Yoco", datetime(2026, 1, 5), 400000)
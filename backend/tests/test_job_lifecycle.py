@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+from app.models.job import Company, Job, JobArchive, Source
+from app.services import job_lifecycle
+from app.services.job_dimensions import resolve_ids
+
+
+def make_job(db, link, **kwargs):
+    company_id = resolve_ids(db, Company, ["Yoco"])["Yoco"]
+    source_id = resolve_ids(db, Source, ["PNet"])["PNet"]
+    job = Job(title="Python Developer", company_id=company_id, link=link, source_id=source_id, **kwargs)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_expire_jobs_past_deadline_or_unseen(db_session):
+    now = datetime.utcnow()
+    make_job(db_session, "https://a", application_deadline=now - timedelta(days=1))
+    make_job(db_session, "https://b", created_at=now - timedelta(days=45))
+    make_job(db_session, "https://c", application_deadline=now + timedelta(days=5))
+
+    expired = job_lifecycle.expire_jobs(db_session, now=now, max_age_days=30)
+
+    assert expired == 2
+    active = [job.link for job in db_session.query(Job).filter(Job.is_active == True)]
+    assert active == ["https://c"]
+
+
+def test_archive_moves_inactive_jobs_in_batches(db_session):
+    for i in range(5):
+        make_job(db_session, f"https://old/{i}", is_active=False)
+    make_job(db_session, "https://live")
+
+    archived = job_lifecycle.archive_inactive_jobs(
+        db_session, batch_size=2, now=datetime.utcnow() + timedelta(hours=1), grace_hours=0
+    )
+
+    assert archived == 5
+    assert [job.link for job in db_session.query(Job)] == ["https://live"]
+    assert db_session.query(JobArchive).count() == 5
+    archived_job = db_session.query(JobArchive).filter(JobArchive.link == "https://old/0").one()
+    assert archived_job.company_id == db_session.query(Company.id).filter(Company.name == "Yoco").scalar()
+
+
+def test_deactivated_jobs_stay_in_the_change_feed_for_the_grace_period(client, db_session):
+    now = datetime.utcnow()
+    make_job(db_session, "https://gone", application_deadline=now - timedelta(days=1))
+
+    job_lifecycle.run_lifecycle(db_session, now=now)
+
+    changes = client.get("/api/jobs/changes").json()["changes"]
+    assert [(job["link"], job["is_active"]) for job in changes] == [("https://gone", False)]
+
+    archived = job_lifecycle.archive_inactive_jobs(db_session, now=now + timedelta(hours=73), grace_hours=72)
+    assert archived == 1
+    assert client.get("/api/jobs/changes").json()["changes"] == []
+
+
+def test_corpus_stats_follow_committed_and_archived_jobs(db_session):
+    from app.services.job_ingest import persist_jobs
+    from app.services.relevance import ensure_corpus_stats
+    from scraper.ranking import corpus_stats
+    from tests.test_job_ingest import scraped
+
+    corpus_stats.reset()
+    make_job(db_session, "https://live")
+    # Ingest does not load cold statistics; the read counts its jobs later
+    persist_jobs(db_session, [scraped("https://cold", title="Welder")])
+    db_session.commit()
+    assert not corpus_stats.warmed
+    ensure_corpus_stats(db_session)
+    assert corpus_stats.n_docs == 2 and corpus_stats.doc_freq["welder"] == 1
+
+    persist_jobs(db_session, [scraped("https://cold", title="Plumber")])
+    db_session.commit()
+    assert corpus_stats.n_docs == 2 and "welder" not in corpus_stats.doc_freq
+    db_session.query(Job).filter(Job.link == "https://cold").delete()
+    db_session.commit()
+    corpus_stats.reset()
+    ensure_corpus_stats(db_session)
+    assert corpus_stats.n_docs == 1
+
+    persist_jobs(db_session, [scraped("https://rolled-back", title="Nurse")])
+    db_session.rollback()
+    assert corpus_stats.n_docs == 1 and "nurse" not in corpus_stats.doc_freq
+
+    persist_jobs(db_session, [scraped("https://new", title="Nurse")])
+    assert corpus_stats.n_docs == 1
+    db_session.commit()
+    assert corpus_stats.n_docs == 2 and corpus_stats.doc_freq["nurse"] == 1
+
+    db_session.query(Job).filter(Job.link == "https://new").update({Job.is_active: False})
+    db_session.commit()
+    job_lifecycle.archive_inactive_jobs(
+        db_session, now=datetime.utcnow() + timedelta(hours=1), grace_hours=0
+    )
+    assert corpus_stats.n_docs == 1 and "nurse" not in corpus_stats.doc_freq
@@ -0,0 +1,106 @@
+import numpy as np
+
+from app.models.cv import CV, Template
+from app.services.job_ingest import persist_jobs
+from app.services import job_vectors
+from app.services.job_vectors import (
+    JobVectorStore,
+    cv_text,
+    get_job_vector_store,
+    rebuild_job_vectors,
+)
+from scraper.ranking import corpus_stats
+from tests.test_job_ingest import scraped
+
+
+def test_vector_store_grows_overwrites_and_removes(tmp_path):
+    store = JobVectorStore(str(tmp_path), dim=4)
+    vectors = np.eye(4, dtype=np.float32)[np.arange(3000) % 4]
+    store.upsert(list(range(1, 3001)), vectors)
+
+    assert store.capacity >= 3000
+    top = store.top_k(np.eye(4, dtype=np.float32)[1], 3)
+    assert len(top) == 3 and all(job_id % 4 == 2 for job_id, _ in top)
+
+    store.upsert([2], np.eye(4, dtype=np.float32)[[3]])
+    store.remove([6])
+
+    # A second handle on the same files sees the writes
+    reader = JobVectorStore(str(tmp_path), dim=4)
+    matches = dict(reader.top_k(np.eye(4, dtype=np.float32)[1], 1000))
+    assert 2 not in matches and 6 not in matches and 10 in matches
+    assert reader.count == 3000
+
+
+def test_vector_store_compacts_once_enough_rows_are_blank(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_vectors, "COMPACT_MIN_DEAD_ROWS", 4)
+    monkeypatch.setattr(job_vectors, "COMPACT_CHUNK_ROWS", 3)
+    store = JobVectorStore(str(tmp_path), dim=4)
+    store.upsert(list(range(1, 11)), np.eye(4, dtype=np.float32)[np.arange(10) % 4])
+
+    store.remove([2, 3, 4])
+    assert store.count == 10
+    store.remove([5])
+    assert store.count == 6
+
+    reader = JobVectorStore(str(tmp_path), dim=4)
+    assert dict(reader.top_k(np.eye(4, dtype=np.float32)[1], 10)).keys() == {6, 10}
+    store.upsert([11], np.eye(4, dtype=np.float32)[[1]])
+    assert store.count == 7
+    assert dict(reader.top_k(np.eye(4, dtype=np.float32)[1], 10)).keys() == {6, 10, 11}
+
+
+def test_vectors_follow_the_commit_and_rebuild_replaces_another_dim(db_session, tmp_path, monkeypatch):
+    JobVectorStore(str(tmp_path), dim=8).upsert([1], np.ones((1, 8), dtype=np.float32))
+    monkeypatch.setattr(job_vectors, "_store", JobVectorStore(str(tmp_path), dim=4))
+    store = get_job_vector_store()
+    assert rebuild_job_vectors(db_session) == 0
+
+    persist_jobs(db_session, [scraped("https://a")])
+    db_session.rollback()
+    assert store.count == 0
+    persist_jobs(db_session, [scraped("https://b")])
+    assert store.count == 0
+    db_session.commit()
+    assert store.count == 1
+
+    assert rebuild_job_vectors(db_session) == 1
+    reader = JobVectorStore(str(tmp_path), dim=4)
+    reader.top_k(np.ones(4, dtype=np.float32), 1)
+    assert reader.count == 1
+
+
+def test_cv_text_flattens_nested_content():
+    content = {"summary": "Python developer", "skills": ["Django", {"name": "SQL"}], "years": 5}
+    assert cv_text(content) == "Python developer Django SQL "
+
+
+def test_cv_matches_returns_best_active_jobs(client, db_session, user, auth_headers):
+    corpus_stats.reset()
+    get_job_vector_store().clear()
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", title="Python Developer", description="Django REST APIs and PostgreSQL"),
+            scraped("https://b", title="Registered Nurse", description="Clinical ward care"),
+            scraped("https://c", title="Backend Engineer", description="Python services, Django"),
+        ],
+    )
+    template = Template(name="Plain", html_template="<div></div>")
+    db_session.add(template)
+    db_session.flush()
+    cv = CV(
+        user_id=user.id,
+        template_id=template.id,
+        title="Mine",
+        content={"summary": "Python developer", "skills": ["Django", "PostgreSQL"]},
+    )
+    db_session.add(cv)
+    db_session.commit()
+
+    response = client.get(f"/api/cv/{cv.id}/matches", params={"k": 2}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [match["job"]["link"] for match in response.json()] == ["https://a", "https://c"]
+    assert client.get(f"/api/cv/{cv.id}/matches").status_code == 401
+    assert client.get("/api/cv/999/matches", headers=auth_headers).status_code == 404
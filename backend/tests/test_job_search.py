@@ -0,0 +1,78 @@
+import threading
+import time
+
+from app.services.facet_index import FacetIndex, bitmap_from_ids, facet_index, ids_from_bitmap, salary_band
+from app.services.job_ingest import persist_jobs
+from tests.test_job_ingest import scraped
+
+
+def facet_counts(response, facet):
+    return {item["value"]: item["count"] for item in response["facets"][facet]}
+
+
+def test_bitmap_round_trip():
+    assert ids_from_bitmap(bitmap_from_ids([3, 70, 1])).tolist() == [1, 3, 70]
+    assert bitmap_from_ids([]) == 0
+
+
+def test_salary_band():
+    assert salary_band(800_000) == "R750k - R1m"
+    assert salary_band(None) == "Undisclosed"
+
+
+def test_search_returns_results_with_facet_counts(client, db_session):
+    facet_index.reset()
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", location="Cape Town", job_type="Full-time"),
+            scraped("https://b", location="Durban", job_type="Contract"),
+            scraped("https://c", location="Pretoria", job_type="Full-time", source="Careers24"),
+        ],
+    )
+    db_session.commit()
+
+    response = client.get("/api/jobs/search", params={"job_type": "Full-time"}).json()
+
+    assert response["total"] == 2
+    assert [job["link"] for job in response["jobs"]] == ["https://c", "https://a"]
+    # A facet's own selection does not narrow its counts
+    assert facet_counts(response, "job_type") == {"Full-time": 2, "Contract": 1}
+    assert facet_counts(response, "province") == {"Western Cape": 1, "Gauteng": 1}
+
+    persist_jobs(db_session, [scraped("https://b", location="Durban", job_type="Full-time")])
+    db_session.commit()
+
+    response = client.get("/api/jobs/search", params={"search": "payments", "province": "KwaZulu-Natal"}).json()
+    assert [job["link"] for job in response["jobs"]] == ["https://b"]
+    assert facet_counts(response, "job_type") == {"Full-time": 1}
+
+
+def test_concurrent_syncs_rebuild_once(db_session):
+    index = FacetIndex(rebuild_minutes=60)
+    reads = []
+    original = index._rows
+
+    def slow_rows(db, since=None):
+        reads.append(since)
+        time.sleep(0.1)
+        return original(db, since=since)
+
+    index._rows = slow_rows
+
+    def sync_all():
+        threads = [threading.Thread(target=index.sync, args=(db_session,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # The first build is waited for, then the others only apply changes
+    sync_all()
+    assert reads.count(None) == 1
+
+    # A stale index is rebuilt by one caller while the rest use it as it stands
+    reads.clear()
+    index.rebuild_seconds = 0
+    sync_all()
+    assert reads == [None]
@@ -0,0 +1,100 @@
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database import Base
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(url):
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_migrations_match_the_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "head")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    engine.dispose()
+
+    assert diff == []
+    assert {"ix_jobs_active_id", "ix_jobs_change_seq_id", "ix_jobs_pending_enrichment"} <= indexes
+
+
+def test_upgrade_from_baseline_moves_job_text_into_lookups(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO jobs (title, company, location, salary, link, source, is_active) "
+                "VALUES (:title, :company, :location, :salary, :link, :source, 1)"
+            ),
+            [
+                {"title": "Developer", "company": "Acme (Pty) Ltd", "location": "Cape Town", "salary": "R25 000 per month", "link": "https://a/1", "source": "Indeed"},
+                {"title": "Tester", "company": "Acme", "location": "", "salary": "Posted 2026", "link": "https://a/2", "source": "indeed"},
+                {"title": "Analyst", "company": "  ", "location": None, "salary": None, "link": "https://a/3", "source": "LinkedIn"},
+            ],
+        )
+
+    command.upgrade(alembic_config(url), "head")
+
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT j.link, c.name, l.name, l.province, s.name FROM jobs j "
+            "JOIN companies c ON c.id = j.company_id JOIN sources s ON s.id = j.source_id "
+            "LEFT JOIN locations l ON l.id = j.location_id ORDER BY j.link"
+        )).all()
+        salaries = connection.execute(text(
+            "SELECT link, salary_min, salary_period, change_seq FROM jobs ORDER BY link"
+        )).all()
+    engine.dispose()
+
+    assert rows == [
+        ("https://a/1", "Acme", "Cape Town, Western Cape", "Western Cape", "Indeed"),
+        ("https://a/2", "Acme", None, None, "Indeed"),
+        ("https://a/3", "Unknown", None, None, "LinkedIn"),
+    ]
+    # Salaries stored before parsing are parsed; text that is no salary is not
+    assert salaries == [
+        ("https://a/1", 300_000, "month", 2),
+        ("https://a/2", None, None, 1),
+        ("https://a/3", None, None, 1),
+    ]
+
+
+def test_downgrade_to_baseline(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "head")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO companies (name, normalized_name) VALUES ('Acme', 'acme')"))
+        connection.execute(text("INSERT INTO sources (name, normalized_name) VALUES ('Indeed', 'indeed')"))
+        connection.execute(text(
+            "INSERT INTO jobs (title, company_id, link, source_id, is_active) VALUES ('Developer', 1, 'https://a/1', 1, 1)"
+        ))
+
+    command.downgrade(alembic_config(url), "0001")
+
+    with engine.connect() as connection:
+        job = connection.execute(text("SELECT company, location, source FROM jobs")).one()
+    indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    tables = set(inspect(engine).get_table_names())
+    engine.dispose()
+
+    assert tuple(job) == ("Acme", None, "Indeed")
+    assert "ix_jobs_active_id" not in indexes
+    assert "ix_jobs_company" in indexes
+    assert tables == {"alembic_version", "users", "templates", "cvs", "jobs"}
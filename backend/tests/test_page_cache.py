@@ -0,0 +1,118 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from scraper.cache import PageCache
+from scraper.registry import SiteRegistry
+from scraper.scheduler import BACKGROUND
+from scraper.unified_scraper import UnifiedJobScraper
+from tests.test_site_registry import SITE
+
+PAGE = '<div class="job"><a class="title" href="/1">Python Developer</a><span class="company">Yoco</span></div>'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingScraper(UnifiedJobScraper):
+    def __init__(self, registry, cache):
+        super().__init__(registry=registry, cache=cache)
+        self.fetched = []
+
+    async def _fetch_page(self, url, site, priority=None):
+        self.fetched.append((url, priority))
+        return PAGE
+
+
+def scraper(tmp_path, cache):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps({"board": {**SITE, "rate_limit": 0, "max_pages": 1}}))
+    return CountingScraper(SiteRegistry(str(path)), cache)
+
+
+def test_equivalent_searches_share_cached_pages(tmp_path):
+    cache = PageCache(ttl_seconds=60, stale_seconds=600)
+    first, second = scraper(tmp_path, cache), scraper(tmp_path, cache)
+
+    asyncio.run(first._scrape_site("board", "Python Developer", "Johannesburg", 5))
+    jobs = asyncio.run(second._scrape_site("board", "  python   developer", "JOHANNESBURG", 5))
+
+    assert [job.title for job in jobs] == ["Python Developer"]
+    assert len(first.fetched) == 1
+    assert second.fetched == []
+    assert cache.stats == {"hits": 1, "stale": 0, "misses": 1}
+
+
+def test_stale_page_is_served_while_refreshed_in_background(tmp_path):
+    clock = Clock()
+    cache = PageCache(ttl_seconds=60, stale_seconds=600, clock=clock)
+    key = cache.key("board", "python", "durban", 0)
+    cache.store(key, "<old>")
+    refreshes = []
+
+    async def fetch():
+        refreshes.append(1)
+        return "<new>"
+
+    async def main():
+        clock.now = 120
+        served = cache.lookup(key)
+        cache.refresh(key, fetch)
+        cache.refresh(key, fetch)
+        await asyncio.sleep(0.01)
+        return served
+
+    assert asyncio.run(main()) == ("<old>", True)
+    assert refreshes == [1]
+    assert cache.lookup(key) == ("<new>", False)
+
+    # Past the stale window the page is gone
+    clock.now = 120 + 60 + 600 + 1
+    assert cache.lookup(key) == (None, False)
+
+
+def test_stale_hit_queues_a_background_priority_fetch(tmp_path):
+    clock = Clock()
+    cache = PageCache(ttl_seconds=60, stale_seconds=600, clock=clock)
+    board = scraper(tmp_path, cache)
+
+    async def main():
+        await board._scrape_site("board", "python", "durban", 5)
+        board.seen_jobs.clear()
+        clock.now = 120
+        jobs = await board._scrape_site("board", "python", "durban", 5)
+        await asyncio.sleep(0.01)
+        return jobs
+
+    assert len(asyncio.run(main())) == 1
+    assert [priority for _, priority in board.fetched] == [None, BACKGROUND]
+
+
+def test_cached_pages_carry_their_fetch_time(tmp_path):
+    clock = Clock()
+    cache = PageCache(ttl_seconds=7200, stale_seconds=0, clock=clock)
+    board = scraper(tmp_path, cache)
+
+    fetched = asyncio.run(board._scrape_site("board", "python", "durban", 5))
+    board.seen_jobs.clear()
+    clock.now = 3600
+    cached = asyncio.run(board._scrape_site("board", "python", "durban", 5))
+
+    assert fetched[0].seen_at is None
+    age = datetime.utcnow() - cached[0].seen_at
+    assert timedelta(minutes=59) < age < timedelta(minutes=61)
+    assert cached[0].to_dict()["seen_at"] == cached[0].seen_at.isoformat()
+
+
+def test_cache_is_bounded():
+    cache = PageCache(ttl_seconds=60, stale_seconds=0, max_entries=2)
+    for page in range(3):
+        cache.store(cache.key("board", "python", "durban", page), str(page))
+
+    assert cache.lookup(cache.key("board", "python", "durban", 0)) == (None, False)
+    assert cache.lookup(cache.key("board", "python", "durban", 2)) == ("2", False)
@@ -0,0 +1,122 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+pytest.importorskip("pyinstrument")
+
+from app.core.config import settings
+from app.core.profiling import SlowQueryLog, instrument_engine, request_profiler
+from config import get_config
+
+
+@pytest.fixture
+def admin(monkeypatch, user):
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [user.email])
+    request_profiler.clear()
+    yield user
+    request_profiler.clear()
+
+
+def test_admin_endpoints_need_an_admin(client, auth_headers):
+    assert client.get("/api/admin/profiling/profiles").status_code == 401
+    assert client.get("/api/admin/profiling/profiles", headers=auth_headers).status_code == 403
+
+
+def test_profile_header_captures_a_profile(client, admin, auth_headers):
+    response = client.get("/api/jobs", headers={**auth_headers, "X-Profile": "1"})
+    profile_id = response.headers["X-Profile-Id"]
+
+    # Without the header, or from a non-admin, nothing is profiled
+    assert "X-Profile-Id" not in client.get("/api/jobs", headers=auth_headers).headers
+    assert "X-Profile-Id" not in client.get("/api/jobs", headers={"X-Profile": "1"}).headers
+
+    listing = client.get("/api/admin/profiling/profiles", headers=auth_headers).json()
+    assert [(item["id"], item["path"], item["reason"]) for item in listing["profiles"]] == [
+        (int(profile_id), "/api/jobs", "header")
+    ]
+    html = client.get(f"/api/admin/profiling/profiles/{profile_id}", headers=auth_headers)
+    assert html.headers["content-type"].startswith("text/html")
+    speedscope = client.get(f"/api/admin/profiling/profiles/{profile_id}?format=speedscope", headers=auth_headers)
+    assert "speedscope" in speedscope.json()["$schema"]
+    assert client.get("/api/admin/profiling/profiles/999", headers=auth_headers).status_code == 404
+
+
+def profiled_functions(client, auth_headers, path):
+    """Names of the functions sampled while profiling a request"""
+    response = client.get(path, headers={**auth_headers, "X-Profile": "1"})
+    frames = [request_profiler.get(int(response.headers["X-Profile-Id"])).session.root_frame()]
+    names = set()
+    while frames:
+        frame = frames.pop()
+        if frame is not None:
+            names.add(frame.function)
+            frames.extend(frame.children)
+    return names
+
+
+def test_profile_covers_work_run_in_the_threadpool(client, admin, auth_headers, monkeypatch):
+    from app.api.v1.endpoints import jobs
+
+    filter_jobs = jobs._filter_jobs
+
+    def slow_filter_jobs(*args, **kwargs):
+        time.sleep(0.02)
+        return filter_jobs(*args, **kwargs)
+
+    monkeypatch.setattr(jobs, "_filter_jobs", slow_filter_jobs)
+
+    # The endpoint's query runs in a worker thread, not on the event loop the request started on
+    names = profiled_functions(client, auth_headers, "/api/jobs")
+    assert {"_list_jobs", "slow_filter_jobs"} <= names
+
+    class SlowProfiler:
+        def __getattr__(self, name):
+            time.sleep(0.005)
+            return getattr(request_profiler, name)
+
+    # A sync route runs entirely in the threadpool
+    monkeypatch.setattr("app.api.v1.endpoints.admin.request_profiler", SlowProfiler())
+    assert "list_profiles" in profiled_functions(client, auth_headers, "/api/admin/profiling/profiles")
+
+
+def test_armed_profiler_takes_the_next_matching_requests(client, admin, auth_headers):
+    client.post("/api/admin/profiling/arm?count=2&path=/api/jobs/stats", headers=auth_headers)
+
+    client.get("/api/jobs")
+    captured = [client.get("/api/jobs/stats").headers.get("X-Profile-Id") for _ in range(3)]
+
+    assert captured[0] and captured[1] and captured[2] is None
+    assert request_profiler.armed == 0
+
+
+def test_sampled_request_kept_only_when_slow(client, admin, monkeypatch):
+    monkeypatch.setattr(get_config(), "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(get_config(), "PROFILE_SLOW_REQUEST_MS", 60_000)
+    assert "X-Profile-Id" not in client.get("/api/jobs").headers
+
+    monkeypatch.setattr(get_config(), "PROFILE_SLOW_REQUEST_MS", 0.001)
+    assert client.get("/api/jobs").headers["X-Profile-Id"]
+    assert request_profiler.profiles[-1].reason == "slow"
+    assert request_profiler.slow_requests[-1]["path"] == "/api/jobs"
+
+
+def test_slow_select_is_logged_with_its_plan(monkeypatch):
+    monkeypatch.setattr(get_config(), "SLOW_QUERY_MS", 5)
+    log = SlowQueryLog(10)
+    monkeypatch.setattr("app.core.profiling.slow_queries", log)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        connection.connection.dbapi_connection.create_function("pause", 1, lambda ms: time.sleep(ms / 1000) or ms)
+        connection.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, title TEXT)"))
+        for _ in range(2):
+            connection.execute(text("SELECT pause(:ms) FROM jobs WHERE title = 'x' UNION SELECT pause(:ms)"), {"ms": 10})
+        connection.execute(text("SELECT 1"))
+
+    queries = log.snapshot()
+    assert len(queries) == 2
+    assert queries[0]["plan"] is None  # Explained once per statement
+    assert any("SCAN" in line for line in queries[1]["plan"])
+    assert queries[1]["duration_ms"] >= 5
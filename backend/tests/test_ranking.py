@@ -0,0 +1,47 @@
+from scraper.ranking import BM25Scorer, CorpusStats, job_tokens, tokenize
+from app.services.job_ingest import persist_jobs
+from tests.test_job_ingest import scraped
+
+
+def test_tokenize_keeps_tech_terms():
+    assert tokenize("Senior C++ / C# and Node.js dev.") == ["senior", "c++", "c#", "and", "node.js", "dev"]
+
+
+def test_bm25_prefers_title_matches_and_rare_terms():
+    documents = [
+        job_tokens("Java Developer", "Spring and Hibernate"),
+        job_tokens("Python Developer", "Django APIs"),
+        job_tokens("Office Administrator", "Python scripting a plus"),
+    ]
+
+    scores = BM25Scorer(stats=CorpusStats()).score("python developer", documents)
+
+    assert scores.argmax() == 1
+    assert scores[2] > 0 and scores[0] > 0
+    assert scores[1] > scores[2]
+
+
+def test_bm25_uses_corpus_statistics_when_loaded():
+    stats = CorpusStats()
+    stats.warm([["python"]] * 50 + [["kotlin"]])
+    documents = [["python", "x"], ["kotlin", "x"]]
+
+    scores = BM25Scorer(stats=stats).score("python kotlin", documents)
+
+    assert scores[1] > scores[0]
+
+
+def test_get_jobs_sorted_by_relevance(client, db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", title="Data Analyst", description="Python reporting"),
+            scraped("https://b", title="Senior Python Developer", description="Python APIs"),
+            scraped("https://c", title="Accountant", description="Tax"),
+        ],
+    )
+    db_session.commit()
+
+    jobs = client.get("/api/jobs", params={"search": "python", "sort": "relevance"}).json()
+
+    assert [job["link"] for job in jobs] == ["https://b", "https://a"]
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from starlette.requests import Request
+
+from app.core.rate_limit import AdmissionControl, AdmissionRejected, RateLimiter, client_key, is_heavy, request_cost
+from config import get_config
+
+
+def test_request_cost_weights_expensive_routes():
+    assert request_cost("GET", "/api/stats", {}) == 1
+    assert request_cost("GET", "/api/jobs", {}) == 1
+    assert request_cost("GET", "/api/jobs", {"limit": ["1000"], "search": ["python"]}) == 8
+    assert request_cost("POST", "/api/scrape", {}) == 7
+    assert request_cost("POST", "/api/scrape", {"limit": ["100"]}) == 25
+    assert request_cost("POST", "/api/scrape", {"limit": ["lots"]}) == 7
+
+
+def test_scrapes_imports_and_exports_are_heavy_at_any_cost():
+    assert is_heavy("POST", "/api/scrape", request_cost("POST", "/api/scrape", {}))
+    assert is_heavy("GET", "/api/jobs/export", 10)
+    assert not is_heavy("GET", "/api/jobs", request_cost("GET", "/api/jobs", {"limit": ["1000"]}))
+    assert is_heavy("GET", "/api/jobs", 12)
+
+
+def request_from(peer, forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+def test_client_ip_is_forwarded_only_by_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(get_config(), "RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,172.16.0.0/12")
+
+    # nginx on the Docker network forwards for the browser
+    assert client_key(request_from("172.18.0.5", "41.13.2.7")) == "ip:41.13.2.7"
+    # Entries a client prepended itself are not believed
+    assert client_key(request_from("172.18.0.5", "10.9.9.9, 41.13.2.7")) == "ip:41.13.2.7"
+    assert client_key(request_from("127.0.0.1", "41.13.2.7, 172.18.0.5")) == "ip:41.13.2.7"
+    # A client talking to the API directly cannot pick its bucket
+    assert client_key(request_from("41.13.2.7", "1.1.1.1")) == "ip:41.13.2.7"
+
+
+def test_client_over_budget_gets_429(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(get_config(), "RATE_LIMIT_BURST", 3)
+    monkeypatch.setattr(get_config(), "RATE_LIMIT_PER_MINUTE", 1)
+
+    responses = [client.get("/api/stats") for _ in range(4)]
+
+    assert [response.status_code for response in responses] == [200, 200, 200, 429]
+    assert responses[2].headers["X-RateLimit-Remaining"] == "0"
+    assert int(responses[3].headers["Retry-After"]) >= 60
+    # Signed-in users have their own bucket; routes outside /api are not limited
+    assert client.get("/api/stats", headers=auth_headers).status_code == 200
+    assert client.get("/health").status_code == 200
+
+
+def test_memory_fallback_while_redis_is_down(monkeypatch):
+    monkeypatch.setattr(get_config(), "RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setattr(get_config(), "RATE_LIMIT_BURST", 2)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1")
+    limiter = RateLimiter()
+
+    async def main():
+        return [(await limiter.take("ip:1.2.3.4", 1))[0] for _ in range(3)]
+
+    assert asyncio.run(main()) == [True, True, False]
+
+
+def test_heavy_requests_cannot_take_every_slot(monkeypatch):
+    monkeypatch.setattr(get_config(), "MAX_CONCURRENT_REQUESTS", 3)
+    monkeypatch.setattr(get_config(), "MAX_CONCURRENT_HEAVY_REQUESTS", 1)
+    monkeypatch.setattr(get_config(), "ADMISSION_QUEUE_SECONDS", 0.05)
+    admission = AdmissionControl()
+
+    async def hold(heavy, release):
+        async with admission.admit(heavy=heavy):
+            await release.wait()
+
+    async def main():
+        release = asyncio.Event()
+        running = [asyncio.create_task(hold(True, release)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        # Two heavy requests queue for the one heavy slot; a cheap one still gets in
+        async with admission.admit(heavy=False):
+            queued = admission.waiting
+        await asyncio.sleep(0.1)
+        release.set()
+        results = await asyncio.gather(*running, return_exceptions=True)
+        return queued, results
+
+    queued, results = asyncio.run(main())
+    assert queued == 2
+    assert results[0] is None
+    assert all(isinstance(result, AdmissionRejected) for result in results[1:])
+
+
+def test_full_queue_rejects_at_once(monkeypatch):
+    monkeypatch.setattr(get_config(), "MAX_CONCURRENT_REQUESTS", 1)
+    monkeypatch.setattr(get_config(), "ADMISSION_MAX_QUEUE", 0)
+    admission = AdmissionControl()
+
+    async def main():
+        async with admission.admit(heavy=False):
+            with pytest.raises(AdmissionRejected, match="queue full"):
+                async with admission.admit(heavy=False):
+                    pass
+
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core import database
+from app.core.database import LAST_WRITE_COOKIE, Base, ReplicaPool, RoutingSession
+from app.models.job import Company
+
+
+def sqlite_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def databases(lag=0.0):
+    primary, replica = sqlite_engine(), sqlite_engine()
+    lags = {"value": lag}
+
+    def probe(engine):
+        if isinstance(lags["value"], Exception):
+            raise lags["value"]
+        return lags["value"]
+
+    clock = Clock()
+    pool = ReplicaPool([replica], max_lag=5, check_interval=2, probe=probe, clock=clock)
+    # Tell the databases apart by what they contain
+    with RoutingSession(bind=replica) as session:
+        session.add(Company(name="Replica", normalized_name="replica"))
+        session.commit()
+    return primary, pool, lags, clock
+
+
+def read_from(primary, pool, last_write=None):
+    with RoutingSession(bind=primary, replicas=pool, info={"read_only": True, "last_write": last_write}) as session:
+        return [company.name for company in session.query(Company)]
+
+
+def test_reads_use_replica_and_writes_the_primary():
+    primary, pool, _, _ = databases()
+
+    with RoutingSession(bind=primary, replicas=pool, info={"read_only": True}) as session:
+        assert [company.name for company in session.query(Company)] == ["Replica"]
+        session.add(Company(name="Yoco", normalized_name="yoco"))
+        session.commit()
+        # After its own write the session keeps reading from the primary
+        assert [company.name for company in session.query(Company)] == ["Yoco"]
+
+    with RoutingSession(bind=primary, replicas=pool) as session:
+        assert [company.name for company in session.query(Company)] == ["Yoco"]
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary():
+    primary, pool, lags, clock = databases(lag=30)
+    assert read_from(primary, pool) == []
+
+    # The lag is cached until the next check
+    lags["value"] = 0
+    assert read_from(primary, pool) == []
+    clock.now += 2
+    assert read_from(primary, pool) == ["Replica"]
+
+    lags["value"] = ConnectionError("replica down")
+    clock.now += 2
+    assert read_from(primary, pool) == []
+
+
+def test_recent_writer_reads_from_primary_until_replica_catches_up():
+    primary, pool, _, clock = databases(lag=1.5)
+
+    assert read_from(primary, pool, last_write=clock.now - 1) == []
+    assert read_from(primary, pool, last_write=clock.now - 2) == ["Replica"]
+
+
+def test_committed_write_sets_read_your_writes_cookie(monkeypatch):
+    primary, pool, _, _ = databases()
+    monkeypatch.setattr(database, "replicas", pool)
+    response = Response()
+
+    with RoutingSession(bind=primary, replicas=pool, info={"response": response}) as session:
+        session.query(Company).all()
+        session.commit()
+        assert "set-cookie" not in response.headers
+
+        session.add(Company(name="Yoco", normalized_name="yoco"))
+        session.commit()
+
+    assert response.headers["set-cookie"].startswith(f"{LAST_WRITE_COOKIE}=")
@@ -0,0 +1,81 @@
+import pytest
+
+from app.models.job import Job
+from app.services.job_ingest import persist_jobs
+from app.services.salary import backfill_salaries, parse_salary
+from app.services.saved_searches import current_watermark
+from tests.test_job_ingest import scraped
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("R300,000 - R800,000", (300_000, 800_000, "ZAR", "year")),
+        ("R25 000 - R30 000", (300_000, 360_000, "ZAR", "month")),
+        ("R40,000pm", (480_000, 480_000, "ZAR", "month")),
+        ("R1.2m per annum", (1_200_000, 1_200_000, "ZAR", "year")),
+        ("R150 per hour", (312_000, 312_000, "ZAR", "hour")),
+        ("$120,000 - $180,000", (2_220_000, 3_330_000, "USD", "year")),
+        ("25 000 - 30 000 per month", (300_000, 360_000, "ZAR", "month")),
+        ("Salary: 450 000", (450_000, 450_000, "ZAR", "year")),
+    ],
+)
+def test_parse_salary(text, expected):
+    parsed = parse_salary(text)
+    assert (parsed.min, parsed.max, parsed.currency, parsed.period) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["Competitive", "Market Rate", "CTC Negotiable", "Posted 2026", "1500", "Ref 45000", None]
+)
+def test_parse_salary_without_amount(text):
+    assert parse_salary(text) is None
+
+
+def test_salary_filters_and_sort(client, db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://low", salary="R20 000 per month"),
+            scraped("https://high", salary="R900k - R1.1m"),
+            scraped("https://none", salary="Market Related"),
+        ],
+    )
+    db_session.commit()
+
+    jobs = client.get("/api/jobs", params={"min_salary": 500_000}).json()
+    assert [job["link"] for job in jobs] == ["https://high"]
+
+    jobs = client.get("/api/jobs", params={"sort": "salary"}).json()
+    assert [job["link"] for job in jobs] == ["https://high", "https://low", "https://none"]
+
+
+def test_backfill_reparses_stored_salaries(db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://old", salary="R40,000pm"),
+            scraped("https://bogus", salary="Posted 2026"),
+            scraped("https://current", salary="R900k - R1.1m"),
+        ],
+    )
+    db_session.commit()
+    # Stored before parsing existed, and parsed by the old, lenient parser
+    db_session.query(Job).filter(Job.link == "https://old").update(
+        {Job.salary_min: None, Job.salary_max: None, Job.salary_currency: None, Job.salary_period: None}
+    )
+    db_session.query(Job).filter(Job.link == "https://bogus").update(
+        {Job.salary_min: 24_312, Job.salary_max: 24_312, Job.salary_currency: "ZAR", Job.salary_period: "month"}
+    )
+    db_session.commit()
+    before = current_watermark(db_session)
+
+    assert backfill_salaries(db_session, batch_size=2) == 2
+
+    jobs = {job.link: job for job in db_session.query(Job)}
+    assert (jobs["https://old"].salary_min, jobs["https://old"].salary_period) == (480_000, "month")
+    assert (jobs["https://bogus"].salary_min, jobs["https://bogus"].salary_currency) == (None, None)
+    # Changed jobs are numbered for /jobs/changes, unchanged ones keep their number
+    assert jobs["https://old"].change_seq > before and jobs["https://bogus"].change_seq > before
+    assert jobs["https://current"].change_seq <= before
+    assert backfill_salaries(db_session) == 0
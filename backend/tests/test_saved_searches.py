@@ -0,0 +1,85 @@
+from app.models.job import Job
+from app.models.saved_search import SavedSearch, SearchAlert
+from app.services.job_ingest import persist_jobs
+from app.services.saved_searches import SearchMatcher, evaluate_saved_searches, send_digests
+from tests.test_job_ingest import scraped
+
+
+def test_matcher_requires_all_terms_and_filters(db_session):
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://a", title="Senior Python Developer"),
+            scraped("https://b", title="Python Tutor", location="Durban, KwaZulu-Natal"),
+        ],
+    )
+    jobs = {job.link: job for job in db_session.query(Job)}
+    searches = [
+        SavedSearch(id=1, search="python developer"),
+        SavedSearch(id=2, search="python", location="kwazulu"),
+        SavedSearch(id=3, min_salary=900_000),
+        SavedSearch(id=4, source="pnet"),
+    ]
+    matcher = SearchMatcher(searches)
+
+    assert [search.id for search in matcher.match(jobs["https://a"])] == [1, 4]
+    assert [search.id for search in matcher.match(jobs["https://b"])] == [2, 4]
+
+
+def test_new_jobs_queue_alerts_once_and_digest_per_user(client, db_session, user, auth_headers):
+    persist_jobs(db_session, [scraped("https://old", title="Python Developer")])
+    db_session.commit()
+
+    response = client.post(
+        "/api/saved-searches",
+        json={"name": "Python roles", "search": "Python", "location": "Cape Town"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+
+    persist_jobs(
+        db_session,
+        [
+            scraped("https://old", title="Python Developer"),
+            scraped("https://new", title="Python Engineer"),
+            scraped("https://other", title="Accountant", description="Tax"),
+        ],
+    )
+    db_session.commit()
+    persist_jobs(db_session, [scraped("https://later", title="Java Developer")])
+    db_session.commit()
+    assert evaluate_saved_searches(db_session) == 1
+
+    alerts = client.get("/api/saved-searches/alerts", headers=auth_headers).json()
+    assert [alert["job_link"] for alert in alerts] == ["https://new"]
+
+    outbox = []
+    assert send_digests(db_session, transport=outbox.append) == 1
+    assert outbox[0]["To"] == user.email
+    assert "https://new" in outbox[0].get_content()
+    assert send_digests(db_session, transport=outbox.append) == 0
+    assert db_session.query(SearchAlert).filter(SearchAlert.sent_at.is_(None)).count() == 0
+
+
+def test_evaluation_follows_commit_order_and_alerts_once(client, db_session, auth_headers):
+    client.post("/api/saved-searches", json={"name": "Python", "search": "Python"}, headers=auth_headers)
+    persist_jobs(db_session, [scraped("https://a", title="Accountant"), scraped("https://b", title="Python Developer")])
+    db_session.commit()
+    assert evaluate_saved_searches(db_session) == 1
+
+    # An older job id changing into a match after the evaluation is still picked up
+    persist_jobs(db_session, [scraped("https://a", title="Python Accountant")])
+    db_session.commit()
+    assert evaluate_saved_searches(db_session) == 1
+
+    # Later changes to jobs already alerted do not queue them again
+    persist_jobs(db_session, [scraped("https://b", title="Python Developer", salary="R1,000,000")])
+    db_session.commit()
+    assert evaluate_saved_searches(db_session) == 0
+
+    search = db_session.query(SavedSearch).one()
+    db_session.refresh(search)
+    search.last_change_seq = 0
+    db_session.commit()
+    assert evaluate_saved_searches(db_session) == 0
+    assert db_session.query(SearchAlert).count() == 2
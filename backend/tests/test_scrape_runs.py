@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from app.models.job import Job
+from app.models.scrape_run import ScrapeRun, ScrapeRunPage
+from app.services.scrape_runs import _claim_expired_run, new_owner, run_checkpointed_scrape, run_key
+from config import get_config
+from scraper.registry import SiteRegistry
+from scraper.unified_scraper import UnifiedJobScraper
+from tests.test_site_registry import SITE
+
+
+def page(start):
+    return "".join(
+        f'<div class="job"><h2 class="title"><a href="/jobs/{n}">Developer {n}</a></h2>'
+        f'<span class="company">Yoco</span></div>'
+        for n in range(start, start + 2)
+    )
+
+
+class PagedScraper(UnifiedJobScraper):
+    """Two jobs per result page; pages listed in ``fail`` cannot be fetched"""
+
+    def __init__(self, registry, fail=()):
+        super().__init__(registry=registry)
+        self.fail = set(fail)
+        self.fetched = []
+
+    async def _fetch_page(self, url, site, priority=None):
+        start = int(url.rsplit("start=", 1)[1])
+        self.fetched.append((site, start))
+        return None if (site, start) in self.fail else page(start + (1000 if site == "other" else 0))
+
+
+def registry(tmp_path):
+    path = tmp_path / "sites.json"
+    board = {**SITE, "rate_limit": 0, "page_size": 10, "max_pages": 3}
+    path.write_text(json.dumps({"board": board, "other": {**board, "name": "Other Board"}}))
+    return SiteRegistry(str(path))
+
+
+def scrape(db, scraper):
+    return asyncio.run(run_checkpointed_scrape(db, "Developer", "Cape Town", max_jobs_per_site=6, scraper=scraper))
+
+
+class CrashingScraper(PagedScraper):
+    """Stops like a killed worker once the sites have been scraped, before the run is closed"""
+
+    async def scrape_all_sites(self, *args, **kwargs):
+        await super().scrape_all_sites(*args, **kwargs)
+        raise RuntimeError("worker killed")
+
+
+def crash(db, scraper):
+    with pytest.raises(RuntimeError):
+        scrape(db, scraper)
+
+
+def test_crashed_run_resumes_after_last_completed_page(db_session, tmp_path, monkeypatch):
+    first = CrashingScraper(registry(tmp_path), fail={("board", 10)})
+    crash(db_session, first)
+
+    # Jobs of finished pages are stored even though the worker died part way
+    assert db_session.query(Job).count() == 8
+    assert sorted(first.fetched) == [("board", 0), ("board", 10), ("other", 0), ("other", 10), ("other", 20)]
+    assert db_session.query(ScrapeRun).one().status == "running"
+
+    # The lease is still live, so an identical run does not take the crashed one over
+    key = run_key("Developer", "Cape Town", 6)
+    assert _claim_expired_run(db_session, key, new_owner(), datetime.utcnow()) is None
+
+    monkeypatch.setattr(get_config(), "SCRAPE_RUN_LEASE_MINUTES", -1)
+    second = PagedScraper(registry(tmp_path))
+    result = scrape(db_session, second)
+
+    # Only the failed page onwards is fetched again, the finished site is skipped
+    assert result["resumed"] is True
+    assert result["status"] == "completed"
+    assert second.fetched == [("board", 10), ("board", 20)]
+    assert db_session.query(Job).count() == 12
+    run = db_session.query(ScrapeRun).one()
+    assert (run.jobs_saved, run.owner, run.finished_at is not None) == (12, None, True)
+    assert db_session.query(ScrapeRunPage).filter(ScrapeRunPage.is_last == True).count() == 2
+
+    # A completed run is not resumed; its pages come from the page cache this soon
+    third = PagedScraper(registry(tmp_path))
+    result = scrape(db_session, third)
+    assert (result["resumed"], result["status"], result["unchanged_count"]) == (False, "completed", 12)
+    assert third.fetched == []
+
+
+def test_run_with_a_failed_site_is_closed_as_partial(db_session, tmp_path, monkeypatch):
+    # The other board never checkpoints a page
+    result = scrape(db_session, PagedScraper(registry(tmp_path), fail={("other", 0)}))
+    assert (result["status"], result["saved_count"]) == ("partial", 6)
+
+    monkeypatch.setattr(get_config(), "SCRAPE_RUN_LEASE_MINUTES", -1)
+    scraper = PagedScraper(registry(tmp_path))
+    result = scrape(db_session, scraper)
+
+    # A partial run is finished, the next run starts over instead of resuming it
+    assert (result["resumed"], result["status"]) == (False, "completed")
+    assert ("other", 0) in scraper.fetched
+    assert [run.status for run in db_session.query(ScrapeRun).order_by(ScrapeRun.id)] == ["partial", "completed"]
+
+
+def test_pages_are_persisted_off_the_event_loop(db_session, tmp_path, monkeypatch):
+    from app.services import scrape_runs
+
+    persist = scrape_runs.persist_jobs
+    threads = []
+
+    def persist_jobs(db, jobs):
+        threads.append(threading.current_thread())
+        return persist(db, jobs)
+
+    monkeypatch.setattr(scrape_runs, "persist_jobs", persist_jobs)
+    result = scrape(db_session, PagedScraper(registry(tmp_path)))
+
+    assert result["saved_count"] == 12
+    assert threads and threading.main_thread() not in threads
+
+
+def test_stale_unfinished_runs_are_abandoned(db_session, tmp_path, monkeypatch):
+    crash(db_session, CrashingScraper(registry(tmp_path), fail={("board", 0)}))
+    monkeypatch.setattr(get_config(), "SCRAPE_RUN_LEASE_MINUTES", -1)
+    monkeypatch.setattr(get_config(), "SCRAPE_RUN_RESUME_HOURS", -1)
+
+    scraper = PagedScraper(registry(tmp_path))
+    result = scrape(db_session, scraper)
+
+    assert (result["resumed"], result["status"]) == (False, "completed")
+    assert [run.status for run in db_session.query(ScrapeRun).order_by(ScrapeRun.id)] == ["abandoned", "completed"]
@@ -0,0 +1,114 @@
+import asyncio
+
+from scraper.scheduler import BACKGROUND, INTERACTIVE, ScrapeScheduler
+
+
+def test_concurrent_fetches_of_one_page_are_coalesced():
+    scheduler = ScrapeScheduler(max_in_flight=4)
+    calls = []
+
+    async def download():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "<html>"
+
+    async def main():
+        first = await asyncio.gather(*(scheduler.fetch("pnet", "https://pnet/jobs?p=1", download) for _ in range(5)))
+        # Once the fetch has finished the page is fetched again
+        second = await scheduler.fetch("pnet", "https://pnet/jobs?p=1", download)
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first == ["<html>"] * 5
+    assert second == "<html>"
+    assert len(calls) == 2
+    assert scheduler.stats == {"fetches": 2, "coalesced": 4}
+
+
+def test_failed_fetch_returns_none_to_every_waiter():
+    scheduler = ScrapeScheduler(max_in_flight=4)
+
+    async def download():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("reset")
+
+    async def main():
+        return await asyncio.gather(*(scheduler.fetch("pnet", "https://pnet/jobs", download) for _ in range(3)))
+
+    assert asyncio.run(main()) == [None, None, None]
+
+
+def test_waiters_refetch_when_the_fetch_they_joined_is_cancelled():
+    scheduler = ScrapeScheduler(max_in_flight=4)
+    calls = []
+
+    async def download():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "<html>"
+
+    async def main():
+        owner = asyncio.create_task(scheduler.fetch("pnet", "https://pnet/jobs", download))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(scheduler.fetch("pnet", "https://pnet/jobs", download)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == ["<html>", "<html>"]
+    assert len(calls) == 2
+
+
+def test_budget_is_granted_to_interactive_fetches_first():
+    scheduler = ScrapeScheduler(max_in_flight=2)
+    started, peak = [], [0]
+
+    def download(name):
+        async def run():
+            started.append(name)
+            peak[0] = max(peak[0], scheduler.in_flight)
+            await asyncio.sleep(0.01)
+            return name
+        return run
+
+    async def main():
+        fetches = [
+            asyncio.create_task(scheduler.fetch("pnet", f"https://pnet/{name}", download(name), priority=priority))
+            for name, priority in [
+                ("bg1", BACKGROUND), ("bg2", BACKGROUND), ("bg3", BACKGROUND),
+                ("bg4", BACKGROUND), ("user1", INTERACTIVE), ("user2", INTERACTIVE),
+            ]
+        ]
+        await asyncio.gather(*fetches)
+
+    asyncio.run(main())
+
+    # The first two background fetches already held the budget; the queued user fetches jump the rest
+    assert started == ["bg1", "bg2", "user1", "user2", "bg3", "bg4"]
+    assert peak[0] == 2
+    assert scheduler.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = ScrapeScheduler(max_in_flight=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(main())
+
+    assert scheduler.in_flight == 0
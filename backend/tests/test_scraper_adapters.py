@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+from config import get_config
+from scraper.registry import SiteRegistry
+from scraper.unified_scraper import UnifiedJobScraper
+from tests.test_job_enrichment import POSTING
+
+SITES = {
+    "indeed_za": {
+        "name": "Indeed South Africa",
+        "base_url": "https://za.indeed.com",
+        "search_url": "https://za.indeed.com/jobs?q={query}&l={location}&start={start}",
+        "selectors": {"job_container": ".job", "title": ".title", "company": ".company"},
+        "adapter": "scraper.indeed:IndeedScraper",
+        "rate_limit": 0,
+        "max_pages": 1,
+    },
+    "google_jobs": {
+        "name": "Google Jobs",
+        "base_url": "https://www.google.com",
+        "search_url": "https://www.google.com/search?q={query}+jobs+in+{location}&ibp=htl;jobs",
+        "adapter": "scraper.google_jobs_scraper:GoogleJobsScraper",
+        "rate_limit": 0,
+    },
+}
+
+GOOGLE_PAGE = "<script type='application/ld+json'>%s</script>" % json.dumps(
+    [
+        {**POSTING, "hiringOrganization": {"name": "Yoco"}, "url": "https://jobs.example/1",
+         "jobLocation": {"address": {"addressLocality": "Cape Town"}}},
+        {**POSTING, "title": "No company"},
+    ]
+)
+INDEED_PAGE = '<div class="job"><a class="title">Python Developer</a><span class="company">Yoco</span></div>'
+
+
+class FakeScraper(UnifiedJobScraper):
+    def __init__(self, registry, pages):
+        super().__init__(registry=registry)
+        self.pages = pages
+        self.fetched = []
+
+    async def _fetch_page(self, url, site):
+        self.fetched.append(url)
+        for prefix, html in self.pages.items():
+            if url.startswith(prefix):
+                return html
+        return None
+
+
+def registry(tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps(SITES))
+    return SiteRegistry(str(path))
+
+
+def test_adapters_fan_out_with_shared_dedup(tmp_path):
+    scraper = FakeScraper(
+        registry(tmp_path),
+        {"https://www.google.com": GOOGLE_PAGE, "https://www.indeed.com": INDEED_PAGE},
+    )
+
+    jobs = asyncio.run(scraper.scrape_all_sites("python developer", "Remote", 10))
+
+    # The two listings differ in location so both are kept; the posting without a company is skipped
+    assert sorted((job["source"], job["title"]) for job in jobs) == [
+        ("Google Jobs", "Python Developer"),
+        ("Indeed", "Python Developer"),
+    ]
+    assert any(url.startswith("https://www.indeed.com/jobs?q=python+developer") for url in scraper.fetched)
+
+    scraper.seen_jobs.clear()
+    again = asyncio.run(scraper._scrape_site("indeed_za", "python developer", "Remote", 10))
+    assert len(again) == 1
+    assert asyncio.run(scraper._scrape_site("indeed_za", "python developer", "Remote", 10)) == []
+
+
+def test_sample_data_only_in_fixture_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config(), "SCRAPER_FIXTURE_MODE", True)
+    scraper = FakeScraper(registry(tmp_path), {})
+
+    jobs = asyncio.run(scraper.scrape_all_sites("python developer", "Cape Town", 3))
+
+    assert scraper.fetched == []
+    assert {job["source"] for job in jobs} == {"Google Jobs", "Indeed South Africa"}
+
+    jobs = asyncio.run(scraper.scrape_all_sites("python developer", "Remote", 3))
+    assert {job["source"] for job in jobs} == {"Google Jobs", "Indeed"}
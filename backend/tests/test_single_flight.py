@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.single_flight import SingleFlight, read_flight
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+    release = threading.Event()
+
+    def query(name):
+        executions.append(name)
+        release.wait(5)
+        return {"name": name}
+
+    async def main():
+        calls = [
+            flight.run("GET /api/jobs", {"limit": 100, "search": None}, lambda: query("a")),
+            flight.run("GET /api/jobs", {"search": "", "limit": 100}, lambda: query("b")),
+            flight.run("GET /api/jobs", {"limit": 20}, lambda: query("c")),
+        ]
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    first, second, third = asyncio.run(main())
+
+    assert sorted(executions) == ["a", "c"]
+    assert first is second and third == {"name": "c"}
+    assert flight.stats()["GET /api/jobs"] == {
+        "requests": 3, "executions": 2, "coalesced": 1, "coalescing_ratio": 0.333
+    }
+
+
+def test_failure_is_shared_and_not_remembered():
+    flight = SingleFlight()
+    outcomes = iter([RuntimeError("database went away"), "ok"])
+
+    def query():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await flight.run("GET /api/stats", {}, query)
+        return await flight.run("GET /api/stats", {}, query)
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_leader_going_away_does_not_cancel_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def query():
+        release.wait(5)
+        return "stats"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.run("GET /api/stats", {}, query))
+        follower = asyncio.ensure_future(flight.run("GET /api/stats", {}, query))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        release.set()
+        return await follower
+
+    assert asyncio.run(main()) == "stats"
+
+
+def test_concurrent_stats_requests_coalesce(db_session, auth_headers, monkeypatch):
+    from app.api.v1.endpoints import jobs
+    from app.core.config import settings
+    from app.core.database import get_db, get_read_db, get_read_sessions
+    from app.main import app
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["jobseeker@example.com"])
+    read_flight.clear()
+    compute = jobs._job_statistics
+
+    opened = []
+
+    def open_session():
+        session = sessionmaker(bind=db_session.get_bind())()
+        opened.append(session)
+        return session
+
+    def slow_statistics(db):
+        # Runs in the threadpool; the other requests join while it sleeps
+        time.sleep(0.2)
+        return compute(db)
+
+    monkeypatch.setattr(jobs, "_job_statistics", slow_statistics)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
+    app.dependency_overrides[get_read_sessions] = lambda: open_session
+
+    async def main():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            responses = await asyncio.gather(*[client.get("/api/stats") for _ in range(5)])
+            stats = await client.get("/api/admin/coalescing", headers=auth_headers)
+        return responses, stats.json()
+
+    try:
+        responses, stats = asyncio.run(main())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert {response.json()["total_jobs"] for response in responses} == {0}
+    assert stats["GET /api/stats"] == {"requests": 5, "executions": 1, "coalesced": 4, "coalescing_ratio": 0.8}
+    # The shared execution ran in a session of its own, not in the leader's request session
+    assert len(opened) == 1 and opened[0] is not db_session
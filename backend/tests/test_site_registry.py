@@ -0,0 +1,72 @@
+import json
+import os
+
+from scraper.registry import SiteRegistry
+from scraper.unified_scraper import UnifiedJobScraper
+
+SITE = {
+    "name": "Test Board",
+    "base_url": "https://board.example",
+    "search_url": "https://board.example/jobs?q={query}&l={location}&start={start}",
+    "selectors": {
+        "job_container": ".job",
+        "title": ".title",
+        "company": ".company",
+        "location": ".location",
+        "link": ".title a",
+    },
+    "rate_limit": 1.0,
+    "page_size": 20,
+}
+
+HTML = """
+<div class="job"><h2 class="title"><a href="/jobs/1">Python Developer</a></h2>
+  <span class="company">Yoco</span><span class="location">Cape Town</span></div>
+<div class="job"><h2 class="title"><a href="/jobs/2">Remote Tester</a></h2>
+  <span class="company">Acme</span></div>
+"""
+
+
+def drop_remote(container, job):
+    return None if "Remote" in job.title else job
+
+
+def write_sites(path, sites, mtime):
+    path.write_text(json.dumps(sites))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_registry_reloads_changed_file_and_skips_broken_entries(tmp_path):
+    path = tmp_path / "sites.json"
+    write_sites(path, {"board": SITE, "broken": {**SITE, "selectors": {"title": ".title"}}}, 1_000_000_000)
+    registry = SiteRegistry(str(path), allowed_sites=["board", "broken"])
+
+    assert list(registry.sites()) == ["board"]
+    assert registry.get("board").page_url("python dev", "Cape Town", 2) == (
+        "https://board.example/jobs?q=python+dev&l=Cape+Town&start=40"
+    )
+
+    write_sites(path, {"board": {**SITE, "rate_limit": 5.0}, "other": SITE}, 2_000_000_000)
+    sites = registry.sites()
+    assert sites["board"].rate_limit == 5.0
+    # Not in the allow-list, so it loads but stays disabled
+    assert sites["other"].enabled is False
+
+    path.write_text("{not json")
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert registry.get("board").rate_limit == 5.0
+
+
+def test_extraction_uses_compiled_selectors_and_detail_hook(tmp_path):
+    path = tmp_path / "sites.json"
+    write_sites(path, {"board": {**SITE, "hooks": {"detail": "tests.test_site_registry:drop_remote"}}}, 1)
+    scraper = UnifiedJobScraper(registry=SiteRegistry(str(path)))
+
+    jobs = scraper._extract_jobs_from_html(HTML, scraper.configs["board"])
+
+    assert [(job.title, job.company, job.location, job.link) for job in jobs] == [
+        ("Python Developer", "Yoco", "Cape Town", "https://board.example/jobs/1")
+    ]
+    assert scraper.get_available_sites() == ["board"]
+    scraper.disable_site("board")
+    assert scraper.get_available_sites() == []
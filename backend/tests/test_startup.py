@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_api_import_does_not_load_the_scraper_stack_or_numpy():
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('aiohttp', 'bs4', 'soupsieve', 'scraper.unified_scraper', 'numpy', 'scipy') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from scraper.registry import SiteRegistry
+from scraper.scheduler import ScrapeScheduler
+from scraper.unified_scraper import UnifiedJobScraper
+from scripts.trace_report import critical_path, self_times
+from tests.test_site_registry import HTML, SITE
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def spans():
+    # The global provider can only be installed once per process
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_exporter))
+        trace.set_tracer_provider(provider)
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+
+class FakeResponse:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def get(self, url, headers=None):
+        return FakeResponse(404 if "missing" in url else 200, HTML)
+
+
+def test_fetch_and_extraction_spans(spans, tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps({"board": {**SITE, "rate_limit": 0}}))
+    scraper = UnifiedJobScraper(registry=SiteRegistry(str(path)))
+    scraper.scheduler = ScrapeScheduler()
+    scraper.session = FakeSession()
+
+    async def main():
+        with trace.get_tracer("test").start_as_current_span("scrape"):
+            html = await scraper._fetch_page("https://board.example/jobs", "board")
+            await scraper._fetch_page("https://board.example/missing", "board")
+            scraper._extract_jobs_from_html(html, scraper.configs["board"])
+
+    asyncio.run(main())
+
+    finished = {span.name: span for span in spans.get_finished_spans() if span.name != "scraper.fetch_page"}
+    fetches = [span for span in spans.get_finished_spans() if span.name == "scraper.fetch_page"]
+    assert [span.attributes["http.status_code"] for span in fetches] == [200, 404]
+    assert fetches[0].attributes["scraper.site"] == "board"
+    assert fetches[0].parent.span_id == finished["scrape"].context.span_id
+    assert finished["scraper.extract_jobs"].attributes["scraper.jobs"] == 2
+
+
+def test_rate_limit_wait_is_a_span(spans):
+    scheduler = ScrapeScheduler()
+
+    async def main():
+        await scheduler.respect_rate_limit("board", 0.02)
+        await scheduler.respect_rate_limit("board", 0.02)
+
+    asyncio.run(main())
+
+    waits = [span for span in spans.get_finished_spans() if span.name == "scraper.rate_limit_wait"]
+    assert len(waits) == 1
+    assert waits[0].attributes["scraper.site"] == "board"
+
+
+def test_trace_report_self_time_and_critical_path():
+    def span(span_id, parent_id, name, start, end):
+        return {"span_id": span_id, "parent_id": parent_id, "name": name, "start": start, "end": end}
+
+    spans = [
+        span("a", None, "POST /api/jobs/scrape", 0.0, 10.0),
+        span("b", "a", "scraper.fetch_page", 0.0, 6.0),
+        span("c", "a", "scraper.fetch_page", 1.0, 9.0),
+        span("d", "c", "scraper.rate_limit_wait", 1.0, 5.0),
+    ]
+
+    assert self_times(spans) == {"POST /api/jobs/scrape": 1.0, "scraper.fetch_page": 10.0, "scraper.rate_limit_wait": 4.0}
+    children = {"a": [spans[1], spans[2]], "c": [spans[3]]}
+    assert [item["span_id"] for item in critical_path(spans[0], children)] == ["a", "c", "d"]